@@ -3,7 +3,8 @@
 from fastapi import (Depends,
                      HTTPException,
                      APIRouter,
-                     Header
+                     Header,
+                     Form
                     )
 from fastapi.security import OAuth2PasswordRequestForm
 
@@ -16,7 +17,9 @@ from ...services.Authentication.exceptions import (UserNotFoundException,
                                                     InvalidCredentialsException, 
                                                     InvalidTokenException,
                                                     InvalidUserInputPropertyException,
-                                                    DuplicateUserException
+                                                    DuplicateUserException,
+                                                    HashingPoolSaturatedException,
+                                                    HashingPoolUnavailableException
                                                   )
 
 api = APIRouter(prefix="/auth")
@@ -26,11 +29,12 @@ openapi_tags = {
 }
 
 @api.post("/create", tags=["Auth"])
-def create_user(username: str,
-                password: str,
-                email: str, 
-                full_name: str, 
-                auth_service: AuthenticationService = Depends()) -> NewUser:
+async def create_user(username: str,
+                      password: str,
+                      email: str, 
+                      full_name: str, 
+                      device: str = "default",
+                      auth_service: AuthenticationService = Depends()) -> NewUser:
     """
     Create a new user in the database.
 
@@ -39,45 +43,56 @@ def create_user(username: str,
       password: The password for the new user.
       email: The email for the new user.
       full_name: The full name for the new user.
+      device: The device to issue the new user's refresh token to.
 
     Returns:
       NewUser: The NewUser object for the newly created user.
 
     Raises:
       422: If the input username, password, or email are improperly formatted or being used by another user.
+      503: If too many authentication requests are already in progress, or password hashing is unavailable.
     """
     try:
-      return auth_service.create_user(username=username,
-                                      password=password,email=email, 
-                                      full_name=full_name)
+      return await auth_service.create_user(username=username,
+                                            password=password,email=email, 
+                                            full_name=full_name,
+                                            device=device)
     except (InvalidUserInputPropertyException, DuplicateUserException) as e:
       raise HTTPException(status_code=422, detail=str(e))
+    except (HashingPoolSaturatedException, HashingPoolUnavailableException) as e:
+      raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
 
 @api.post("/token", tags=["Auth"])
-def login(form_data: OAuth2PasswordRequestForm = Depends(), auth_service: AuthenticationService = Depends()) -> Token:
+async def login(form_data: OAuth2PasswordRequestForm = Depends(),
+                device: str = Form(default="default"),
+                auth_service: AuthenticationService = Depends()) -> Token:
     """
     Login a user and get a JWT to use to call protected routes in the API.
 
     Args:
       username: The username of the user to login.
       password: The password of the user to login.
+      device: The device the user logs in from. Its previous refresh token is replaced.
 
     Returns:
-      Token: The JWT token for the newly logged in user.
+      Token: The JWT token for the newly logged in user, and the refresh token issued to the device.
 
     Raises:
       404: If the user is not found in the database.
       422: If the credentials input by the user are invalid.
+      503: If too many authentication requests are already in progress, or password hashing is unavailable.
     """
     try:
-      return auth_service.login(username=form_data.username, plain_password=form_data.password)
+      return await auth_service.login(username=form_data.username, plain_password=form_data.password, device=device)
     except UserNotFoundException as e:
       raise HTTPException(status_code=404, detail=str(e))
     except InvalidCredentialsException as e:
       raise HTTPException(status_code=422, detail=str(e))
+    except (HashingPoolSaturatedException, HashingPoolUnavailableException) as e:
+      raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
 
 @api.post("/refresh-access-token", tags=["Auth"])
-def refresh_access_token(refresh_token: str = Header(), auth_service: AuthenticationService = Depends()) -> Token:
+async def refresh_access_token(refresh_token: str = Header(), auth_service: AuthenticationService = Depends()) -> Token:
     """
     Refresh the Access token for a given user.
 
@@ -88,15 +103,31 @@ def refresh_access_token(refresh_token: str = Header(), auth_service: Authentica
       Token: The newly created access token for the user.
 
     Raises:
+      404: If the refresh token does not match a user or has expired.
+    """
+    try:
+      return await auth_service.refresh_access_token(refresh_token=refresh_token)
+    except UserNotFoundException as e:
+       raise HTTPException(status_code=404, detail=str(e))
 
+@api.post("/revoke-refresh-token", status_code=204, tags=["Auth"])
+async def revoke_refresh_token(refresh_token: str = Header(), auth_service: AuthenticationService = Depends()) -> None:
+    """
+    Revoke a refresh token so that it can no longer be used to refresh access tokens.
+
+    Args:
+      refresh_token: The refresh token to revoke (passed as a header)
+
+    Raises:
+      404: If the refresh token does not match a user.
     """
     try:
-      return auth_service.refresh_access_token(refresh_token=refresh_token)
+      await auth_service.revoke_refresh_token(refresh_token=refresh_token)
     except UserNotFoundException as e:
        raise HTTPException(status_code=404, detail=str(e))
 
 @api.get("/get", tags=["Auth"])
-def get_current_user(user_service: UserService = Depends()) -> User:
+async def get_current_user(user_service: UserService = Depends()) -> User:
     """
     Get the current user from the database. Depends on the Authorization header with a valid Bearer token.
     If testing endpoints using the docs page of the API, then the route will require no params when authorized.
@@ -110,7 +141,7 @@ def get_current_user(user_service: UserService = Depends()) -> User:
       404: If the user is not found in the database.
     """
     try:
-      return user_service.get_current_active_user()
+      return await user_service.get_current_active_user()
     except DisabledUserException as e:
       raise HTTPException(status_code=401, detail=str(e))
     except InvalidTokenException as e:
@@ -119,7 +150,7 @@ def get_current_user(user_service: UserService = Depends()) -> User:
       raise HTTPException(status_code=404, detail=str(e))
     
 @api.delete("/delete", tags=["Auth"])
-def delete_current_user(user_service: UserService = Depends()) -> User:
+async def delete_current_user(user_service: UserService = Depends()) -> User:
     """
     Deletes the currently authenticated user from the database.
 
@@ -132,7 +163,7 @@ def delete_current_user(user_service: UserService = Depends()) -> User:
       404: If the user is not found in the database.
     """
     try:
-      return user_service.delete_current_user()
+      return await user_service.delete_current_user()
     except DisabledUserException as e:
       raise HTTPException(status_code=401, detail=str(e))
     except InvalidTokenException as e:
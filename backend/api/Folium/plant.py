@@ -1,43 +1,244 @@
 """API routes for the Folium plant module."""
 
-from fastapi import Depends, HTTPException, APIRouter
+import hashlib
+from datetime import datetime
+from typing import AsyncIterator
 
-from ...services.Folium.plant_service import PlantService
+from fastapi import Depends, HTTPException, APIRouter, Query, Header, Response
+from fastapi.responses import StreamingResponse
+
+from ...serialization import ModelJSONResponse, dumps
+from ...compression import negotiate_encoding
+from ...services.Folium.plant_service import PlantService, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, parse_fields
+from ...services.Folium.plant_name_index import AUTOCOMPLETE_DEFAULT_RESULTS, AUTOCOMPLETE_MAX_RESULTS
 from ...services.Authentication.user_service import UserService
-from ...models.Folium.plant import Plant
-from ...services.Folium.exceptions import PlantOwnerUsernameInvalidException, PlantNotFoundException, PlantBlankIdException
+from ...models.Folium.plant import Plant, PlantPatch, PlantPage, PlantBulkResult
+from ...services.Folium.exceptions import (PlantOwnerUsernameInvalidException,
+                                           PlantNotFoundException,
+                                           PlantBlankIdException,
+                                           PlantInvalidCursorException,
+                                           PlantBulkLimitExceededException,
+                                           PlantInvalidFieldsException)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
 
-api = APIRouter(prefix="/folium/plant")
+api = APIRouter(prefix="/folium/plant", default_response_class=ModelJSONResponse)
 openapi_tags = {
     "name":"Folium Plant",
     "description":"Routes to interact with Folium API plant functionality."   
 }
 
+def _collection_etag(owner_username: str, version: int) -> str:
+    """Helper function that formats the version of a plant collection as a weak ETag.
+
+    Versions are counted per user, so a short hash of the owner is mixed in to keep two users'
+    collections at the same version from sharing an ETag in a cache.
+    The ETag is weak because the same version is served as a JSON array or as NDJSON."""
+    owner = hashlib.sha256(owner_username.encode()).hexdigest()[:12]
+    return f'W/"{owner}-{version}"'
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Helper function that checks an 'If-None-Match' header against an ETag using weak comparison."""
+    if if_none_match is None:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag.removeprefix("W/") in [tag.removeprefix("W/") for tag in tags]
+
+async def _ndjson_lines(plants: AsyncIterator[Plant | dict]) -> AsyncIterator[bytes]:
+    """Helper generator that encodes each plant as one line of newline delimited JSON."""
+    async for plant in plants:
+        yield dumps(plant) + b"\n"
+
+async def _json_array_chunks(plants: AsyncIterator[Plant | dict]) -> AsyncIterator[bytes]:
+    """Helper generator that encodes plants as a JSON array, one element at a time."""
+    separator = b"["
+    async for plant in plants:
+        yield separator + dumps(plant)
+        separator = b","
+    yield b"[]" if separator == b"[" else b"]"
+
 @api.get("/get_user_plants", tags=["Folium Plant"])
-def get_user_plants(plant_service: PlantService = Depends(),
-                    user_service: UserService = Depends(),) -> list[Plant]:
+async def get_user_plants(stream: bool = False,
+                          fields: str | None = None,
+                          accept: str | None = Header(default=None),
+                          accept_encoding: str | None = Header(default=None),
+                          if_none_match: str | None = Header(default=None),
+                          plant_service: PlantService = Depends(),
+                          user_service: UserService = Depends(),) -> list[Plant]:
     """
     Get all of the plants that belong to a user.
+
+    The plants are streamed as they are read from the database when the 'Accept' header
+    asks for 'application/x-ndjson' (one plant per line) or when 'stream' is true (a JSON array).
+
+    Every response carries an 'ETag' for the version of the collection. When the 'If-None-Match'
+    header matches it, the plants have not changed and 304 is returned without reading them.
+    Otherwise the serialized list is served from the plant list cache when possible, already
+    compressed with the coding negotiated from the 'Accept-Encoding' header.
+
+    When 'fields' is given, only those fields are read from the database and each plant is
+    returned as an object holding just them, plus 'id'.
     
     Args:
-        key: The key of the user to retrieve plants for.
+        stream: Whether to stream the plants as a JSON array instead of building the whole list first.
+        fields: Comma separated names of the plant fields to return, such as "common_name,image_url,last_watering".
+        accept: The 'Accept' header of the request.
+        accept_encoding: The 'Accept-Encoding' header of the request.
+        if_none_match: The 'If-None-Match' header of the request.
         
     Returns:
         list[Plant]: A list of the plants that belong to the user.
 
+    Raises:
+        304: If the collection has not changed since the ETag passed in 'If-None-Match'.
+        422: If 'fields' names a field that plants do not have.
+        401: If the user is not authorized or the access token is improperly formatted.
+    """
+
+    try:
+        user = await user_service.get_current_active_user()
+        projection = parse_fields(fields) if fields is not None else None
+        # The version is read before the plants, so a concurrent write can only make the
+        # ETag older than the body, which costs the client a refetch rather than a stale copy.
+        version = await plant_service.get_collection_version(owner_username=user.username)
+        etag = _collection_etag(user.username, version)
+        headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+
+        if accept is not None and NDJSON_MEDIA_TYPE in accept:
+            plants = plant_service.stream_user_plants(owner_username=user.username, fields=projection)
+            return StreamingResponse(_ndjson_lines(plants), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+        if stream:
+            plants = plant_service.stream_user_plants(owner_username=user.username, fields=projection)
+            return StreamingResponse(_json_array_chunks(plants), media_type="application/json", headers=headers)
+        body, encoding = await plant_service.get_all_user_plants_json_compressed(owner_username=user.username,
+                                                                                 version=version,
+                                                                                 fields=projection,
+                                                                                 encoding=negotiate_encoding(accept_encoding))
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type="application/json", headers=headers)
+    except PlantInvalidFieldsException as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=401, detail=str(e))
+    
+@api.get("/get_user_plants_page", tags=["Folium Plant"])
+async def get_user_plants_page(limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                               cursor: str | None = None,
+                               plant_service: PlantService = Depends(),
+                               user_service: UserService = Depends()) -> PlantPage:
+    """
+    Get one page of the plants that belong to a user.
+    
+    Args:
+        limit: The maximum number of plants to return.
+        cursor: The 'next_cursor' returned with the previous page. Omit it to get the first page.
+        
+    Returns:
+        PlantPage: The plants on the page and the cursor to retrieve the next page with.
+
+    Raises:
+        422: If the cursor is invalid.
+        401: If the user is not authorized or the access token is improperly formatted.
+    """
+
+    try:
+        user = await user_service.get_current_active_user()
+        return ModelJSONResponse(await plant_service.get_user_plants_page(owner_username=user.username, limit=limit, cursor=cursor))
+    except PlantInvalidCursorException as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=401, detail=str(e))
+    
+@api.get("/search", tags=["Folium Plant"])
+async def search_plants(q: str = Query(min_length=1),
+                        limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                        cursor: str | None = None,
+                        plant_service: PlantService = Depends(),
+                        user_service: UserService = Depends()) -> PlantPage:
+    """
+    Search the names and descriptions of a user's plants, best matches first.
+    
+    Args:
+        q: The search terms. Supports "quoted phrases", 'or' and -excluded words.
+        limit: The maximum number of plants to return.
+        cursor: The 'next_cursor' returned with the previous page. Omit it to get the first page.
+        
+    Returns:
+        PlantPage: The matching plants and the cursor to retrieve the next page with.
+
+    Raises:
+        422: If the cursor is invalid.
+        401: If the user is not authorized or the access token is improperly formatted.
+    """
+
+    try:
+        user = await user_service.get_current_active_user()
+        return ModelJSONResponse(await plant_service.search_user_plants(owner_username=user.username, query=q, limit=limit, cursor=cursor))
+    except PlantInvalidCursorException as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=401, detail=str(e))
+
+@api.get("/due", tags=["Folium Plant"])
+async def get_due_plants(due_by: datetime | None = None,
+                         limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                         plant_service: PlantService = Depends(),
+                         user_service: UserService = Depends()) -> list[Plant]:
+    """
+    Get the plants of a user that are due for watering, most overdue first.
+    
+    Args:
+        due_by: Plants due at or before this time are returned. Defaults to now.
+        limit: The maximum number of plants to return.
+        
+    Returns:
+        list[Plant]: The plants that are due for watering.
+
+    Raises:
+        401: If the user is not authorized or the access token is improperly formatted.
+    """
+
+    try:
+        user = await user_service.get_current_active_user()
+        return ModelJSONResponse(await plant_service.get_due_plants(owner_username=user.username, due_by=due_by, limit=limit))
+    except Exception as e:
+        raise HTTPException(status_code=401, detail=str(e))
+    
+@api.get("/autocomplete", tags=["Folium Plant"])
+async def autocomplete_plant_names(prefix: str = Query(min_length=1),
+                                   limit: int = Query(default=AUTOCOMPLETE_DEFAULT_RESULTS, ge=1, le=AUTOCOMPLETE_MAX_RESULTS),
+                                   plant_service: PlantService = Depends(),
+                                   user_service: UserService = Depends()) -> list[str]:
+    """
+    Suggest the common and scientific names of the user's plants that start with the text typed so far.
+
+    Suggestions are served from the user's in-memory plant name index, which is only rebuilt
+    from the plant table when the user's plants have changed.
+    
+    Args:
+        prefix: The text typed so far. Matching ignores case.
+        limit: The maximum number of names to return.
+        
+    Returns:
+        list[str]: The matching names in alphabetical order.
+
     Raises:
         401: If the user is not authorized or the access token is improperly formatted.
     """
 
     try:
-        return plant_service.get_all_user_plants(owner_username=user_service.get_current_active_user().username)
+        user = await user_service.get_current_active_user()
+        return await plant_service.suggest_plant_names(owner_username=user.username, prefix=prefix, limit=limit)
     except Exception as e:
         raise HTTPException(status_code=401, detail=str(e))
     
 @api.post("/create_plant", tags=["Folium Plant"])
-def create_plant(plant: Plant,
-                 plant_service: PlantService = Depends(),
-                 user_service: UserService = Depends()) -> Plant:
+async def create_plant(plant: Plant,
+                       plant_service: PlantService = Depends(),
+                       user_service: UserService = Depends()) -> Plant:
     """
     Create a new plant for a user in the database.
     
@@ -53,16 +254,17 @@ def create_plant(plant: Plant,
     """
 
     try:
-        return plant_service.create_plant(plant=plant, owner_username=user_service.get_current_active_user().username)
+        user = await user_service.get_current_active_user()
+        return ModelJSONResponse(await plant_service.create_plant(plant=plant, owner_username=user.username))
     except PlantOwnerUsernameInvalidException as e:
         raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=401, detail=str(e))
     
 @api.put(path="/update_plant", tags=["Folium Plant"])
-def update_plant(plant: Plant,
-                 plant_service: PlantService = Depends(),
-                 user_service: UserService = Depends()) -> Plant:
+async def update_plant(plant: Plant,
+                       plant_service: PlantService = Depends(),
+                       user_service: UserService = Depends()) -> Plant:
     """
     Updates and returns a plant that is already in the database.
 
@@ -79,7 +281,39 @@ def update_plant(plant: Plant,
     """
 
     try:
-        return plant_service.update_Plant(plant=plant, owner_username=user_service.get_current_active_user().username)
+        user = await user_service.get_current_active_user()
+        return ModelJSONResponse(await plant_service.update_Plant(plant=plant, owner_username=user.username))
+    except PlantNotFoundException as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except PlantBlankIdException as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=401, detail=str(e))
+    
+@api.patch(path="/patch_plant/{plant_id}", tags=["Folium Plant"])
+async def patch_plant(plant_id: int,
+                      patch: PlantPatch,
+                      plant_service: PlantService = Depends(),
+                      user_service: UserService = Depends()) -> Plant:
+    """
+    Changes only the given properties of a plant that is already in the database.
+
+    Args:
+        plant_id: The id of the plant to change.
+        patch: The properties to change. Properties that are left out keep their current value.
+        
+    Returns:
+        Plant: The plant after the change.
+        
+    Raises:
+        404: If the plant is not found in the database.
+        422: If the plant id is blank.
+        401: If the user is not authorized or the access token is improperly formatted.
+    """
+
+    try:
+        user = await user_service.get_current_active_user()
+        return ModelJSONResponse(await plant_service.patch_plant(plant_id=plant_id, patch=patch, owner_username=user.username))
     except PlantNotFoundException as e:
         raise HTTPException(status_code=404, detail=str(e))
     except PlantBlankIdException as e:
@@ -87,30 +321,109 @@ def update_plant(plant: Plant,
     except Exception as e:
         raise HTTPException(status_code=401, detail=str(e))
     
-@api.delete(path="/delete_plant", tags=["Folium Plant"])
-def delete_plant(plant: Plant,
-                 plant_service: PlantService = Depends(),
-                 user_service: UserService = Depends()) -> Plant:
+@api.delete(path="/delete_plant/{plant_id}", tags=["Folium Plant"])
+async def delete_plant(plant_id: int,
+                       plant_service: PlantService = Depends(),
+                       user_service: UserService = Depends()) -> Plant:
     """
     Removes a plant from the database.
     
     Args:
-        plant: The plant to delete from the database.
+        plant_id: The id of the plant to delete from the database.
         
     Returns:
         Plant: The plant that was successfully deleted from the database.
 
     Raises:
-        404: If the plant passed as an arg is not found in the database.
-        422: If the plant.owner_username does not match that of the currently authenticated user.
+        404: If the plant is not found in the database or belongs to another user.
+        422: If the plant id is blank.
         401: If the user is not authorized or the access token is improperly formatted.
     """
 
     try:
-        return plant_service.remove_plant(plant=plant, owner_username=user_service.get_current_active_user().username)
+        user = await user_service.get_current_active_user()
+        return ModelJSONResponse(await plant_service.remove_plant(plant_id=plant_id, owner_username=user.username))
     except PlantNotFoundException as e:
         raise HTTPException(status_code=404, detail=str(e))
     except PlantBlankIdException as e:
         raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=401, detail=str(e))
+
+@api.post("/bulk", tags=["Folium Plant"])
+async def bulk_create_plants(plants: list[Plant],
+                             plant_service: PlantService = Depends(),
+                             user_service: UserService = Depends()) -> PlantBulkResult:
+    """
+    Create many plants for a user in a single transaction.
+    
+    Args:
+        plants: The plant objects to be added to the database.
+        
+    Returns:
+        PlantBulkResult: The newly created plants and the items that were skipped.
+        
+    Raises:
+        422: If more plants are passed than a single bulk request may write.
+        401: If the user is not authorized or the access token is improperly formatted.
+    """
+
+    try:
+        user = await user_service.get_current_active_user()
+        return ModelJSONResponse(await plant_service.bulk_create_plants(plants=plants, owner_username=user.username))
+    except PlantBulkLimitExceededException as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=401, detail=str(e))
+
+@api.put("/bulk", tags=["Folium Plant"])
+async def bulk_update_plants(plants: list[Plant],
+                             plant_service: PlantService = Depends(),
+                             user_service: UserService = Depends()) -> PlantBulkResult:
+    """
+    Update many plants that are already in the database in a single transaction.
+    
+    Args:
+        plants: The plants to update in the database.
+        
+    Returns:
+        PlantBulkResult: The updated plants and the items that were skipped.
+        
+    Raises:
+        422: If more plants are passed than a single bulk request may write.
+        401: If the user is not authorized or the access token is improperly formatted.
+    """
+
+    try:
+        user = await user_service.get_current_active_user()
+        return ModelJSONResponse(await plant_service.bulk_update_plants(plants=plants, owner_username=user.username))
+    except PlantBulkLimitExceededException as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=401, detail=str(e))
+
+@api.delete("/bulk", tags=["Folium Plant"])
+async def bulk_delete_plants(plant_ids: list[int],
+                             plant_service: PlantService = Depends(),
+                             user_service: UserService = Depends()) -> PlantBulkResult:
+    """
+    Removes many plants from the database in a single transaction.
+    
+    Args:
+        plant_ids: The ids of the plants to delete from the database.
+        
+    Returns:
+        PlantBulkResult: The plants that were deleted and the ids that were skipped.
+        
+    Raises:
+        422: If more ids are passed than a single bulk request may delete.
+        401: If the user is not authorized or the access token is improperly formatted.
+    """
+
+    try:
+        user = await user_service.get_current_active_user()
+        return ModelJSONResponse(await plant_service.bulk_remove_plants(plant_ids=plant_ids, owner_username=user.username))
+    except PlantBulkLimitExceededException as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=401, detail=str(e))
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""API routes for the health history of plants in the Folium plant module."""
+
+from datetime import datetime
+
+from fastapi import Depends, HTTPException, APIRouter, Query
+
+from ...services.Folium.plant_health_service import (PlantHealthService,
+                                                     DEFAULT_SAMPLE_LIMIT,
+                                                     MAX_SAMPLE_LIMIT,
+                                                     DEFAULT_SUMMARY_WINDOW)
+from ...services.Authentication.user_service import UserService
+from ...models.Folium.plant_health import PlantHealthSample, PlantHealthSummary
+from ...services.Folium.exceptions import PlantNotFoundException
+
+api = APIRouter(prefix="/folium/plant")
+openapi_tags = {
+    "name":"Folium Plant Health",
+    "description":"Routes to record and analyze the health history of Folium plants."
+}
+
+@api.post("/add_health_sample/{plant_id}", tags=["Folium Plant Health"])
+async def add_health_sample(plant_id: int,
+                            sample: PlantHealthSample,
+                            plant_health_service: PlantHealthService = Depends(),
+                            user_service: UserService = Depends()) -> PlantHealthSample:
+    """
+    Append a health rating to a plant's history.
+    
+    Args:
+        plant_id: The id of the plant the rating is for.
+        sample: The rating, and optionally when it was recorded.
+        
+    Returns:
+        PlantHealthSample: The rating that was recorded.
+        
+    Raises:
+        404: If the plant is not found in the database.
+        401: If the user is not authorized or the access token is improperly formatted.
+    """
+
+    try:
+        user = await user_service.get_current_active_user()
+        return await plant_health_service.add_sample(plant_id=plant_id, sample=sample, owner_username=user.username)
+    except PlantNotFoundException as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=401, detail=str(e))
+
+@api.get("/get_health_samples/{plant_id}", tags=["Folium Plant Health"])
+async def get_health_samples(plant_id: int,
+                             start: datetime | None = None,
+                             end: datetime | None = None,
+                             limit: int = Query(default=DEFAULT_SAMPLE_LIMIT, ge=1, le=MAX_SAMPLE_LIMIT),
+                             plant_health_service: PlantHealthService = Depends(),
+                             user_service: UserService = Depends()) -> list[PlantHealthSample]:
+    """
+    Get the health ratings of a plant within a time range, oldest first.
+
+    When more than 'limit' ratings are in the range, the earliest ones from 'start' are
+    returned if it is set, and the latest ones otherwise.
+    
+    Args:
+        plant_id: The id of the plant.
+        start: Only ratings recorded at or after this time are returned, if set.
+        end: Only ratings recorded before this time are returned, if set.
+        limit: The maximum number of ratings to return.
+        
+    Returns:
+        list[PlantHealthSample]: The plant's ratings in the range.
+        
+    Raises:
+        404: If the plant is not found in the database.
+        401: If the user is not authorized or the access token is improperly formatted.
+    """
+
+    try:
+        user = await user_service.get_current_active_user()
+        return await plant_health_service.get_samples(plant_id=plant_id, owner_username=user.username,
+                                                      start=start, end=end, limit=limit)
+    except PlantNotFoundException as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=401, detail=str(e))
+
+@api.get("/get_health_summary/{plant_id}", tags=["Folium Plant Health"])
+async def get_health_summary(plant_id: int,
+                             window: int = Query(default=DEFAULT_SUMMARY_WINDOW, ge=1, le=MAX_SAMPLE_LIMIT),
+                             plant_health_service: PlantHealthService = Depends(),
+                             user_service: UserService = Depends()) -> PlantHealthSummary:
+    """
+    Get the latest rating, rolling average and trend of a plant's health.
+    
+    Args:
+        plant_id: The id of the plant.
+        window: The number of most recent ratings to aggregate.
+        
+    Returns:
+        PlantHealthSummary: The aggregate health of the plant over the window.
+        
+    Raises:
+        404: If the plant is not found in the database.
+        401: If the user is not authorized or the access token is improperly formatted.
+    """
+
+    try:
+        user = await user_service.get_current_active_user()
+        return await plant_health_service.get_summary(plant_id=plant_id, owner_username=user.username, window=window)
+    except PlantNotFoundException as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=401, detail=str(e))
@@ -0,0 +1,156 @@
+"""API routes to monitor the health of the API, its database connection pool, caches, worker pools and request latency."""
+
+import secrets
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy import text
+
+from ..env import getenv
+from ..database import async_engine, pool_status
+from ..metrics import request_metrics, PROMETHEUS_MEDIA_TYPE
+from ..models.health import HealthStatus, PoolStatus, CacheStats, HashingPoolStats, PlantListCacheStats
+from ..services.Authentication.principal_cache import principal_cache
+from ..services.Folium.plant_list_cache import plant_list_cache
+from ..services.Folium.species_cache import species_cache
+from ..services.Authentication.password_hasher import password_hasher
+
+# Bearer token that the '/debug/*' and '/metrics' routes require. When it is not set, those routes are disabled.
+OPS_TOKEN = getenv("OPS_TOKEN", "")
+
+api = APIRouter()
+openapi_tags = {
+    "name":"Health",
+    "description":"Routes to monitor the health of the API, its database connection pool, caches and worker pools."
+}
+
+def require_ops_token(authorization: str | None = Header(default=None)) -> None:
+    """
+    Dependency that restricts the monitoring routes to callers holding the ops token.
+
+    Args:
+        authorization: The 'Authorization' header of the request, as 'Bearer <OPS_TOKEN>'.
+
+    Raises:
+        404: If 'OPS_TOKEN' is not set, so the monitoring routes are disabled.
+        401: If the header does not carry the ops token.
+    """
+
+    if not OPS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token.encode(), OPS_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid ops token.", headers={"WWW-Authenticate": "Bearer"})
+
+@api.get("/healthz", tags=["Health"])
+async def healthz() -> HealthStatus:
+    """
+    Check that the API is up and can reach the database.
+
+    Returns:
+        HealthStatus: The status of the API and the database.
+
+    Raises:
+        503: If a connection to the database cannot be established.
+    """
+
+    try:
+        async with async_engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+    except Exception:
+        return JSONResponse(status_code=503,
+                            content=HealthStatus(status="unavailable", database="unreachable").model_dump())
+
+    return HealthStatus(status="ok", database="ok")
+
+@api.get("/debug/pool", tags=["Health"], dependencies=[Depends(require_ops_token)])
+async def get_pool_status() -> PoolStatus:
+    """
+    Get a snapshot of the database connection pool.
+
+    Returns:
+        PoolStatus: The checked out and idle connections, overflow use and checkout wait times.
+
+    Raises:
+        404: If the monitoring routes are disabled.
+        401: If the ops token is missing or wrong.
+    """
+
+    return pool_status()
+
+@api.get("/debug/principal_cache", tags=["Health"], dependencies=[Depends(require_ops_token)])
+async def get_principal_cache_stats() -> CacheStats:
+    """
+    Get the hit/miss counters of the authenticated principal cache.
+
+    Returns:
+        CacheStats: The size, hits, misses and evictions of the principal cache.
+
+    Raises:
+        404: If the monitoring routes are disabled.
+        401: If the ops token is missing or wrong.
+    """
+
+    return principal_cache.stats()
+
+@api.get("/debug/plant_cache", tags=["Health"], dependencies=[Depends(require_ops_token)])
+async def get_plant_cache_stats() -> PlantListCacheStats:
+    """
+    Get the hit/miss counters of the plant list cache.
+
+    Returns:
+        PlantListCacheStats: The backend, size, hits, misses and evictions of the plant list cache.
+
+    Raises:
+        404: If the monitoring routes are disabled.
+        401: If the ops token is missing or wrong.
+    """
+
+    return plant_list_cache.stats()
+
+@api.get("/debug/species_cache", tags=["Health"], dependencies=[Depends(require_ops_token)])
+async def get_species_cache_stats() -> CacheStats:
+    """
+    Get the hit/miss counters of the species cache.
+
+    Returns:
+        CacheStats: The size, hits, misses and evictions of the species cache.
+
+    Raises:
+        404: If the monitoring routes are disabled.
+        401: If the ops token is missing or wrong.
+    """
+
+    return species_cache.stats()
+
+@api.get("/debug/hashing_pool", tags=["Health"], dependencies=[Depends(require_ops_token)])
+async def get_hashing_pool_stats() -> HashingPoolStats:
+    """
+    Get the queue depth and latency of the password hashing process pool.
+
+    Returns:
+        HashingPoolStats: The pending, queued, completed and rejected hashing jobs.
+
+    Raises:
+        404: If the monitoring routes are disabled.
+        401: If the ops token is missing or wrong.
+    """
+
+    return password_hasher.stats()
+
+@api.get("/metrics", tags=["Health"], response_class=PlainTextResponse, dependencies=[Depends(require_ops_token)])
+async def get_metrics() -> PlainTextResponse:
+    """
+    Get per-route histograms of request latency, of the time spent authenticating, querying
+    the database and serializing, and of the number of queries per request.
+
+    Returns:
+        PlainTextResponse: The histograms in the Prometheus text format.
+
+    Raises:
+        404: If the monitoring routes are disabled.
+        401: If the ops token is missing or wrong.
+    """
+
+    return PlainTextResponse(request_metrics.render(), media_type=PROMETHEUS_MEDIA_TYPE)
@@ -0,0 +1,176 @@
+"""Response compression negotiated from the 'Accept-Encoding' request header.
+
+Responses are compressed with brotli or gzip by 'CompressionMiddleware'. Routes that serve
+cached bodies can compress them once with 'compress' and cache the result; responses that
+already carry a 'Content-Encoding' are passed through by the middleware untouched."""
+
+import zlib
+from typing import Callable
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .env import getenv
+
+# Responses smaller than this many bytes are sent uncompressed, as compressing them saves too little.
+COMPRESSION_MIN_SIZE = int(getenv("COMPRESSION_MIN_SIZE", "1024"))
+# zlib compression level of gzip responses, from 1 (fastest) to 9 (smallest).
+COMPRESSION_GZIP_LEVEL = int(getenv("COMPRESSION_GZIP_LEVEL", "6"))
+# Quality of brotli responses, from 0 (fastest) to 11 (smallest).
+COMPRESSION_BROTLI_QUALITY = int(getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+
+# Supported content codings, from most to least preferred when the client accepts several equally.
+SUPPORTED_ENCODINGS = ("br", "gzip")
+
+# Media types worth compressing, besides every 'text/' type.
+COMPRESSIBLE_MEDIA_TYPES = frozenset({"application/json", "application/x-ndjson"})
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """
+    Choose the content coding of a response from the 'Accept-Encoding' header of its request.
+
+    Args:
+        accept_encoding: The 'Accept-Encoding' header of the request, or None if it was not sent.
+
+    Returns:
+        str | None: The supported coding with the highest quality value, or None to send the response uncompressed.
+    """
+
+    if not accept_encoding:
+        return None
+
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, _, parameters = item.partition(";")
+        quality = 1.0
+        name, _, value = parameters.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        qualities[coding.strip().lower()] = quality
+
+    wildcard = qualities.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for coding in SUPPORTED_ENCODINGS:
+        quality = qualities.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+def _compressor(encoding: str) -> tuple[Callable[[bytes], bytes], Callable[[], bytes], Callable[[], bytes]]:
+    """
+    Helper function that starts a compression stream, returning its functions to compress a chunk,
+    to flush the output buffered so far, and to finish the stream.
+    """
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+        return compressor.process, compressor.flush, compressor.finish
+    # A window size offset by 16 makes zlib write a gzip header and trailer.
+    compressor = zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """
+    Compress a whole response body.
+
+    Args:
+        body: The body to compress.
+        encoding: The content coding, as returned by 'negotiate_encoding'.
+
+    Returns:
+        bytes: The compressed body.
+    """
+
+    process, _, finish = _compressor(encoding)
+    return process(body) + finish()
+
+def _compressible(headers: Headers) -> bool:
+    """Helper function that checks whether a response is worth compressing and is not encoded already."""
+    if "content-encoding" in headers:
+        return False
+    media_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+    return media_type.startswith("text/") or media_type in COMPRESSIBLE_MEDIA_TYPES
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware that compresses responses with the coding negotiated from 'Accept-Encoding'.
+
+    Whole bodies smaller than 'minimum_size' are sent as they are. Streamed bodies are
+    compressed as they are sent, and each chunk is flushed, so streaming responses keep
+    constant memory use and clients receive every chunk as soon as it is sent.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await self.app(scope, receive, _CompressingSend(send, encoding, self.minimum_size))
+
+
+class _CompressingSend:
+    """Helper class that wraps the 'send' callable of one response, compressing its body messages."""
+
+    def __init__(self, send: Send, encoding: str, minimum_size: int):
+        self._send = send
+        self._encoding = encoding
+        self._minimum_size = minimum_size
+        # The start message is held back until the first body message shows whether to compress.
+        self._start: Message | None = None
+        self._process: Callable[[bytes], bytes] | None = None
+        self._flush: Callable[[], bytes] | None = None
+        self._finish: Callable[[], bytes] | None = None
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self._start = message
+            return
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self._start is not None:
+            start, self._start = self._start, None
+            headers = MutableHeaders(raw=start["headers"])
+            if start["status"] in (204, 304) or not _compressible(headers) or (not more_body and len(body) < self._minimum_size):
+                await self._send(start)
+                await self._send(message)
+                return
+
+            self._process, self._flush, self._finish = _compressor(self._encoding)
+            headers["Content-Encoding"] = self._encoding
+            if "accept-encoding" not in [value.strip().lower() for value in headers.get("vary", "").split(",")]:
+                headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                if "content-length" in headers:
+                    del headers["Content-Length"]
+            else:
+                body = self._process(body) + self._finish()
+                headers["Content-Length"] = str(len(body))
+                await self._send(start)
+                await self._send({"type": "http.response.body", "body": body})
+                return
+            await self._send(start)
+
+        if self._process is None:
+            await self._send(message)
+            return
+
+        # Compressors buffer small inputs, so each chunk is flushed rather than held back until the body ends.
+        chunk = self._process(body) + (self._flush() if more_body else self._finish())
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
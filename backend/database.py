@@ -1,26 +1,159 @@
 """SQLAlchemy DB Engine and Session niceties for FastAPI dependency injection."""
 
+import time
+from collections import deque
+
 import sqlalchemy
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util.queue import AsyncAdaptedQueue
 from .env import getenv
+from .metrics import instrument_engine
+from .models.health import PoolStatus
+
+SYNC_DIALECT = "postgresql+psycopg2"
+ASYNC_DIALECT = "postgresql+asyncpg"
 
-def _engine_str(database=getenv("POSTGRES_DATABASE")) -> str:
+# Connection pool settings. The total number of connections a worker can open is
+# POOL_SIZE + POOL_MAX_OVERFLOW, which multiplied by the number of workers must stay
+# below the `max_connections` setting of the Postgres server.
+POOL_SIZE = int(getenv("DATABASE_POOL_SIZE", "5"))
+POOL_MAX_OVERFLOW = int(getenv("DATABASE_POOL_MAX_OVERFLOW", "10"))
+POOL_PRE_PING = getenv("DATABASE_POOL_PRE_PING", "true").lower() == "true"
+POOL_RECYCLE_SECONDS = int(getenv("DATABASE_POOL_RECYCLE_SECONDS", "1800"))
+POOL_TIMEOUT_SECONDS = float(getenv("DATABASE_POOL_TIMEOUT_SECONDS", "30"))
+ECHO = getenv("DATABASE_ECHO", "false").lower() == "true"
+
+def _engine_str(database=getenv("POSTGRES_DATABASE"), dialect: str = SYNC_DIALECT) -> str:
     """Helper function for reading settings from environment variables to produce connection string."""
-    dialect = "postgresql+psycopg2"
     user = getenv("POSTGRES_USER")
     password = getenv("POSTGRES_PASSWORD")
     host = getenv("POSTGRES_HOST")
     port = getenv("POSTGRES_PORT")
     return f"{dialect}://{user}:{password}@{host}:{port}/{database}"
 
-engine = sqlalchemy.create_engine(_engine_str(), echo=True)
-"""Application-level SQLAlchemy database engine."""
+
+class _WaitTimingQueue(AsyncAdaptedQueue):
+    """Queue of idle pool connections that reports how long each blocking get waited for a connection.
+
+    Gets only block once every connection the pool may open, overflow included, exists.
+    Non-blocking gets, made while the pool may still open connections, are not reported."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Set by the pool that owns the queue.
+        self.on_wait = None
+
+    def get(self, block=True, timeout=None):
+        if not block:
+            return super().get(block, timeout)
+        start = time.perf_counter()
+        try:
+            return super().get(block, timeout)
+        finally:
+            self.on_wait(time.perf_counter() - start)
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long each checkout waited for an idle connection.
+
+    Only the wait on the queue of idle connections is timed. Opening a new connection is not
+    counted as waiting, so the wait times only show contention for the pool."""
+
+    _queue_class = _WaitTimingQueue
+
+    # Number of recent checkout wait times kept to compute percentiles.
+    WAIT_SAMPLE_SIZE = 1024
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pool.on_wait = self._record_wait
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.recent_waits: deque[float] = deque(maxlen=self.WAIT_SAMPLE_SIZE)
+
+    def _do_get(self):
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.checkout_timeouts += 1
+            raise
+
+        self.checkouts += 1
+        return connection
+
+    def _record_wait(self, waited: float) -> None:
+        """Helper method that records the time a checkout blocked waiting for a connection."""
+        self.total_wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        self.recent_waits.append(waited)
+
+    def recreate(self):
+        # Pool statistics are per pool instance, so carry them over when the pool is recreated.
+        new_pool = super().recreate()
+        new_pool.checkouts = self.checkouts
+        new_pool.checkout_timeouts = self.checkout_timeouts
+        new_pool.total_wait_seconds = self.total_wait_seconds
+        new_pool.max_wait_seconds = self.max_wait_seconds
+        new_pool.recent_waits = self.recent_waits
+        return new_pool
+
+
+engine = sqlalchemy.create_engine(_engine_str(), echo=ECHO)
+"""Synchronous SQLAlchemy database engine used by the database management scripts."""
+
+async_engine = create_async_engine(
+    _engine_str(dialect=ASYNC_DIALECT),
+    echo=ECHO,
+    poolclass=InstrumentedAsyncQueuePool,
+    pool_size=POOL_SIZE,
+    max_overflow=POOL_MAX_OVERFLOW,
+    pool_pre_ping=POOL_PRE_PING,
+    pool_recycle=POOL_RECYCLE_SECONDS,
+    pool_timeout=POOL_TIMEOUT_SECONDS,
+)
+"""Application-level asynchronous SQLAlchemy database engine."""
+
+# Add the queries of each request to its Server-Timing header and to the '/metrics' histograms.
+instrument_engine(async_engine)
+
+async_session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+"""Factory producing AsyncSessions bound to the application-level engine.
+
+Objects are not expired on commit so that entities can still be converted to models
+after a commit without triggering an implicit (and unsupported) async lazy load."""
+
+
+def pool_status() -> PoolStatus:
+    """Snapshot the state of the application-level connection pool."""
+    pool: InstrumentedAsyncQueuePool = async_engine.pool
+    waits = sorted(pool.recent_waits)
+
+    def percentile(fraction: float) -> float:
+        return waits[min(len(waits) - 1, int(len(waits) * fraction))] * 1000 if waits else 0.0
+
+    return PoolStatus(
+        pool_size=pool.size(),
+        max_overflow=POOL_MAX_OVERFLOW,
+        checked_out=pool.checkedout(),
+        idle=pool.checkedin(),
+        overflow=max(pool.overflow(), 0),
+        checkouts=pool.checkouts,
+        checkout_timeouts=pool.checkout_timeouts,
+        mean_wait_ms=pool.total_wait_seconds / pool.checkouts * 1000 if pool.checkouts else 0.0,
+        p50_wait_ms=percentile(0.50),
+        p99_wait_ms=percentile(0.99),
+        max_wait_ms=pool.max_wait_seconds * 1000,
+    )
 
 
-def db_session():
-    """Generator function offering dependency injection of SQLAlchemy Sessions."""
-    session = Session(engine)
+async def db_session():
+    """Async generator function offering dependency injection of SQLAlchemy AsyncSessions."""
+    session: AsyncSession = async_session_factory()
     try:
         yield session
     finally:
-        session.close()
+        await session.close()
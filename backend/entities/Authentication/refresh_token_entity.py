@@ -0,0 +1,37 @@
+"""Declaration for the refresh_token table in the database."""
+
+from datetime import datetime
+
+from sqlalchemy import Integer, String, LargeBinary, DateTime, ForeignKey, UniqueConstraint, Index, func
+from sqlalchemy.orm import mapped_column, Mapped
+
+from ..entity_base import EntityBase
+
+class RefreshTokenEntity(EntityBase):
+    """
+    Entity to represent the refresh tokens issued to users, one row per user and device.
+
+    Only a SHA-256 digest of each token is stored. Refresh tokens are long random strings,
+    so a fast digest is enough to protect them at rest while allowing lookups through a
+    unique index instead of scanning and bcrypt-verifying every row.
+    """
+
+    __tablename__ = "refresh_token"
+    __table_args__ = (
+        UniqueConstraint("user_id", "device", name="refresh_token_user_id_device_key"),
+        # Finds expired tokens to purge without scanning the table.
+        Index("ix_refresh_token_expires_at", "expires_at"),
+    )
+
+    # Primary key to track each refresh token.
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # The user the refresh token was issued to.
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
+    # The SHA-256 digest of the refresh token.
+    token_digest: Mapped[bytes] = mapped_column(LargeBinary(32), nullable=False, unique=True)
+    # The device the refresh token was issued to.
+    device: Mapped[str] = mapped_column(String, nullable=False)
+    # When the refresh token was issued.
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    # When the refresh token stops being accepted.
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -1,7 +1,7 @@
 """Declaration for the user table in the database."""
 
 from ..entity_base import EntityBase
-from sqlalchemy import Integer, String, Boolean
+from sqlalchemy import Integer, String, Boolean, UniqueConstraint
 from sqlalchemy.orm import mapped_column, Mapped
 
 from typing import Self, Dict
@@ -11,19 +11,22 @@ class UserEntity(EntityBase):
     """Entity to represent Users and define the columns for the user table in the database."""
 
     __tablename__ = "user"
+    # Named so that registration can map a constraint violation back to the offending field.
+    __table_args__ = (
+        UniqueConstraint("email", name="user_email_key"),
+        UniqueConstraint("username", name="user_username_key"),
+    )
 
     # Primary key to track each user.
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     # The email for the user.
-    email: Mapped[str] = mapped_column(String, nullable=False, unique=True)
+    email: Mapped[str] = mapped_column(String, nullable=False)
     # The username for the user.
-    username: Mapped[str] = mapped_column(String, nullable=False, unique=True)
+    username: Mapped[str] = mapped_column(String, nullable=False)
     # The hashed password of the user.
-    hashed_password: Mapped[str] = mapped_column(String, nullable=False, unique=True)
+    hashed_password: Mapped[str] = mapped_column(String, nullable=False)
     # The full name of the user.
     full_name: Mapped[str] = mapped_column(String, nullable=False)
-    # The current refresh-token for the user to use to refresh their access token.
-    refresh_token: Mapped[str] = mapped_column(String, nullable=False)
     # Boolean flag to represent if the token for the user is valid.
     disabled: Mapped[bool] = mapped_column(Boolean, default=False)
 
@@ -45,7 +48,6 @@ class UserEntity(EntityBase):
             email = user.email,
             hashed_password = user.hashed_password,
             full_name = user.full_name,
-            refresh_token = user.refresh_token,
             disabled = user.disabled,
         )
     
@@ -64,7 +66,6 @@ class UserEntity(EntityBase):
             email=self.email,
             hashed_password=self.hashed_password,
             full_name=self.full_name,
-            refresh_token=self.refresh_token,
             disabled=self.disabled,
         )
 
@@ -80,5 +81,4 @@ class UserEntity(EntityBase):
         self.email = user.email
         self.hashed_password = user.hashed_password
         self.full_name = user.full_name
-        self.refresh_token = user.refresh_token
         self.disabled = user.disabled
\ No newline at end of file
@@ -0,0 +1,22 @@
+"""Declaration for the plant_collection_version table in the database."""
+
+from sqlalchemy import BigInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..entity_base import EntityBase
+
+class PlantCollectionVersionEntity(EntityBase):
+    """
+    Entity to represent the version of each user's plant collection.
+
+    The version is bumped in the same transaction as every write to a user's plants,
+    so clients can tell whether their copy of the collection is stale by comparing
+    versions instead of reloading the plant table.
+    """
+
+    __tablename__ = "plant_collection_version"
+
+    # The username of the owner of the collection.
+    owner_username: Mapped[str] = mapped_column(String, primary_key=True)
+    # Incremented on every write to the collection.
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False)
@@ -1,59 +1,77 @@
 """Declaration for the plant table in the database."""
 
-from sqlalchemy import Integer, String, ARRAY, Boolean
+from datetime import datetime, timedelta
+
+from sqlalchemy import Integer, String, Index, DateTime, Interval, Computed, ForeignKey
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column
 from typing import Self
 
 from ..entity_base import EntityBase
 from ...models.Folium.plant import Plant
+from ...models.Folium.species import Species
 
 class PlantEntity(EntityBase):
-    """Entity to represent plants that are persisted in the database."""
+    """
+    Entity to represent plants that are persisted in the database.
+
+    Care data that is the same for every plant of a species lives in the species table,
+    so a plant row only holds what is specific to the user's plant.
+    """
  # The name of the table in the database.
     __tablename__ = "plant"
+    __table_args__ = (
+        # Serves owner-scoped lookups and keyset pagination over (owner_username, id).
+        Index("ix_plant_owner_username_id", "owner_username", "id"),
+        # Serves the owner-scoped range scan for plants that are due for watering.
+        Index("ix_plant_owner_username_next_watering_due", "owner_username", "next_watering_due"),
+        # Serves full-text matches on the common name and description.
+        Index("ix_plant_search_vector", "search_vector", postgresql_using="gin"),
+        # Finds whether any plant still references a species, so unreferenced species can be deleted.
+        Index("ix_plant_species_id", "species_id"),
+    )
     
     # Id of the plant.
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     # Common name for the plant.
     common_name: Mapped[str] = mapped_column(String)
-    # Scientific name for the plant.
-    scientific_name: Mapped[str] = mapped_column(String)
-    # Type of plant.
-    type: Mapped[str] = mapped_column(String)
-    # The plants cycle.
-    cycle: Mapped[str] = mapped_column(String)
-    # The frequency that that the plant should be watered.
-    watering: Mapped[str] = mapped_column(String)
+    # Description of the plant.
+    description: Mapped[str] = mapped_column(String)
+    # The species of the plant, holding its care data.
+    species_id: Mapped[int] = mapped_column(Integer, ForeignKey("species.id"))
     # The time of day that the plant should be watered.
     watering_period: Mapped[str] = mapped_column(String)
     # The amount of time that should pass between the plant being watered.
-    watering_benchmark_value: Mapped[str] = mapped_column(String)
-    # The unit for the watering benchmark value.
-    watering_benchmark_unit: Mapped[str] = mapped_column(String)
-    # The amount of sunlight that the plant should get.
-    sunlight: Mapped[str] = mapped_column(String)
-    # true/false poisonous to pets.
-    pet_poison: Mapped[bool] = mapped_column(Boolean)
-    # True/false poisonous to humans.
-    human_poison: Mapped[bool] = mapped_column(Boolean)
-    # Description of the plant.
-    description: Mapped[str] = mapped_column(String)
-    # Url for an image of the plant.
-    image_url: Mapped[str] = mapped_column(String)
+    watering_interval: Mapped[timedelta | None] = mapped_column(Interval)
     # The key for the owner of the plant.
     owner_username: Mapped[str] = mapped_column(String, nullable=False)
     # Date last watered.
-    last_watering: Mapped[str] = mapped_column(String)
-    # Health history, where each index is a ranking of the plants health from 1-10.
-    health_history: Mapped[list[int]] = mapped_column(ARRAY(Integer))
+    last_watering: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    # When the plant is next due for watering, maintained by the database. The arithmetic is done
+    # in UTC because adding an interval to a timestamptz depends on the session time zone,
+    # which a generated column may not.
+    next_watering_due: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        Computed("((last_watering AT TIME ZONE 'UTC'::text) + watering_interval) AT TIME ZONE 'UTC'::text"),
+    )
+    # Full-text search document of the common name and description, maintained by the database.
+    # The name ranks above the description. Searches match it or the search document of the
+    # plant's species. Deferred so that it is never loaded unless a query asks for it.
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed("setweight(to_tsvector('english'::regconfig, (common_name)::text), 'A'::\"char\") || "
+                 "setweight(to_tsvector('english'::regconfig, (description)::text), 'C'::\"char\")"),
+        deferred=True,
+    )
 
     @classmethod
-    def from_model(cls, plant: Plant) -> Self:
+    def from_model(cls, plant: Plant, species_id: int) -> Self:
         """
         Convert Plant model to Plant entity
         
         Args: 
             plant: plant model
+            species_id: id of the species row holding the plant's care data
             
         Returns:
             self
@@ -62,71 +80,58 @@ class PlantEntity(EntityBase):
         return cls(
             id = plant.id,
             common_name = plant.common_name,
-            scientific_name = plant.scientific_name,
-            type = plant.type,
-            cycle = plant.cycle,
-            watering = plant.watering,
-            watering_period = plant.watering_period,
-            watering_benchmark_unit = plant.watering_benchmark_unit,
-            watering_benchmark_value = plant.watering_benchmark_value,
-            sunlight = plant.sunlight,
-            pet_poison = plant.pet_poison,
-            human_poison = plant.human_poison,
             description = plant.description,
-            image_url = plant.image_url,
+            species_id = species_id,
+            watering_period = plant.watering_period,
+            watering_interval = plant.watering_interval,
             owner_username = plant.owner_username,
             last_watering = plant.last_watering,
-            health_history = plant.health_history,
         )
     
-    def to_model(self) -> Plant:
+    def to_model(self, species: Species) -> Plant:
         """
         Convert plant entity to plant model.
+
+        The model is built without validation, since the values were read from the database.
+
+        Args:
+            species: model of the species row referenced by 'species_id'
             
         Returns:
-            Plant: model representation of self.
+            Plant: model representation of self, merged with its species.
         """
 
-        return Plant(
-            id = self.id,
-            common_name = self.common_name,
-            scientific_name = self.scientific_name,
-            type = self.type,
-            cycle = self.cycle,
-            watering = self.watering,
-            watering_period = self.watering_period,
-            watering_benchmark_unit = self.watering_benchmark_unit,
-            watering_benchmark_value = self.watering_benchmark_value,
-            sunlight = self.sunlight,
-            pet_poison = self.pet_poison,
-            human_poison = self.human_poison,
-            description = self.description,
-            image_url = self.image_url,
-            owner_username = self.owner_username,
-            last_watering = self.last_watering,
-            health_history = self.health_history,
+        return Plant.model_construct(
+            id=self.id,
+            common_name=self.common_name,
+            scientific_name=species.scientific_name,
+            type=species.type,
+            cycle=species.cycle,
+            watering=species.watering,
+            watering_period=self.watering_period,
+            watering_interval=self.watering_interval,
+            sunlight=species.sunlight,
+            pet_poison=species.pet_poison,
+            human_poison=species.human_poison,
+            description=self.description,
+            image_url=species.image_url,
+            owner_username=self.owner_username,
+            last_watering=self.last_watering,
+            next_watering_due=self.next_watering_due,
         )
     
-    def update(self, plant: Plant) -> None:
+    def update(self, plant: Plant, species_id: int) -> None:
         """
         Updates self using a provided plant model.
         
         Args:
             plant: the plant model to update with.
+            species_id: id of the species row holding the plant's care data.
         """
 
         self.common_name = plant.common_name
-        self.scientific_name = plant.scientific_name
-        self.type = plant.type
-        self.cycle = plant.cycle
-        self.watering = plant.watering
-        self.watering_period = plant.watering_period
-        self.watering_benchmark_value = plant.watering_benchmark_value
-        self.watering_benchmark_unit = plant.watering_benchmark_unit
-        self.sunlight = plant.sunlight
-        self.pet_poison = plant.pet_poison
-        self.human_poison = plant.human_poison
         self.description = plant.description
-        self.image_url = plant.image_url
+        self.species_id = species_id
+        self.watering_period = plant.watering_period
+        self.watering_interval = plant.watering_interval
         self.last_watering = plant.last_watering
-        self.health_history = plant.health_history
\ No newline at end of file
@@ -0,0 +1,48 @@
+"""Declaration for the plant_health_sample table in the database."""
+
+from datetime import datetime
+from typing import Self
+
+from sqlalchemy import Integer, SmallInteger, DateTime, ForeignKey, Index, CheckConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..entity_base import EntityBase
+from ...models.Folium.plant_health import PlantHealthSample
+
+class PlantHealthSampleEntity(EntityBase):
+    """
+    Entity to represent a single health rating of a plant at a point in time.
+
+    Samples are only ever appended, so a plant's history grows without making reads or
+    writes of the plant itself any heavier. Range and aggregate queries are served by
+    the index on (plant_id, recorded_at).
+    """
+
+    __tablename__ = "plant_health_sample"
+    __table_args__ = (
+        Index("ix_plant_health_sample_plant_id_recorded_at", "plant_id", "recorded_at"),
+        CheckConstraint("score BETWEEN 1 AND 10", name="plant_health_sample_score_check"),
+    )
+
+    # Id of the sample.
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # The plant the sample was recorded for.
+    plant_id: Mapped[int] = mapped_column(Integer, ForeignKey("plant.id", ondelete="CASCADE"), nullable=False)
+    # When the sample was recorded.
+    recorded_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    # Ranking of the plant's health from 1-10.
+    score: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+
+    def to_model(self) -> PlantHealthSample:
+        """
+        Convert plant health sample entity to plant health sample model.
+            
+        Returns:
+            PlantHealthSample: model representation of self.
+        """
+
+        return PlantHealthSample(
+            plant_id = self.plant_id,
+            recorded_at = self.recorded_at,
+            score = self.score,
+        )
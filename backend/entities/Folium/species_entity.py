@@ -0,0 +1,89 @@
+"""Declaration for the species table in the database."""
+
+from typing import Self
+
+from sqlalchemy import Integer, String, Boolean, Index, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..entity_base import EntityBase
+from ...models.Folium.species import Species
+
+class SpeciesEntity(EntityBase):
+    """
+    Entity to represent the care data shared by every plant of a species.
+
+    Rows are content addressed by the digest of their values and are never updated:
+    changing a plant's care data points it at another row instead.
+    """
+
+    __tablename__ = "species"
+    __table_args__ = (
+        # Finds the row for a set of values, and keeps each set of values to a single row.
+        Index("ix_species_digest", "digest", unique=True),
+        # Serves full-text matches on the name.
+        Index("ix_species_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
+    # Id of the species.
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # Hex encoded SHA-256 of the values below, as computed by 'Species.digest'.
+    digest: Mapped[str] = mapped_column(String(64))
+    # Scientific name for the species.
+    scientific_name: Mapped[str] = mapped_column(String)
+    # Type of plant.
+    type: Mapped[str] = mapped_column(String)
+    # The species' cycle.
+    cycle: Mapped[str] = mapped_column(String)
+    # The frequency that the species should be watered.
+    watering: Mapped[str] = mapped_column(String)
+    # The amount of sunlight that the species should get.
+    sunlight: Mapped[str] = mapped_column(String)
+    # true/false poisonous to pets.
+    pet_poison: Mapped[bool] = mapped_column(Boolean)
+    # True/false poisonous to humans.
+    human_poison: Mapped[bool] = mapped_column(Boolean)
+    # Url for an image of the species.
+    image_url: Mapped[str] = mapped_column(String)
+    # Full-text search document of the scientific name, maintained by the database.
+    # Deferred so that it is never loaded unless a query asks for it.
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed("setweight(to_tsvector('english'::regconfig, (scientific_name)::text), 'A'::\"char\")"),
+        deferred=True,
+    )
+
+    @classmethod
+    def from_model(cls, species: Species) -> Self:
+        """
+        Convert Species model to Species entity
+
+        Args:
+            species: species model
+
+        Returns:
+            self
+        """
+
+        return cls(digest=species.digest(), **species.model_dump())
+
+    def to_model(self) -> Species:
+        """
+        Convert species entity to species model.
+
+        The model is built without validation, since the values were read from the database.
+
+        Returns:
+            Species: model representation of self.
+        """
+
+        return Species.model_construct(
+            scientific_name=self.scientific_name,
+            type=self.type,
+            cycle=self.cycle,
+            watering=self.watering,
+            sunlight=self.sunlight,
+            pet_poison=self.pet_poison,
+            human_poison=self.human_poison,
+            image_url=self.image_url,
+        )
@@ -7,14 +7,16 @@ import dotenv
 dotenv.load_dotenv(verbose=True)
 
 
-def getenv(variable: str) -> str:
+def getenv(variable: str, default: str | None = None) -> str:
     """Get value of environment variable or raise an error if undefined.
 
     Unlike `os.getenv`, our application expects all environment variables it needs to be defined
     and we intentionally fast error out with a diagnostic message to avoid scenarios of running
     the application when expected environment variables are not set.
+
+    Optional tuning settings may pass a `default`, which is returned when the variable is unset.
     """
-    value = os.getenv(variable)
+    value = os.getenv(variable, default)
     if value is not None:
         return value
     else:
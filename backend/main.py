@@ -1,33 +1,54 @@
 """Entrypoint of backend API exposing the FastAPI `app` to be served by an application server such as uvicorn."""
 
+from contextlib import asynccontextmanager
 from pathlib import Path
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from .api.Authentication import user
-from .api.Folium import plant
+from .api.Folium import plant, plant_health
+from .api import health
+from .compression import CompressionMiddleware
+from .metrics import MetricsMiddleware
 
 from .database import _engine_str
+from .services.Authentication.password_hasher import password_hasher
 
 description = """
 Welcome to the Brown RESTful application programming interface
 """
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start up and tear down process-wide resources around the lifetime of the app."""
+    yield
+    password_hasher.shutdown()
+
 # Metadata to improve the usefulness of OpenAPI Docs /docs API Explorer
 app = FastAPI(
     title="Brown API",
     version="0.0.1",
     description=description,
+    lifespan=lifespan,
     openapi_tags=[
         user.openapi_tags,
         plant.openapi_tags,
+        plant_health.openapi_tags,
+        health.openapi_tags,
     ],
 )
 
 # Plugging in each of the router APIs
 feature_apis = [
     user,
-    plant
+    plant,
+    plant_health,
+    health
 ]
 
 for feature_api in feature_apis:
-    app.include_router(feature_api.api)
\ No newline at end of file
+    app.include_router(feature_api.api)
+
+# Compress responses for clients that accept it. Responses that are already compressed pass through.
+app.add_middleware(CompressionMiddleware)
+# Time each request, including compression. Added last so it runs outermost.
+app.add_middleware(MetricsMiddleware)
\ No newline at end of file
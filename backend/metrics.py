@@ -0,0 +1,274 @@
+"""Per-request timing of authentication, database queries and serialization.
+
+'MetricsMiddleware' times each request and reports the breakdown in a 'Server-Timing'
+response header. It also records the breakdown in per-route histograms, which
+'/metrics' exposes in the Prometheus text format. The code being timed records into the
+timings of the current request through a context variable, with 'timed', 'record_time'
+and the cursor event hooks installed by 'instrument_engine'."""
+
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Media type of the Prometheus text exposition format.
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4"
+# Upper bounds of the latency histogram buckets, in seconds.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Upper bounds of the buckets of the number of queries per request.
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+# Route label of requests that did not match any route, so unknown paths do not create new series.
+UNMATCHED_ROUTE = "unmatched"
+
+class RequestTimings:
+    """Time spent in each phase of one request, in seconds, and the number of database queries it ran."""
+
+    __slots__ = ("auth", "db", "serialize", "queries")
+
+    def __init__(self):
+        self.auth = 0.0
+        self.db = 0.0
+        self.serialize = 0.0
+        self.queries = 0
+
+    def server_timing(self, total: float) -> str:
+        """
+        Format the timings as the value of a 'Server-Timing' header.
+
+        Args:
+            total: The time taken by the whole request so far, in seconds.
+
+        Returns:
+            str: The timing of each phase in milliseconds, as 'Server-Timing' metrics.
+        """
+
+        return (f"auth;dur={self.auth * 1000:.3f}, "
+                f'db;dur={self.db * 1000:.3f};desc="{self.queries} queries", '
+                f"serialize;dur={self.serialize * 1000:.3f}, "
+                f"total;dur={total * 1000:.3f}")
+
+
+_current_timings: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+
+@contextmanager
+def request_timings() -> Iterator[RequestTimings]:
+    """
+    Collect the timings of the code run in the block, as the timings of one request.
+
+    Returns:
+        Iterator[RequestTimings]: The timings, which are updated as the block runs.
+    """
+
+    timings = RequestTimings()
+    token = _current_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _current_timings.reset(token)
+
+def record_time(phase: str, seconds: float) -> None:
+    """
+    Add time spent in a phase to the timings of the current request, if any.
+
+    Args:
+        phase: The phase, one of 'auth', 'db' or 'serialize'.
+        seconds: The time spent.
+    """
+
+    timings = _current_timings.get()
+    if timings is not None:
+        setattr(timings, phase, getattr(timings, phase) + seconds)
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """
+    Add the time taken by the block to a phase of the current request, if any.
+
+    Args:
+        phase: The phase, one of 'auth', 'db' or 'serialize'.
+    """
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_time(phase, time.perf_counter() - start)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    """Helper function that marks the start of a query on its connection."""
+    conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    """Helper function that adds a finished query to the timings of the current request."""
+    elapsed = time.perf_counter() - conn.info["query_start_times"].pop()
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.db += elapsed
+        timings.queries += 1
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Time the queries run through an engine, adding them to the timings of the current request.
+
+    Only executing a statement is timed. Rows fetched later through a server-side cursor,
+    as when streaming, are not counted as database time.
+
+    Args:
+        engine: The engine to instrument.
+    """
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class Histogram:
+    """Prometheus histogram with one series per combination of label values."""
+
+    def __init__(self, name: str, description: str, label_names: tuple[str, ...], buckets: tuple[float, ...]):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.buckets = buckets
+        # Maps label values -> [count per bucket, count above the last bucket, sum, count].
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, label_values: tuple[str, ...], value: float) -> None:
+        """
+        Record one observation.
+
+        Args:
+            label_values: The value of each label, in the order of 'label_names'.
+            value: The observed value.
+        """
+
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> list[str]:
+        """
+        Format the histogram in the Prometheus text format.
+
+        Returns:
+            list[str]: The lines of the histogram, with cumulative bucket counts.
+        """
+
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        for label_values, (counts, total, count) in sorted(self._series.items()):
+            labels = ",".join(f'{name}="{_escape_label(value)}"' for name, value in zip(self.label_names, label_values))
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{labels}}} {total}")
+            lines.append(f"{self.name}_count{{{labels}}} {count}")
+        return lines
+
+    def clear(self) -> None:
+        """Drop every recorded observation."""
+        self._series.clear()
+
+
+def _escape_label(value: str) -> str:
+    """Helper function that escapes a label value for the Prometheus text format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class RequestMetrics:
+    """Per-route histograms of request latency, of the time spent in each phase, and of the number of queries."""
+
+    def __init__(self):
+        labels = ("method", "route")
+        self.duration = Histogram("http_request_duration_seconds", "Time taken to serve a request.", labels, LATENCY_BUCKETS)
+        self.auth = Histogram("http_request_auth_seconds", "Time spent authenticating a request.", labels, LATENCY_BUCKETS)
+        self.db = Histogram("http_request_db_seconds", "Time spent running database queries for a request.", labels, LATENCY_BUCKETS)
+        self.serialize = Histogram("http_request_serialize_seconds", "Time spent serializing the response of a request.", labels, LATENCY_BUCKETS)
+        self.queries = Histogram("http_request_db_queries", "Number of database queries run for a request.", labels, QUERY_COUNT_BUCKETS)
+
+    def observe(self, method: str, route: str, duration: float, timings: RequestTimings) -> None:
+        """
+        Record a finished request.
+
+        Args:
+            method: The HTTP method of the request.
+            route: The path template of the route that served the request.
+            duration: The time taken to serve the request, in seconds.
+            timings: The timings collected while serving the request.
+        """
+
+        labels = (method, route)
+        self.duration.observe(labels, duration)
+        self.auth.observe(labels, timings.auth)
+        self.db.observe(labels, timings.db)
+        self.serialize.observe(labels, timings.serialize)
+        self.queries.observe(labels, timings.queries)
+
+    def render(self) -> str:
+        """Format every histogram in the Prometheus text format."""
+        histograms = (self.duration, self.auth, self.db, self.serialize, self.queries)
+        return "\n".join(line for histogram in histograms for line in histogram.render()) + "\n"
+
+    def clear(self) -> None:
+        """Drop every recorded observation."""
+        for histogram in (self.duration, self.auth, self.db, self.serialize, self.queries):
+            histogram.clear()
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware that times each request, reports the timings in a 'Server-Timing' header
+    and records them in the per-route histograms of 'request_metrics'.
+
+    The header is sent before the body, so for streamed responses it only covers the time
+    until the response starts. The histograms cover the whole request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        # Maps endpoint -> path template of its route, filled in as routes are first matched.
+        self._route_paths: dict = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        with request_timings() as timings:
+            async def send_with_timing(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(raw=message.setdefault("headers", []))
+                    headers.append("Server-Timing", timings.server_timing(time.perf_counter() - start))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                request_metrics.observe(scope["method"], self._route_path(scope), time.perf_counter() - start, timings)
+
+    def _route_path(self, scope: Scope) -> str:
+        """Helper method that finds the path template of the route that matched a request."""
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+
+        path = self._route_paths.get(endpoint)
+        if path is None:
+            for route in scope["app"].routes:
+                if getattr(route, "endpoint", None) is not None:
+                    self._route_paths[route.endpoint] = route.path
+            path = self._route_paths.get(endpoint, UNMATCHED_ROUTE)
+        return path
+
+
+request_metrics = RequestMetrics()
+"""Process-wide request histograms, recorded by 'MetricsMiddleware' and exposed by '/metrics'."""
@@ -0,0 +1,63 @@
+"""Alembic environment bound to the metadata of the application's entities."""
+
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+
+from backend.database import _engine_str
+from backend.entities.entity_base import EntityBase
+# Entities must be imported so that their tables are registered on the metadata.
+from backend.entities.Authentication.user_entity import UserEntity
+from backend.entities.Authentication.refresh_token_entity import RefreshTokenEntity
+from backend.entities.Folium.species_entity import SpeciesEntity
+from backend.entities.Folium.plant_entity import PlantEntity
+from backend.entities.Folium.plant_collection_version_entity import PlantCollectionVersionEntity
+from backend.entities.Folium.plant_health_sample_entity import PlantHealthSampleEntity
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = EntityBase.metadata
+
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL to stdout without connecting to the database."""
+    context.configure(
+        url=_engine_str(),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run the migrations against a live database.
+
+    A connection may be handed in through `config.attributes["connection"]`, which
+    lets tests migrate their own database; otherwise one is opened from the environment.
+    """
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    connectable = create_engine(_engine_str(), poolclass=NullPool)
+    with connectable.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,60 @@
+"""Baseline schema for the user and plant tables.
+
+Matches the schema that metadata.create_all built before migrations were introduced,
+so existing databases can be stamped at this revision and upgraded from there.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-17 02:12:55.021130
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('user',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('username', sa.String(), nullable=False),
+    sa.Column('hashed_password', sa.String(), nullable=False),
+    sa.Column('full_name', sa.String(), nullable=False),
+    sa.Column('refresh_token', sa.String(), nullable=False),
+    sa.Column('disabled', sa.Boolean(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('email', name='user_email_key'),
+    sa.UniqueConstraint('username', name='user_username_key'),
+    sa.UniqueConstraint('hashed_password', name='user_hashed_password_key')
+    )
+    op.create_table('plant',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('common_name', sa.String(), nullable=False),
+    sa.Column('scientific_name', sa.String(), nullable=False),
+    sa.Column('type', sa.String(), nullable=False),
+    sa.Column('cycle', sa.String(), nullable=False),
+    sa.Column('watering', sa.String(), nullable=False),
+    sa.Column('watering_period', sa.String(), nullable=False),
+    sa.Column('watering_benchmark_value', sa.String(), nullable=False),
+    sa.Column('watering_benchmark_unit', sa.String(), nullable=False),
+    sa.Column('sunlight', sa.String(), nullable=False),
+    sa.Column('pet_poison', sa.Boolean(), nullable=False),
+    sa.Column('human_poison', sa.Boolean(), nullable=False),
+    sa.Column('description', sa.String(), nullable=False),
+    sa.Column('image_url', sa.String(), nullable=False),
+    sa.Column('owner_username', sa.String(), nullable=False),
+    sa.Column('last_watering', sa.String(), nullable=False),
+    sa.Column('health_history', sa.ARRAY(sa.Integer()), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('plant')
+    op.drop_table('user')
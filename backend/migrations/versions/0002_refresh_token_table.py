@@ -0,0 +1,46 @@
+"""Move refresh tokens from the user table into a refresh_token table, one row per user and device.
+
+Tokens were stored bcrypt-hashed in user.refresh_token, which could only be checked by
+scanning every user. The new table stores the SHA-256 digest of each token under a unique
+index. Existing tokens cannot be converted, so users sign in again to get a new one.
+The unique constraint on user.hashed_password is also dropped, as salted hashes never collide.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 02:15:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('refresh_token',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('token_digest', sa.LargeBinary(length=32), nullable=False),
+    sa.Column('device', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('token_digest'),
+    sa.UniqueConstraint('user_id', 'device', name='refresh_token_user_id_device_key')
+    )
+    op.drop_column('user', 'refresh_token')
+    op.drop_constraint('user_hashed_password_key', 'user', type_='unique')
+
+
+def downgrade() -> None:
+    op.create_unique_constraint('user_hashed_password_key', 'user', ['hashed_password'])
+    # The digests cannot be turned back into tokens, so users sign in again after a downgrade.
+    op.add_column('user', sa.Column('refresh_token', sa.String(), nullable=False, server_default=''))
+    op.alter_column('user', 'refresh_token', server_default=None)
+    op.drop_table('refresh_token')
@@ -0,0 +1,33 @@
+"""Index plant on (owner_username, id) for owner-scoped lookups and keyset pagination.
+
+Every plant query in PlantService filters on owner_username, and paginated listings
+order by id within an owner. Without this index those queries scan the whole table.
+The other hot lookups are already indexed by constraints: user by username and email,
+refresh_token by token_digest and by (user_id, device).
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 02:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Build the index without locking the plant table against writes.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_plant_owner_username_id', 'plant', ['owner_username', 'id'],
+                        unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_plant_owner_username_id', table_name='plant', postgresql_concurrently=True)
@@ -0,0 +1,30 @@
+"""Add plant_collection_version to back ETags on a user's plant collection.
+
+Users without a row have version 0; the first write to their plants creates it.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 04:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('plant_collection_version',
+    sa.Column('owner_username', sa.String(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('owner_username')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('plant_collection_version')
@@ -0,0 +1,59 @@
+"""Move plant health history from an array column into the plant_health_sample table.
+
+The health_history arrays carry no timestamps. Migrated samples keep their order and
+are dated one day apart, with the last sample of each plant dated at migration time.
+Values outside the 1-10 range are clamped into it.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 05:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('plant_health_sample',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('plant_id', sa.Integer(), nullable=False),
+    sa.Column('recorded_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('score', sa.SmallInteger(), nullable=False),
+    sa.CheckConstraint('score BETWEEN 1 AND 10', name='plant_health_sample_score_check'),
+    sa.ForeignKeyConstraint(['plant_id'], ['plant.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("""
+        INSERT INTO plant_health_sample (plant_id, recorded_at, score)
+        SELECT plant.id,
+               now() - (cardinality(plant.health_history) - sample.position) * interval '1 day',
+               LEAST(GREATEST(sample.score, 1), 10)
+        FROM plant, unnest(plant.health_history) WITH ORDINALITY AS sample(score, position)
+        WHERE sample.score IS NOT NULL
+    """)
+    op.create_index('ix_plant_health_sample_plant_id_recorded_at', 'plant_health_sample', ['plant_id', 'recorded_at'], unique=False)
+    op.drop_column('plant', 'health_history')
+
+
+def downgrade() -> None:
+    op.add_column('plant', sa.Column('health_history', postgresql.ARRAY(sa.Integer()),
+                                     server_default=sa.text("'{}'"), nullable=False))
+    op.alter_column('plant', 'health_history', server_default=None)
+    op.execute("""
+        UPDATE plant
+        SET health_history = history.scores
+        FROM (SELECT plant_id, array_agg(score ORDER BY recorded_at, id) AS scores
+              FROM plant_health_sample
+              GROUP BY plant_id) AS history
+        WHERE plant.id = history.plant_id
+    """)
+    op.drop_index('ix_plant_health_sample_plant_id_recorded_at', table_name='plant_health_sample')
+    op.drop_table('plant_health_sample')
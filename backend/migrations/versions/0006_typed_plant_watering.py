@@ -0,0 +1,82 @@
+"""Store plant watering times as typed columns and index when plants are next due.
+
+last_watering becomes a timestamptz, and watering_benchmark_value/unit are replaced by a
+single watering_interval. next_watering_due is generated from the two and indexed per
+owner. Free-form values that cannot be converted become NULL.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 06:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Conversion helpers that turn unparseable free-form values into NULL instead of failing.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION pg_temp.try_timestamptz(value text) RETURNS timestamptz AS $$
+        BEGIN
+            RETURN value::timestamptz;
+        EXCEPTION WHEN others THEN
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION pg_temp.try_interval(value text) RETURNS interval AS $$
+        BEGIN
+            RETURN value::interval;
+        EXCEPTION WHEN others THEN
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    op.alter_column('plant', 'last_watering', nullable=True)
+    op.alter_column('plant', 'last_watering', type_=sa.DateTime(timezone=True),
+                    postgresql_using="pg_temp.try_timestamptz(NULLIF(last_watering, ''))")
+    op.add_column('plant', sa.Column('watering_interval', sa.Interval(), nullable=True))
+    op.execute("""
+        UPDATE plant
+        SET watering_interval = pg_temp.try_interval(watering_benchmark_value || ' ' || watering_benchmark_unit)
+        WHERE watering_benchmark_value ~ '^\\s*[0-9]+(\\.[0-9]+)?\\s*$'
+    """)
+    op.drop_column('plant', 'watering_benchmark_value')
+    op.drop_column('plant', 'watering_benchmark_unit')
+    op.execute("DROP FUNCTION pg_temp.try_timestamptz(text)")
+    op.execute("DROP FUNCTION pg_temp.try_interval(text)")
+    op.add_column('plant', sa.Column('next_watering_due', sa.DateTime(timezone=True),
+                                     sa.Computed("((last_watering AT TIME ZONE 'UTC'::text) + watering_interval) AT TIME ZONE 'UTC'::text"),
+                                     nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index('ix_plant_owner_username_next_watering_due', 'plant', ['owner_username', 'next_watering_due'],
+                        unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_plant_owner_username_next_watering_due', table_name='plant', postgresql_concurrently=True)
+    op.drop_column('plant', 'next_watering_due')
+    op.add_column('plant', sa.Column('watering_benchmark_value', sa.String(), server_default='', nullable=False))
+    op.add_column('plant', sa.Column('watering_benchmark_unit', sa.String(), server_default='', nullable=False))
+    op.execute("""
+        UPDATE plant
+        SET watering_benchmark_value = trim_scale(extract(epoch FROM watering_interval) / 86400)::text,
+            watering_benchmark_unit = 'days'
+        WHERE watering_interval IS NOT NULL
+    """)
+    op.alter_column('plant', 'watering_benchmark_value', server_default=None)
+    op.alter_column('plant', 'watering_benchmark_unit', server_default=None)
+    op.drop_column('plant', 'watering_interval')
+    op.alter_column('plant', 'last_watering', type_=sa.String(),
+                    postgresql_using="COALESCE(last_watering::text, '')")
+    op.alter_column('plant', 'last_watering', nullable=False)
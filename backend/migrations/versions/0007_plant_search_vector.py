@@ -0,0 +1,34 @@
+"""Add a generated full-text search vector to plant, with a GIN index.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 07:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('plant', sa.Column('search_vector', postgresql.TSVECTOR(),
+                                     sa.Computed("(setweight(to_tsvector('english'::regconfig, (common_name)::text), 'A'::\"char\") || "
+                                                 "setweight(to_tsvector('english'::regconfig, (scientific_name)::text), 'A'::\"char\")) || "
+                                                 "setweight(to_tsvector('english'::regconfig, (description)::text), 'C'::\"char\")"),
+                                     nullable=False))
+    with op.get_context().autocommit_block():
+        op.create_index('ix_plant_search_vector', 'plant', ['search_vector'],
+                        unique=False, postgresql_using='gin', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_plant_search_vector', table_name='plant', postgresql_using='gin', postgresql_concurrently=True)
+    op.drop_column('plant', 'search_vector')
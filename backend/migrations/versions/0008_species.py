@@ -0,0 +1,107 @@
+"""Move the care data shared by plants of the same species into a content-addressed species table.
+
+Each distinct combination of scientific_name, type, cycle, watering, sunlight, pet_poison,
+human_poison, description and image_url becomes one species row, identified by the SHA-256
+of its values, and plant references it through species_id. The plant search vector now only
+covers the common name; searches combine it with the search vector of the species.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+import hashlib
+import json
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+SPECIES_COLUMNS = ['scientific_name', 'type', 'cycle', 'watering', 'sunlight',
+                   'pet_poison', 'human_poison', 'description', 'image_url']
+
+PLANT_SEARCH_VECTOR = "setweight(to_tsvector('english'::regconfig, (common_name)::text), 'A'::\"char\")"
+SPECIES_SEARCH_VECTOR = ("setweight(to_tsvector('english'::regconfig, (scientific_name)::text), 'A'::\"char\") || "
+                         "setweight(to_tsvector('english'::regconfig, (description)::text), 'C'::\"char\")")
+PREVIOUS_PLANT_SEARCH_VECTOR = ("(setweight(to_tsvector('english'::regconfig, (common_name)::text), 'A'::\"char\") || "
+                                "setweight(to_tsvector('english'::regconfig, (scientific_name)::text), 'A'::\"char\")) || "
+                                "setweight(to_tsvector('english'::regconfig, (description)::text), 'C'::\"char\")")
+
+
+def _digest(values: dict) -> str:
+    """Same digest as 'Species.digest', frozen as of this revision."""
+    canonical = json.dumps(values, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _species_columns() -> list[sa.Column]:
+    return [
+        sa.Column('scientific_name', sa.String(), nullable=False),
+        sa.Column('type', sa.String(), nullable=False),
+        sa.Column('cycle', sa.String(), nullable=False),
+        sa.Column('watering', sa.String(), nullable=False),
+        sa.Column('sunlight', sa.String(), nullable=False),
+        sa.Column('pet_poison', sa.Boolean(), nullable=False),
+        sa.Column('human_poison', sa.Boolean(), nullable=False),
+        sa.Column('description', sa.String(), nullable=False),
+        sa.Column('image_url', sa.String(), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    species = op.create_table('species',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('digest', sa.String(length=64), nullable=False),
+    *_species_columns(),
+    sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(SPECIES_SEARCH_VECTOR), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_species_digest', 'species', ['digest'], unique=True)
+
+    # Digests are computed here rather than in SQL so that they match 'Species.digest' exactly.
+    columns = ", ".join(SPECIES_COLUMNS)
+    rows = op.get_bind().execute(sa.text(f"SELECT DISTINCT {columns} FROM plant")).mappings()
+    species_rows = [{'digest': _digest(dict(row)), **row} for row in rows]
+    if species_rows:
+        op.bulk_insert(species, species_rows)
+
+    op.add_column('plant', sa.Column('species_id', sa.Integer(), nullable=True))
+    matches = " AND ".join(f"plant.{column} = species.{column}" for column in SPECIES_COLUMNS)
+    op.execute(f"UPDATE plant SET species_id = species.id FROM species WHERE {matches}")
+    op.alter_column('plant', 'species_id', nullable=False)
+    op.create_foreign_key('plant_species_id_fkey', 'plant', 'species', ['species_id'], ['id'])
+
+    # The search vector is generated from columns that are moving, so it is dropped first.
+    op.drop_index('ix_plant_search_vector', table_name='plant', postgresql_using='gin')
+    op.drop_column('plant', 'search_vector')
+    for column in SPECIES_COLUMNS:
+        op.drop_column('plant', column)
+    op.add_column('plant', sa.Column('search_vector', postgresql.TSVECTOR(),
+                                     sa.Computed(PLANT_SEARCH_VECTOR), nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('plant', 'search_vector')
+    for column in _species_columns():
+        column.nullable = True
+        op.add_column('plant', column)
+    assignments = ", ".join(f"{column} = species.{column}" for column in SPECIES_COLUMNS)
+    op.execute(f"UPDATE plant SET {assignments} FROM species WHERE plant.species_id = species.id")
+    for column in SPECIES_COLUMNS:
+        op.alter_column('plant', column, nullable=False)
+
+    op.drop_constraint('plant_species_id_fkey', 'plant', type_='foreignkey')
+    op.drop_column('plant', 'species_id')
+    op.drop_index('ix_species_digest', table_name='species')
+    op.drop_table('species')
+
+    op.add_column('plant', sa.Column('search_vector', postgresql.TSVECTOR(),
+                                     sa.Computed(PREVIOUS_PLANT_SEARCH_VECTOR), nullable=False))
+    op.create_index('ix_plant_search_vector', 'plant', ['search_vector'], unique=False, postgresql_using='gin')
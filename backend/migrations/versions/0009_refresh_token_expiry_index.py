@@ -0,0 +1,31 @@
+"""Index refresh_token on expires_at so expired tokens can be purged without a table scan.
+
+Expired tokens are deleted per user when the user logs in, and for every user by the
+backend.script.purge_refresh_tokens maintenance script, which relies on this index.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Build the index without locking the refresh_token table against logins.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_refresh_token_expires_at', 'refresh_token', ['expires_at'],
+                        unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_refresh_token_expires_at', table_name='refresh_token', postgresql_concurrently=True)
@@ -0,0 +1,35 @@
+"""Index the plant and species search vectors so searches no longer scan every plant of a user.
+
+Searches match the search vector of a plant's common name or the search vector of its
+species, each served by a GIN index on its own table. Revision 0008 dropped the index on
+the plant search vector when it moved the species text out of it.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Build the indexes without locking the tables against writes.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_plant_search_vector', 'plant', ['search_vector'],
+                        unique=False, postgresql_using='gin', postgresql_concurrently=True)
+        op.create_index('ix_species_search_vector', 'species', ['search_vector'],
+                        unique=False, postgresql_using='gin', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_species_search_vector', table_name='species', postgresql_using='gin', postgresql_concurrently=True)
+        op.drop_index('ix_plant_search_vector', table_name='plant', postgresql_using='gin', postgresql_concurrently=True)
@@ -0,0 +1,110 @@
+"""Move the description from the species table back to the plant table, and delete unreferenced species.
+
+Descriptions are written per plant, so keeping them in the species table gave almost every
+plant its own species row. Species rows are merged by the digest of their remaining values,
+plants are pointed at the merged rows, and species rows that no plant references are deleted.
+Plant gains an index on species_id, used to find species that are no longer referenced.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+import hashlib
+import json
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+SPECIES_COLUMNS = ['scientific_name', 'type', 'cycle', 'watering', 'sunlight',
+                   'pet_poison', 'human_poison', 'image_url']
+
+PLANT_SEARCH_VECTOR = ("setweight(to_tsvector('english'::regconfig, (common_name)::text), 'A'::\"char\") || "
+                       "setweight(to_tsvector('english'::regconfig, (description)::text), 'C'::\"char\")")
+SPECIES_SEARCH_VECTOR = "setweight(to_tsvector('english'::regconfig, (scientific_name)::text), 'A'::\"char\")"
+PREVIOUS_PLANT_SEARCH_VECTOR = "setweight(to_tsvector('english'::regconfig, (common_name)::text), 'A'::\"char\")"
+PREVIOUS_SPECIES_SEARCH_VECTOR = ("setweight(to_tsvector('english'::regconfig, (scientific_name)::text), 'A'::\"char\") || "
+                                  "setweight(to_tsvector('english'::regconfig, (description)::text), 'C'::\"char\")")
+
+
+def _digest(values: dict) -> str:
+    """Same digest as 'Species.digest', frozen as of this revision."""
+    canonical = json.dumps(values, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _replace_search_vector(table: str, expression: str) -> None:
+    """Regenerate a search vector column from a new expression, along with its GIN index."""
+    op.drop_index(f'ix_{table}_search_vector', table_name=table, postgresql_using='gin')
+    op.drop_column(table, 'search_vector')
+    op.add_column(table, sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(expression), nullable=False))
+    op.create_index(f'ix_{table}_search_vector', table, ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def _rewrite_species(columns: list[str], select_values: str) -> None:
+    """
+    Point every plant at a species row identified by the digest of the given columns,
+    inserting the rows that are missing, then delete the species rows left unreferenced.
+
+    'select_values' selects plant.id followed by the values of the columns, for every plant.
+    """
+
+    bind = op.get_bind()
+    species = sa.table('species', sa.column('id'), sa.column('digest'), *(sa.column(column) for column in columns))
+    plants_by_digest: dict[str, list[int]] = {}
+    values_by_digest: dict[str, dict] = {}
+    for row in bind.execute(sa.text(select_values)).mappings():
+        values = {column: row[column] for column in columns}
+        digest = _digest(values)
+        values_by_digest[digest] = values
+        plants_by_digest.setdefault(digest, []).append(row['id'])
+
+    # Digests are computed here rather than in SQL so that they match 'Species.digest' exactly.
+    # New rows get a placeholder digest first, since the rows they replace may still hold it.
+    ids_by_digest = {}
+    for digest, values in values_by_digest.items():
+        ids_by_digest[digest] = bind.execute(sa.insert(species).values(digest='new:' + digest[:60], **values)
+                                             .returning(species.c.id)).scalar_one()
+    for digest, plant_ids in plants_by_digest.items():
+        bind.execute(sa.text("UPDATE plant SET species_id = :species_id WHERE id = ANY(:plant_ids)"),
+                     {'species_id': ids_by_digest[digest], 'plant_ids': plant_ids})
+
+    op.execute("DELETE FROM species WHERE NOT EXISTS (SELECT 1 FROM plant WHERE plant.species_id = species.id)")
+    for digest, species_id in ids_by_digest.items():
+        bind.execute(sa.update(species).where(species.c.id == species_id).values(digest=digest))
+
+
+def upgrade() -> None:
+    op.create_index('ix_plant_species_id', 'plant', ['species_id'], unique=False)
+    op.add_column('plant', sa.Column('description', sa.String(), nullable=True))
+    op.execute("UPDATE plant SET description = species.description FROM species WHERE plant.species_id = species.id")
+    op.alter_column('plant', 'description', nullable=False)
+
+    _replace_search_vector('species', SPECIES_SEARCH_VECTOR)
+    op.drop_column('species', 'description')
+    columns = ", ".join(f"species.{column}" for column in SPECIES_COLUMNS)
+    _rewrite_species(SPECIES_COLUMNS, f"SELECT plant.id, {columns} FROM plant JOIN species ON species.id = plant.species_id")
+
+    _replace_search_vector('plant', PLANT_SEARCH_VECTOR)
+
+
+def downgrade() -> None:
+    _replace_search_vector('plant', PREVIOUS_PLANT_SEARCH_VECTOR)
+
+    op.add_column('species', sa.Column('description', sa.String(), nullable=True))
+    columns = ", ".join(f"species.{column}" for column in SPECIES_COLUMNS)
+    _rewrite_species([*SPECIES_COLUMNS[:-1], 'description', SPECIES_COLUMNS[-1]],
+                     f"SELECT plant.id, {columns}, plant.description FROM plant JOIN species ON species.id = plant.species_id")
+    op.alter_column('species', 'description', nullable=False)
+    _replace_search_vector('species', PREVIOUS_SPECIES_SEARCH_VECTOR)
+
+    op.drop_column('plant', 'description')
+    op.drop_index('ix_plant_species_id', table_name='plant')
@@ -3,6 +3,9 @@
 from pydantic import BaseModel
 
 class Token(BaseModel):
-    """Model to represent the JWT that is used to authenticate users."""
+    """Model to represent the JWT that is used to authenticate users.
+
+    'refresh_token' is only set when a login issues a new refresh token."""
     access_token: str = ""
-    token_type: str = ""
\ No newline at end of file
+    token_type: str = ""
+    refresh_token: str | None = None
\ No newline at end of file
@@ -12,7 +12,6 @@ class User(UserBase, BaseModel):
     username: str = ""
     hashed_password: str = ""
     full_name: str = ""
-    refresh_token: str = ""
     disabled: bool = False
 
 class NewUser(BaseModel):
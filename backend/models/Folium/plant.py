@@ -1,5 +1,7 @@
 """Plant model serves as the data object for representing plants across application layers."""
 
+from datetime import datetime, timedelta
+
 from pydantic import BaseModel
 
 class PlantIdentity(BaseModel):
@@ -20,7 +22,9 @@ class Plant(PlantIdentity, BaseModel):
     
     This model is based on the 'PlantEntity' which
     defines the shape of the plant table in the postgres
-    database."""
+    database. 'next_watering_due' is computed by the database
+    from 'last_watering' and 'watering_interval', and is
+    ignored when a plant is written."""
 
     common_name: str = ""
     scientific_name: str = ""
@@ -28,13 +32,64 @@ class Plant(PlantIdentity, BaseModel):
     cycle: str = ""
     watering: str = ""
     watering_period: str = ""
-    watering_benchmark_value: str = ""
-    watering_benchmark_unit: str = ""
+    watering_interval: timedelta | None = None
     sunlight: str = ""
     pet_poison: bool = False
     human_poison: bool = False
     description: str = ""
     image_url: str = ""
     owner_username: str = ""
-    last_watering: str = ""
-    health_history: list[int] = []
\ No newline at end of file
+    last_watering: datetime | None = None
+    next_watering_due: datetime | None = None
+
+class PlantPatch(BaseModel):
+    """
+    Pydantic model to represent a partial update to a plant.
+
+    Only the fields that are explicitly set are written to the
+    database, so clients send just the properties that changed.
+    A plant's 'id' and 'owner_username' cannot be patched."""
+
+    common_name: str = ""
+    scientific_name: str = ""
+    type: str = ""
+    cycle: str = ""
+    watering: str = ""
+    watering_period: str = ""
+    watering_interval: timedelta | None = None
+    sunlight: str = ""
+    pet_poison: bool = False
+    human_poison: bool = False
+    description: str = ""
+    image_url: str = ""
+    last_watering: datetime | None = None
+
+class PlantPage(BaseModel):
+    """
+    Pydantic model to represent a single page of a user's plants.
+
+    'next_cursor' is an opaque value to pass back to retrieve the
+    following page, and is None once the last page is reached."""
+
+    plants: list[Plant] = []
+    next_cursor: str | None = None
+
+class PlantBulkError(BaseModel):
+    """
+    Pydantic model to represent why one item of a bulk plant
+    request could not be applied.
+
+    'index' is the position of the item in the request body."""
+
+    index: int
+    detail: str
+
+class PlantBulkResult(BaseModel):
+    """
+    Pydantic model to represent the outcome of a bulk plant request.
+
+    'plants' holds the plants that were written, and 'errors' holds
+    one entry for each item that was skipped."""
+
+    plants: list[Plant] = []
+    errors: list[PlantBulkError] = []
@@ -0,0 +1,33 @@
+"""Plant health models represent the health ratings recorded for plants over time."""
+
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+class PlantHealthSample(BaseModel):
+    """
+    Pydantic model to represent a single health rating of a plant.
+
+    This model is based on the 'PlantHealthSampleEntity' which
+    defines the shape of the plant_health_sample table in the
+    postgres database. When a sample is added without 'recorded_at',
+    it is recorded at the current time."""
+
+    plant_id: int | None = None
+    recorded_at: datetime | None = None
+    score: int = Field(ge=1, le=10)
+
+class PlantHealthSummary(BaseModel):
+    """
+    Pydantic model to represent the aggregate health of a plant
+    over its most recent samples.
+
+    'trend' is the slope of the scores in points per day, and every
+    aggregate is None when the plant has no samples."""
+
+    plant_id: int
+    samples: int = 0
+    latest_score: int | None = None
+    latest_recorded_at: datetime | None = None
+    rolling_average: float | None = None
+    trend: float | None = None
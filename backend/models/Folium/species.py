@@ -0,0 +1,38 @@
+"""Species model serves as the data object for the care data shared by every plant of a species."""
+
+import hashlib
+import json
+
+from pydantic import BaseModel
+
+class Species(BaseModel):
+    """
+    Pydantic model to represent the species-level care data of a plant.
+
+    This model is based on the 'SpeciesEntity' which defines
+    the shape of the species table in the postgres database.
+    Species are content addressed: plants with the same values
+    share a single row, found by the digest of those values."""
+
+    scientific_name: str = ""
+    type: str = ""
+    cycle: str = ""
+    watering: str = ""
+    sunlight: str = ""
+    pet_poison: bool = False
+    human_poison: bool = False
+    image_url: str = ""
+
+    def digest(self) -> str:
+        """
+        Compute the digest that identifies these values in the species table.
+
+        Returns:
+            str: The hex encoded SHA-256 of the values, serialized as canonical JSON.
+        """
+
+        canonical = json.dumps(self.model_dump(), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+SPECIES_FIELDS = frozenset(Species.model_fields)
+"""Names of the 'Plant' fields that are stored in the species table."""
@@ -0,0 +1,59 @@
+"""Pydantic models to represent the health and connection pool status of the API."""
+
+from pydantic import BaseModel
+
+class HealthStatus(BaseModel):
+    """Model to represent the result of a health check."""
+    status: str = ""
+    database: str = ""
+
+class PoolStatus(BaseModel):
+    """Model to represent a snapshot of the database connection pool.
+
+    Wait times cover waiting for an idle connection, not opening new connections."""
+    pool_size: int = 0
+    max_overflow: int = 0
+    checked_out: int = 0
+    idle: int = 0
+    overflow: int = 0
+    checkouts: int = 0
+    checkout_timeouts: int = 0
+    mean_wait_ms: float = 0.0
+    p50_wait_ms: float = 0.0
+    p99_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+
+class CacheStats(BaseModel):
+    """Model to represent the hit/miss counters of an in-process cache."""
+    size: int = 0
+    max_size: int = 0
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    hit_ratio: float = 0.0
+
+class PlantListCacheStats(BaseModel):
+    """Model to represent the hit/miss counters and memory use of the plant list cache.
+
+    'entries', 'size_bytes' and 'max_bytes' are only tracked by the in-process backend."""
+    backend: str = ""
+    entries: int = 0
+    size_bytes: int = 0
+    max_bytes: int = 0
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    errors: int = 0
+    hit_ratio: float = 0.0
+
+class HashingPoolStats(BaseModel):
+    """Model to represent the state of the password hashing process pool."""
+    workers: int = 0
+    max_pending: int = 0
+    pending: int = 0
+    queued: int = 0
+    completed: int = 0
+    failed: int = 0
+    rejected: int = 0
+    mean_latency_ms: float = 0.0
+    max_latency_ms: float = 0.0
@@ -0,0 +1,99 @@
+"""Benchmark the read path used to list a user's plants.
+
+This script creates a temporary user with the given number of plants in the configured
+database, then lists them repeatedly with the Core read path used by PlantService and with
+an ORM read path that loads PlantEntity objects, as PlantService used to. It prints the
+median throughput of each path in rows per second, along with the peak memory allocated
+while listing, as traced by tracemalloc. The temporary user's plants, and the species rows
+they leave unreferenced, are deleted afterwards.
+
+Usage: python3 -m backend.script.benchmark_plant_reads [--plants 10000] [--repeat 7]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+import uuid
+
+from sqlalchemy import select, delete
+
+from ..database import async_engine, async_session_factory
+from ..entities.Folium.plant_entity import PlantEntity
+from ..entities.Folium.plant_collection_version_entity import PlantCollectionVersionEntity
+from ..models.Folium.plant import Plant
+from ..services.Folium.plant_service import PlantService, MAX_BULK_SIZE
+from ..services.Folium.species_service import SpeciesService
+
+# Number of distinct species the benchmark plants are spread over.
+SPECIES_COUNT = 50
+
+async def read_core(service: PlantService, owner_username: str) -> list[Plant]:
+    """List the plants with the Core read path of PlantService."""
+    return await service.get_all_user_plants(owner_username=owner_username)
+
+async def read_orm(service: PlantService, owner_username: str) -> list[Plant]:
+    """List the plants by loading PlantEntity objects into the session, then converting them to models."""
+    query = select(PlantEntity).where(PlantEntity.owner_username == owner_username).order_by(PlantEntity.id)
+    return await service._to_models(await service._session.scalars(query))
+
+async def measure(read, owner_username: str, repeat: int) -> tuple[float, int]:
+    """Return the median seconds and peak traced bytes of listing the plants with 'read'."""
+    timings = []
+    for _ in range(repeat):
+        # A new session per run, so objects loaded by a previous run are not reused from the identity map.
+        async with async_session_factory() as session:
+            service = PlantService(session=session)
+            start = time.perf_counter()
+            await read(service, owner_username)
+            timings.append(time.perf_counter() - start)
+
+    async with async_session_factory() as session:
+        service = PlantService(session=session)
+        tracemalloc.start()
+        await read(service, owner_username)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return statistics.median(timings), peak
+
+async def main(plant_count: int, repeat: int) -> None:
+    owner_username = f"benchmark-{uuid.uuid4().hex[:8]}"
+    plants = [Plant(common_name=f"Plant {index}",
+                    scientific_name=f"Species {index % SPECIES_COUNT}",
+                    description=f"Care notes for species {index % SPECIES_COUNT}. " * 4,
+                    owner_username=owner_username) for index in range(plant_count)]
+
+    async with async_session_factory() as session:
+        service = PlantService(session=session)
+        for start in range(0, plant_count, MAX_BULK_SIZE):
+            await service.bulk_create_plants(plants=plants[start:start + MAX_BULK_SIZE], owner_username=owner_username)
+
+    try:
+        print(f"Listing {plant_count} plants, median of {repeat} runs")
+        print(f"{'path':>5}  {'rows/sec':>10}  {'peak KiB':>10}")
+        for name, read in [("orm", read_orm), ("core", read_core)]:
+            # Warm up the statement cache and the species cache before measuring.
+            await measure(read, owner_username, repeat=1)
+            seconds, peak = await measure(read, owner_username, repeat)
+            print(f"{name:>5}  {plant_count / seconds:>10.0f}  {peak / 1024:>10.0f}")
+    finally:
+        async with async_session_factory() as session:
+            species_ids = await session.scalars(delete(PlantEntity)
+                                                .where(PlantEntity.owner_username == owner_username)
+                                                .returning(PlantEntity.species_id))
+            species_service = SpeciesService(session=session)
+            await species_service.delete_unreferenced(species_ids)
+            await session.execute(delete(PlantCollectionVersionEntity)
+                                  .where(PlantCollectionVersionEntity.owner_username == owner_username))
+            await session.commit()
+            species_service.cache_committed()
+        await async_engine.dispose()
+
+parser = argparse.ArgumentParser(description="Compare the throughput and allocations of the Core and ORM plant read paths.")
+parser.add_argument("--plants", type=int, default=10000, help="Number of plants to list.")
+parser.add_argument("--repeat", type=int, default=7, help="Number of timed runs per read path.")
+args = parser.parse_args()
+
+asyncio.run(main(args.plants, args.repeat))
@@ -0,0 +1,51 @@
+"""Calibrate the bcrypt cost factor for the host the API is deployed on.
+
+This script times bcrypt hashes across a range of cost factors on the current
+machine and recommends the highest cost whose median hash time stays within
+the target latency. Set the recommended value as BCRYPT_ROUNDS in the .env file;
+existing passwords are rehashed with the new cost as users log in.
+
+Usage: python3 -m backend.script.calibrate_bcrypt [--target-ms 250] [--samples 5]
+"""
+
+import argparse
+import statistics
+import time
+
+from passlib.hash import bcrypt
+
+from ..services.Authentication.password_hasher import BCRYPT_ROUNDS
+
+MIN_ROUNDS = 4
+MAX_ROUNDS = 16
+
+def measure(rounds: int, samples: int) -> float:
+    """Return the median time in milliseconds to hash a password with the given cost factor."""
+    handler = bcrypt.using(rounds=rounds)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        handler.hash("calibration-password")
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+parser = argparse.ArgumentParser(description="Recommend a bcrypt cost factor for a target hash latency.")
+parser.add_argument("--target-ms", type=float, default=250.0, help="Target time for a single hash in milliseconds.")
+parser.add_argument("--samples", type=int, default=5, help="Number of hashes timed per cost factor.")
+args = parser.parse_args()
+
+# Warm up the bcrypt backend so its one-time load cost is not attributed to the first cost factor.
+bcrypt.using(rounds=MIN_ROUNDS).hash("calibration-password")
+
+print(f"Current BCRYPT_ROUNDS: {BCRYPT_ROUNDS}")
+print(f"{'rounds':>6}  {'median ms':>10}")
+
+recommended = MIN_ROUNDS
+for rounds in range(MIN_ROUNDS, MAX_ROUNDS + 1):
+    median_ms = measure(rounds, args.samples)
+    print(f"{rounds:>6}  {median_ms:>10.1f}")
+    if median_ms > args.target_ms:
+        break
+    recommended = rounds
+
+print(f"Recommended BCRYPT_ROUNDS for a {args.target_ms:.0f} ms target: {recommended}")
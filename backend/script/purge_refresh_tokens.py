@@ -0,0 +1,21 @@
+"""Delete the expired refresh tokens of every user.
+
+Expired tokens are already deleted for a user whenever the user logs in. This script
+catches up with the users who stopped logging in. Run it periodically, for instance
+daily from cron.
+
+Usage: python3 -m backend.script.purge_refresh_tokens
+"""
+
+import asyncio
+
+from ..database import async_engine, async_session_factory
+from ..services.Authentication.authentication_service import AuthenticationService
+
+async def main() -> None:
+    async with async_session_factory() as session:
+        purged = await AuthenticationService(session=session).purge_expired_refresh_tokens()
+    await async_engine.dispose()
+    print(f"Purged {purged} expired refresh tokens")
+
+asyncio.run(main())
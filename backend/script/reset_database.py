@@ -1,9 +1,26 @@
-"""Reset Database"""
+"""Reset Database
+
+Drops every table and rebuilds the schema by running all of the Alembic migrations.
+
+Usage: python3 -m backend.script.reset_database
+"""
+
+from pathlib import Path
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import text
 
 from ..entities.entity_base import  EntityBase
 from ..entities.Authentication.user_entity import UserEntity
+from ..entities.Authentication.refresh_token_entity import RefreshTokenEntity
+from ..entities.Folium.species_entity import SpeciesEntity
 from ..entities.Folium.plant_entity import PlantEntity
+from ..entities.Folium.plant_collection_version_entity import PlantCollectionVersionEntity
+from ..entities.Folium.plant_health_sample_entity import PlantHealthSampleEntity
 from ..database import engine
 
 EntityBase.metadata.drop_all(engine)
-EntityBase.metadata.create_all(engine)
\ No newline at end of file
+with engine.begin() as connection:
+    connection.execute(text("DROP TABLE IF EXISTS alembic_version"))
+
+command.upgrade(Config(Path(__file__).parents[2] / "alembic.ini"), "head")
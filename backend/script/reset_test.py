@@ -1,17 +1,29 @@
 """Reset Database and add some test data."""
 
+from pathlib import Path
+from alembic import command
+from alembic.config import Config
+
 from ..entities.entity_base import  EntityBase
 from ..entities.Authentication.user_entity import UserEntity
+from ..entities.Authentication.refresh_token_entity import RefreshTokenEntity
+from ..entities.Folium.species_entity import SpeciesEntity
+from ..entities.Folium.plant_entity import PlantEntity
+from ..entities.Folium.plant_collection_version_entity import PlantCollectionVersionEntity
+from ..entities.Folium.plant_health_sample_entity import PlantHealthSampleEntity
 from ..database import engine
 
 from sqlalchemy.orm import Session
 from ..models.Authentication.user import User
 import sqlalchemy
 from ..env import getenv
-from ..services.Authentication.authentication_service import AuthenticationService
+from ..services.Authentication.password_hasher import hash_password
 
 EntityBase.metadata.drop_all(engine)
-EntityBase.metadata.create_all(engine)
+with engine.begin() as connection:
+    connection.execute(sqlalchemy.text("DROP TABLE IF EXISTS alembic_version"))
+
+command.upgrade(Config(Path(__file__).parents[2] / "alembic.ini"), "head")
 
 def _engine_str(database=getenv("POSTGRES_DATABASE")) -> str:
     """Helper function for reading settings from environment variables to produce connection string."""
@@ -27,13 +39,11 @@ engine = sqlalchemy.create_engine(_engine_str(), echo=True)
 
 session: Session = Session(engine)
 
-service = AuthenticationService(session=session)
-
 mod: User = User(
     id=0,
     email="johndoe@example.com",
     username="johndoe",
-    hashed_password=f"{service._get_password_hash(password='secret')}",
+    hashed_password=f"{hash_password(password='secret')}",
     full_name="John Doe",
     disabled=False
 )
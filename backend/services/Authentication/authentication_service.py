@@ -1,16 +1,21 @@
 """Service to manage the creation the authentication process for users."""
 
-from datetime import datetime, timedelta
+import hashlib
+import secrets
+from datetime import datetime, timedelta, timezone
 from jose import jwt
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import select, delete, func, literal
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends
-from passlib.context import CryptContext
 from email_validator import validate_email, EmailNotValidError
 
 from .exceptions import UserNotFoundException, InvalidCredentialsException, DuplicateUserException, InvalidUserInputPropertyException
+from .password_hasher import password_hasher
 from ...entities.Authentication.user_entity import UserEntity
-from ...models.Authentication.user import User, NewUser
+from ...entities.Authentication.refresh_token_entity import RefreshTokenEntity
+from ...models.Authentication.user import NewUser
 from ...models.Authentication.token import Token
 from ...database import db_session
 from ...env import getenv
@@ -18,29 +23,46 @@ from ...env import getenv
 SECRET_KEY = getenv("JWT_SECRET")
 ALGORITHM = getenv("ALGORITHM")
 ACCESSS_TOKEN_EXPIRE_MINUTES = int(getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
+REFRESH_TOKEN_EXPIRE_DAYS = int(getenv("REFRESH_TOKEN_EXPIRE_DAYS", "30"))
+DEFAULT_DEVICE = "default"
+
+def _refresh_token_digest(refresh_token: str) -> bytes:
+    """Helper function that produces the SHA-256 digest a refresh token is stored and looked up by."""
+    return hashlib.sha256(refresh_token.encode()).digest()
+
+def _new_refresh_token() -> tuple[str, bytes, datetime]:
+    """Helper function that generates a refresh token along with its digest and expiry date."""
+    refresh_token = secrets.token_urlsafe(32)
+    expires_at = datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    return refresh_token, _refresh_token_digest(refresh_token), expires_at
 
 class AuthenticationService():
     """Class to perform all actions pertaining to logins."""
 
-    _session: Session
-    _pwd_context: CryptContext
+    _session: AsyncSession
 
-    def __init__(self, session: Session = Depends(db_session)):
+    def __init__(self, session: AsyncSession = Depends(db_session)):
         self._session = session
-        self._pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-    def _verify_password(self, plain_password: str, hashed_password: str) -> bool:
+    async def _verify_and_update_password(self, plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
         """
         Helper method to verify that a plain text password matches a hashed password.
+
+        If the hash was made with a bcrypt cost factor other than the configured one,
+        a replacement hash made with the configured cost is returned as well.
         
         Args:
             plain_password: A plain text password input by the user.
             hashed_password: A hashed password retrieved from the database.
             
         Returns:
-            bool: True if the passwords match, false otherwise.
+            tuple[bool, str | None]: True if the passwords match, false otherwise, and the replacement hash if one is needed.
+
+        Raises:
+            HashingPoolSaturatedException: If too many hashing jobs are already pending.
+            HashingPoolUnavailableException: If the password hashing worker processes keep dying.
         """
-        return self._pwd_context.verify(plain_password, hashed_password)
+        return await password_hasher.verify_and_update(plain_password, hashed_password)
 
     def _create_access_token(self, data: dict, expires_delta: timedelta | None = None) -> str:
         """
@@ -69,32 +91,48 @@ class AuthenticationService():
 
         return encoded_jwt
         
-    def login(self, username: str, plain_password: str) -> Token:
+    async def login(self, username: str, plain_password: str, device: str = DEFAULT_DEVICE) -> Token:
         """
         Logs in a user with the matching username and password.
+
+        A new refresh token is issued to the device the user logs in from, replacing the
+        token previously issued to that device. Tokens of the user's other devices stay valid.
         
         Args:
             username: The username of the user to be logged in.
             plain_password: The plain text pssword of the user to be logged in.
+            device: The device the user logs in from.
             
         Returns:
-            Dict[str, str]: Dictionary with a key value pair for 'access token' and for 'token_type'.
+            Token: The access token, its type, and the refresh token issued to the device.
 
         Raises:
             UserNotFoundException: If a user with a matching username is not found in the database.
             InvalidCredentialsException: If the password or username are invalid for a user. 
+            HashingPoolSaturatedException: If too many hashing jobs are already pending.
+            HashingPoolUnavailableException: If the password hashing worker processes keep dying.
         """
 
         # Find user with the given username.
         query = select(UserEntity).where(UserEntity.username == username)
-        user_entity = self._session.scalar(query)
+        user_entity = await self._session.scalar(query)
 
         if not user_entity:
             raise UserNotFoundException()
         
         # Verify the password input by the user.
-        if not self._verify_password(plain_password=plain_password, hashed_password=user_entity.hashed_password):
+        verified, new_hash = await self._verify_and_update_password(plain_password=plain_password, 
+                                                                    hashed_password=user_entity.hashed_password)
+        if not verified:
             raise InvalidCredentialsException()
+
+        # Transparently upgrade hashes made with an outdated bcrypt cost factor.
+        if new_hash is not None:
+            user_entity.hashed_password = new_hash
+
+        # Rotate the refresh token of the device, committed along with any rehashed password.
+        refresh_token = await self._create_refresh_token(user_id=user_entity.id, device=device)
+        await self._session.commit()
         
         # Create and return the access token.
         access_token_expires = timedelta(minutes=ACCESSS_TOKEN_EXPIRE_MINUTES)
@@ -102,9 +140,9 @@ class AuthenticationService():
             data={"sub": username}, expires_delta=access_token_expires
         )
 
-        return Token(access_token=access_token, token_type="Bearer")
+        return Token(access_token=access_token, token_type="Bearer", refresh_token=refresh_token)
     
-    def _get_password_hash(self, password: str) -> str:
+    async def _get_password_hash(self, password: str) -> str:
         """
         Helper method that creates a hashed version of a plain text password.
         
@@ -113,58 +151,69 @@ class AuthenticationService():
             
         Returns:
             str: The hashed password.
+
+        Raises:
+            HashingPoolSaturatedException: If too many hashing jobs are already pending.
+            HashingPoolUnavailableException: If the password hashing worker processes keep dying.
         """
-        return self._pwd_context.hash(password)
+        return await password_hasher.hash(password)
     
-    def _create_refresh_token(self, user: User) -> User:
+    async def _create_refresh_token(self, user_id: int, device: str = DEFAULT_DEVICE) -> str:
         """
-        Create a refresh token to be assigned to a user during account creation.
+        Create a refresh token for a user's device, replacing any token previously issued to that device.
+
+        The user's expired tokens are deleted at the same time, so tokens of devices that are
+        no longer used do not pile up. The caller commits.
         
         Args:
-            user: the user that is being created.
+            user_id: the id of the user to issue the refresh token to.
+            device: the device the refresh token is issued to.
             
         Returns:
-            User: the updated user with a valid refresh_token_string.
+            str: the new refresh token. Only its digest is stored in the database.
         """
 
-        refresh_token_string = f"{user.username}{user.email}{user.hashed_password}"
-        user.refresh_token = self._pwd_context.hash(refresh_token_string)
+        refresh_token, token_digest, expires_at = _new_refresh_token()
 
-        return user
+        # Found through the (user_id, device) constraint, whose index leads with user_id.
+        await self._session.execute(delete(RefreshTokenEntity)
+                                    .where(RefreshTokenEntity.user_id == user_id,
+                                           RefreshTokenEntity.expires_at <= func.now()))
+
+        # Upsert on the (user_id, device) constraint so each device holds at most one token.
+        query = insert(RefreshTokenEntity).values(user_id=user_id,
+                                                  device=device,
+                                                  token_digest=token_digest,
+                                                  expires_at=expires_at)
+        query = query.on_conflict_do_update(constraint="refresh_token_user_id_device_key",
+                                            set_={"token_digest": query.excluded.token_digest,
+                                                  "created_at": func.now(),
+                                                  "expires_at": query.excluded.expires_at})
+        await self._session.execute(query)
+
+        return refresh_token
     
-    def _validate_unique_user(self, username: str, hashed_password: str, email: str) -> None:
+    def _duplicate_user_message(self, error: IntegrityError, username: str, email: str) -> str:
         """
-        Validates that the input username, hashed_password, and email are not already in the database.
+        Helper method that maps a unique constraint violation on the user table to a message.
         
         Args:
-            username: The username to validate.
-            hashed_password: The password to validate.
-            email: The email to validate.
+            error: The integrity error raised while inserting the user.
+            username: The username that was being inserted.
+            email: The email that was being inserted.
             
-        Raises:
-            DuplicateUserException: If one of the arguments is already present in a UserEntity in the database.
+        Returns:
+            str: The message describing which field is already in use.
         """
 
-        # Check the username for duplicates.
-        query = select(UserEntity).where(UserEntity.username == username)
-        ent: UserEntity | None = self._session.scalar(query)
-        if ent:
-            raise DuplicateUserException(msg=f"Username {username} already in use.")
-        
-        # Check the email for duplicates.
-        query = select(UserEntity).where(UserEntity.email == email)
-        ent: UserEntity | None = self._session.scalar(query)
-        if ent:
-            raise DuplicateUserException(msg=f"Email {email} already in use.")
-        
-        # Check the hashed_password for duplicates.
-        query = select(UserEntity).where(UserEntity.hashed_password == hashed_password)
-        ent: UserEntity | None = self._session.scalar(query)
-        if ent:
-            raise DuplicateUserException(msg="Password already in use by another user.")
+        detail = str(error.orig)
+        if "user_username_key" in detail:
+            return f"Username {username} already in use."
+        if "user_email_key" in detail:
+            return f"Email {email} already in use."
+        return DuplicateUserException().args[0]
 
-    
-    def create_user(self, username: str, password: str, email: str, full_name: str):
+    async def create_user(self, username: str, password: str, email: str, full_name: str, device: str = DEFAULT_DEVICE):
         """
         Create a new user in the database.
         
@@ -172,6 +221,7 @@ class AuthenticationService():
             username: The username for the user to be created.
             password: The password for the user to be created (in plain text).
             email: The email for the user to be created.
+            device: The device to issue the user's first refresh token to.
             
         Returns:
             NewUser: A NewUser object representing the user that was created in the database.
@@ -179,6 +229,8 @@ class AuthenticationService():
         Raises:
             InvalidUserInputPropertyException: If the input properties are improperly formatted or blank.
             DuplicateUserException: If any one of the input properties are being used by another user in the database.
+            HashingPoolSaturatedException: If too many hashing jobs are already pending.
+            HashingPoolUnavailableException: If the password hashing worker processes keep dying.
         """
 
         # Check that inputs are not empty
@@ -198,34 +250,40 @@ class AuthenticationService():
         except EmailNotValidError as e:
             raise InvalidUserInputPropertyException("Email invalid or improperly formatted.")
         
-        # Create hashed password and validate that all of the properties are unique.
-        hashed_password = self._get_password_hash(password=password)
-        self._validate_unique_user(username=username, hashed_password=hashed_password, email=email)
-            
-        new_user = User(
-            email=email,
-            username=username,
-            hashed_password=hashed_password,
-            full_name=full_name
+        # Create hashed password and the users refresh token to be stored and used to create new access tokens.
+        hashed_password = await self._get_password_hash(password=password)
+        refresh_token, token_digest, expires_at = _new_refresh_token()
+
+        # Insert the user and its refresh token in a single statement. Uniqueness is enforced by
+        # the constraints on the user table rather than by querying for duplicates up front.
+        new_user = (insert(UserEntity)
+                    .values(email=email, username=username, hashed_password=hashed_password, full_name=full_name)
+                    .returning(UserEntity.id)
+                    .cte("new_user"))
+        query = (insert(RefreshTokenEntity)
+                 .from_select(["user_id", "device", "token_digest", "expires_at"],
+                              select(new_user.c.id, literal(device), literal(token_digest), literal(expires_at)))
+                 .returning(RefreshTokenEntity.user_id))
+        try:
+            await self._session.execute(query)
+            await self._session.commit()
+        except IntegrityError as e:
+            await self._session.rollback()
+            raise DuplicateUserException(msg=self._duplicate_user_message(error=e, username=username, email=email))
+
+        # Mint the access token directly; the password was just hashed so there is nothing to verify.
+        access_token_expires = timedelta(minutes=ACCESSS_TOKEN_EXPIRE_MINUTES)
+        access_token = self._create_access_token(
+            data={"sub": username}, expires_delta=access_token_expires
         )
 
-        # Create the users refresh token to be stored and used to create new access tokens.
-        new_user = self._create_refresh_token(user=new_user)
-
-        # Add the new user to the database.
-        new_user_entity = UserEntity.from_model(new_user)
-        self._session.add(new_user_entity)
-        self._session.commit()
-
-        # Log the user in to get the access token and return a NewUser object.
-        token: Token = self.login(username=username, plain_password=password)
-        return NewUser(email=new_user.email,
-                       username=new_user.username, 
-                       full_name=new_user.full_name, 
-                       refresh_token=new_user.refresh_token, 
-                       access_token=token.access_token)
+        return NewUser(email=email,
+                       username=username, 
+                       full_name=full_name, 
+                       refresh_token=refresh_token, 
+                       access_token=access_token)
     
-    def refresh_access_token(self, refresh_token: str) -> Token:
+    async def refresh_access_token(self, refresh_token: str) -> Token:
         """
         Refresh the access token for a user.
         
@@ -236,20 +294,59 @@ class AuthenticationService():
             Token: The newly created access token.
             
         Raises:
-            UserNotFoundException: If a user is not found with the provided refresh token.
+            UserNotFoundException: If a user is not found with the provided refresh token or the token has expired.
         """
 
-        # Get the user with the matching refresh token from the database.
-        query = select(UserEntity).where(UserEntity.refresh_token == refresh_token)
-        user_entity: UserEntity | None = self._session.scalar(query)
+        # Get the user with the matching, unexpired refresh token through the unique digest index.
+        query = (select(UserEntity.username)
+                 .join(RefreshTokenEntity, RefreshTokenEntity.user_id == UserEntity.id)
+                 .where(RefreshTokenEntity.token_digest == _refresh_token_digest(refresh_token),
+                        RefreshTokenEntity.expires_at > func.now()))
+        username: str | None = await self._session.scalar(query)
 
-        if not user_entity:
+        if not username:
             raise UserNotFoundException()
         
         # Create and return the access token.
         access_token_expires = timedelta(minutes=ACCESSS_TOKEN_EXPIRE_MINUTES)
         access_token = self._create_access_token(
-            data={"sub": user_entity.username}, expires_delta=access_token_expires
+            data={"sub": username}, expires_delta=access_token_expires
         )
 
-        return Token(access_token=access_token, token_type="Bearer")
\ No newline at end of file
+        return Token(access_token=access_token, token_type="Bearer")
+
+    async def revoke_refresh_token(self, refresh_token: str) -> None:
+        """
+        Revoke a refresh token so it can no longer be used to refresh access tokens.
+        
+        Args:
+            refresh_token: the refresh token to revoke.
+            
+        Raises:
+            UserNotFoundException: If no refresh token matches the provided refresh token.
+        """
+
+        query = (delete(RefreshTokenEntity)
+                 .where(RefreshTokenEntity.token_digest == _refresh_token_digest(refresh_token))
+                 .returning(RefreshTokenEntity.id))
+        revoked_id: int | None = await self._session.scalar(query)
+
+        if revoked_id is None:
+            raise UserNotFoundException()
+
+        await self._session.commit()
+
+    async def purge_expired_refresh_tokens(self) -> int:
+        """
+        Delete every expired refresh token, through the index on their expiry date.
+
+        Tokens are also purged per user whenever a user logs in, so this only has to catch
+        up with users who stopped logging in.
+            
+        Returns:
+            int: The number of refresh tokens deleted.
+        """
+
+        result = await self._session.execute(delete(RefreshTokenEntity).where(RefreshTokenEntity.expires_at <= func.now()))
+        await self._session.commit()
+        return result.rowcount
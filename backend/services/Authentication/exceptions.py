@@ -39,4 +39,18 @@ class InvalidUserInputPropertyException(Exception):
     def __init__(self, msg: str = "Invalid input for username, email, or password. Please ensure that there are no spaces."):
         super().__init__(
             f"{msg}"
-        )
\ No newline at end of file
+        )
+
+class HashingPoolSaturatedException(Exception):
+    """Exception to be raised when too many password hashing jobs are already waiting to run."""
+    def __init__(self):
+        super().__init__(
+            "Too many authentication requests in progress. Please try again shortly."
+        )
+
+class HashingPoolUnavailableException(Exception):
+    """Exception to be raised when the password hashing worker processes keep dying, even after the pool is restarted."""
+    def __init__(self):
+        super().__init__(
+            "Authentication is temporarily unavailable. Please try again shortly."
+        )
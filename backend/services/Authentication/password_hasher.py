@@ -0,0 +1,220 @@
+"""Password hashing backend that runs bcrypt in a dedicated, bounded process pool.
+
+bcrypt is deliberately slow and holds the GIL while it runs. Running it in worker
+processes keeps login and registration bursts from starving the event loop and the
+rest of the API."""
+
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from passlib.context import CryptContext
+
+from ...env import getenv
+from ...models.health import HashingPoolStats
+from .exceptions import HashingPoolSaturatedException, HashingPoolUnavailableException
+
+HASHING_POOL_WORKERS = int(getenv("HASHING_POOL_WORKERS", str(min(os.cpu_count() or 1, 4))))
+HASHING_POOL_MAX_PENDING = int(getenv("HASHING_POOL_MAX_PENDING", "64"))
+# bcrypt cost factor. Use `python3 -m backend.script.calibrate_bcrypt` to pick a value for the host.
+BCRYPT_ROUNDS = int(getenv("BCRYPT_ROUNDS", "12"))
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    # Pinning the accepted range to the configured cost flags hashes made with any other
+    # cost as needing an update, so they are transparently rehashed on the next login.
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
+"""Process-wide password hashing context, shared by the API process and the pool workers."""
+
+def hash_password(password: str) -> str:
+    """
+    Hash a plain text secret with bcrypt in the calling process.
+
+    Args:
+        password: The plain text secret to hash.
+
+    Returns:
+        str: The hashed secret.
+    """
+    return pwd_context.hash(password)
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a plain text secret against a bcrypt hash in the calling process.
+
+    Args:
+        plain_password: The plain text secret.
+        hashed_password: The hash to verify the secret against.
+
+    Returns:
+        bool: True if the secret matches the hash, false otherwise.
+    """
+    return pwd_context.verify(plain_password, hashed_password)
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    Verify a plain text secret and rehash it if its hash was made with an outdated cost factor.
+
+    Args:
+        plain_password: The plain text secret.
+        hashed_password: The hash to verify the secret against.
+
+    Returns:
+        tuple[bool, str | None]: Whether the secret matches, and the replacement hash if one is needed.
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    Runs password hashing jobs in a process pool and rejects jobs once too many are pending.
+
+    If a worker process dies, for instance when it is killed for running out of memory, the
+    pool is broken for good. It is then replaced by a new pool and the job is retried once.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self._workers = workers
+        self._max_pending = max_pending
+        self._executor: ProcessPoolExecutor | None = None
+        self._pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_latency_seconds = 0.0
+        self.max_latency_seconds = 0.0
+
+    async def hash(self, password: str) -> str:
+        """
+        Hash a plain text secret in the process pool.
+
+        Args:
+            password: The plain text secret to hash.
+
+        Returns:
+            str: The hashed secret.
+
+        Raises:
+            HashingPoolSaturatedException: If too many hashing jobs are already pending.
+            HashingPoolUnavailableException: If the worker processes died again after the pool was restarted.
+        """
+        return await self._submit(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Verify a plain text secret against a hash in the process pool.
+
+        Args:
+            plain_password: The plain text secret.
+            hashed_password: The hash to verify the secret against.
+
+        Returns:
+            bool: True if the secret matches the hash, false otherwise.
+
+        Raises:
+            HashingPoolSaturatedException: If too many hashing jobs are already pending.
+            HashingPoolUnavailableException: If the worker processes died again after the pool was restarted.
+        """
+        return await self._submit(verify_password, plain_password, hashed_password)
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+        """
+        Verify a plain text secret in the process pool, rehashing it if its cost factor is outdated.
+
+        Args:
+            plain_password: The plain text secret.
+            hashed_password: The hash to verify the secret against.
+
+        Returns:
+            tuple[bool, str | None]: Whether the secret matches, and the replacement hash if one is needed.
+
+        Raises:
+            HashingPoolSaturatedException: If too many hashing jobs are already pending.
+            HashingPoolUnavailableException: If the worker processes died again after the pool was restarted.
+        """
+        return await self._submit(verify_and_update_password, plain_password, hashed_password)
+
+    def stats(self) -> HashingPoolStats:
+        """Snapshot the queue depth and latency counters of the pool."""
+        return HashingPoolStats(
+            workers=self._workers,
+            max_pending=self._max_pending,
+            pending=self._pending,
+            queued=max(self._pending - self._workers, 0),
+            completed=self.completed,
+            failed=self.failed,
+            rejected=self.rejected,
+            mean_latency_ms=self.total_latency_seconds / self.completed * 1000 if self.completed else 0.0,
+            max_latency_ms=self.max_latency_seconds * 1000,
+        )
+
+    def shutdown(self) -> None:
+        """Stop the worker processes. The pool is restarted lazily on the next job."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def _submit(self, fn, *args):
+        """Helper method that runs a job in the pool, enforcing the pending job limit."""
+        if self._pending >= self._max_pending:
+            self.rejected += 1
+            raise HashingPoolSaturatedException()
+
+        self._pending += 1
+        start = time.perf_counter()
+        try:
+            result = await self._run(fn, *args)
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self._pending -= 1
+
+        # Only successful jobs count towards the latency, so failures cannot hide slow hashing.
+        elapsed = time.perf_counter() - start
+        self.completed += 1
+        self.total_latency_seconds += elapsed
+        self.max_latency_seconds = max(self.max_latency_seconds, elapsed)
+        return result
+
+    async def _run(self, fn, *args):
+        """Helper method that runs a job in the pool, replacing the pool and retrying once if its workers died."""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        try:
+            return await loop.run_in_executor(executor, fn, *args)
+        except BrokenProcessPool:
+            self._discard_executor(executor)
+
+        executor = self._get_executor()
+        try:
+            return await loop.run_in_executor(executor, fn, *args)
+        except BrokenProcessPool:
+            self._discard_executor(executor)
+            raise HashingPoolUnavailableException()
+
+    def _discard_executor(self, executor: ProcessPoolExecutor) -> None:
+        """Helper method that drops a broken pool, unless a concurrent job already replaced it."""
+        if self._executor is executor:
+            self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Helper method that starts the worker processes on first use."""
+        if self._executor is None:
+            # Workers are spawned rather than forked so they never inherit the event loop,
+            # open database connections or threads of the API process.
+            self._executor = ProcessPoolExecutor(max_workers=self._workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+
+password_hasher = PasswordHasher(workers=HASHING_POOL_WORKERS, max_pending=HASHING_POOL_MAX_PENDING)
+"""Process-wide password hashing pool shared by every AuthenticationService instance."""
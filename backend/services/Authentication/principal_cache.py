@@ -0,0 +1,124 @@
+"""In-process cache of authenticated users, keyed by the access token they presented."""
+
+import time
+from collections import OrderedDict
+
+from ...env import getenv
+from ...models.Authentication.user import User
+from ...models.health import CacheStats
+
+PRINCIPAL_CACHE_SIZE = int(getenv("PRINCIPAL_CACHE_SIZE", "1024"))
+PRINCIPAL_CACHE_TTL_SECONDS = float(getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+
+class PrincipalCache:
+    """
+    Bounded LRU cache of the users that access tokens resolve to.
+
+    Entries expire after the configured TTL or when the token itself expires, whichever
+    comes first, so a cached principal is never served for a token that is no longer valid.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        # Maps token -> (monotonic deadline, user), ordered from least to most recently used.
+        self._entries: OrderedDict[str, tuple[float, User]] = OrderedDict()
+        # Maps username -> tokens cached for that user, to support invalidation by user.
+        self._tokens_by_username: dict[str, set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, token: str) -> User | None:
+        """
+        Retrieve the cached user for a token.
+
+        Args:
+            token: The access token presented by the caller.
+
+        Returns:
+            User | None: A copy of the cached user, or None if the token is not cached or has expired.
+        """
+
+        entry = self._entries.get(token)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        deadline, user = entry
+        if deadline <= time.monotonic():
+            self._remove(token)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return user.model_copy()
+
+    def put(self, token: str, user: User, expires_at: float | None = None) -> None:
+        """
+        Cache the user that a token resolves to.
+
+        Args:
+            token: The access token presented by the caller.
+            user: The user the token resolved to.
+            expires_at: The UNIX timestamp of the token's 'exp' claim, if any.
+        """
+
+        ttl = self._ttl_seconds
+        if expires_at is not None:
+            ttl = min(ttl, expires_at - time.time())
+        if ttl <= 0 or self._max_size <= 0:
+            return
+
+        if token in self._entries:
+            self._remove(token)
+        self._entries[token] = (time.monotonic() + ttl, user.model_copy())
+        self._tokens_by_username.setdefault(user.username, set()).add(token)
+
+        while len(self._entries) > self._max_size:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate_user(self, username: str) -> None:
+        """
+        Drop every cached token for a user. Must be called whenever a user is deleted or disabled.
+
+        Args:
+            username: The username of the user to invalidate.
+        """
+
+        for token in self._tokens_by_username.pop(username, set()):
+            self._entries.pop(token, None)
+
+    def clear(self) -> None:
+        """Drop every cached entry and reset the counters."""
+        self._entries.clear()
+        self._tokens_by_username.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> CacheStats:
+        """Snapshot the hit/miss counters of the cache."""
+        lookups = self.hits + self.misses
+        return CacheStats(
+            size=len(self._entries),
+            max_size=self._max_size,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            hit_ratio=self.hits / lookups if lookups else 0.0,
+        )
+
+    def _remove(self, token: str) -> None:
+        """Helper method that removes a single token from both indexes."""
+        _, user = self._entries.pop(token)
+        tokens = self._tokens_by_username.get(user.username)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_username[user.username]
+
+
+principal_cache = PrincipalCache(max_size=PRINCIPAL_CACHE_SIZE, ttl_seconds=PRINCIPAL_CACHE_TTL_SECONDS)
+"""Process-wide principal cache shared by every UserService instance."""
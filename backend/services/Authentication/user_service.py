@@ -3,15 +3,16 @@
 from fastapi import Depends
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import jwt, ExpiredSignatureError, JWTError
-from passlib.context import CryptContext
 
 from ...env import getenv
 from ...database import db_session
+from ...metrics import timed
 from ...models.Authentication.user import User
 from ...entities.Authentication.user_entity import UserEntity
 from .exceptions import UserNotFoundException, InvalidTokenException, DisabledUserException, DuplicateUserException
+from .principal_cache import principal_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
@@ -28,19 +29,17 @@ class UserService():
     The route will then be unusable unless the caller passes an 'Authorization' header
     with a value of 'Bearer xxx' where xxx represents a valid JWT token.
     """
-    _session: Session
+    _session: AsyncSession
     _token: str
-    _pwd_context: CryptContext
 
     def __init__(self,
                 session = Depends(db_session),
                 token = Depends(oauth2_scheme)
     ):
         self._session = session
-        self._pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
         self._token = token
 
-    def _get_user(self, username: str) -> UserEntity:
+    async def _get_user(self, username: str) -> UserEntity:
         """
         Helper method that retrieves the user with the matching username from the database.
         
@@ -55,16 +54,19 @@ class UserService():
         """
 
         query = select(UserEntity).where(UserEntity.username == username)
-        ent: UserEntity | None = self._session.scalar(query)
+        ent: UserEntity | None = await self._session.scalar(query)
 
         if ent ==  None:
             raise UserNotFoundException()
         
         return ent
 
-    def _get_current_user(self, token: str) -> User:
+    async def _get_current_user(self, token: str) -> User:
         """
         Helper method that decodes a JWT token and retrieves a user.
+
+        Users are served from the principal cache when the token was resolved recently,
+        which skips both the decode and the database lookup.
         
         Args:
             token: The token to decode and use to find the user.
@@ -78,6 +80,11 @@ class UserService():
             UserNotFoundException: If there is no user in the database with a matching username.
         """
 
+        # Serve the user from the principal cache if the token was resolved recently.
+        cached_user = principal_cache.get(token)
+        if cached_user is not None:
+            return cached_user
+
         # decode the JWT into a dictionary.
         try:
             payload = jwt.decode(token=token, key=SECRET_KEY, algorithms=ALGORITHM)
@@ -91,13 +98,16 @@ class UserService():
         if username is None:
             raise InvalidTokenException()
         
-        # Retrieve and return the User object.
-        user = self._get_user(username=username)
-        return user.to_model()
+        # Retrieve the User object and cache it until the token expires.
+        user = (await self._get_user(username=username)).to_model()
+        principal_cache.put(token, user, expires_at=payload.get("exp"))
+        return user
     
-    def get_current_active_user(self) -> User:
+    async def get_current_active_user(self) -> User:
         """
         Gets a current user and validates that the user is not disabled (non-expired JWT).
+
+        The time taken, including the token decode and user lookup, is reported as the 'auth' phase of the request.
         
         Returns:
             User: The current active user.
@@ -108,13 +118,14 @@ class UserService():
             DisabledUserException: If the current user is disabled in the database.
         """
 
-        current_user = self._get_current_user(self._token)
+        with timed("auth"):
+            current_user = await self._get_current_user(self._token)
         if current_user.disabled:
             raise DisabledUserException()
             
         return current_user
     
-    def delete_current_user(self) -> User:
+    async def delete_current_user(self) -> User:
         """
         Deletes the currently authenticated user from the database.
         
@@ -127,11 +138,12 @@ class UserService():
             DisabledUserException: If the current user is disabled in the database.
         """
 
-        current_user = self.get_current_active_user()
-        current_user_entity = self._get_user(username=current_user.username)
+        current_user = await self.get_current_active_user()
+        current_user_entity = await self._get_user(username=current_user.username)
 
-        self._session.delete(current_user_entity)
-        self._session.commit()
+        await self._session.delete(current_user_entity)
+        await self._session.commit()
+        principal_cache.invalidate_user(current_user.username)
 
         return current_user_entity.to_model()
 
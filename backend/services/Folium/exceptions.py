@@ -19,4 +19,25 @@ class PlantOwnerUsernameInvalidException(Exception):
     def __init__(self):
         super().__init__(
             "Plant property 'owner_username' must match that of the authenticated user."
-        )
\ No newline at end of file
+        )
+
+class PlantInvalidCursorException(Exception):
+    """Exception to be thrown when a pagination cursor that was not issued by the API is passed."""
+    def __init__(self):
+        super().__init__(
+            "Invalid pagination cursor."
+        )
+
+class PlantBulkLimitExceededException(Exception):
+    """Exception to be thrown when a bulk request contains more plants than a single request may write."""
+    def __init__(self, limit: int):
+        super().__init__(
+            f"Bulk requests are limited to {limit} plants."
+        )
+
+class PlantInvalidFieldsException(Exception):
+    """Exception to be thrown when a projection names fields that plants do not have."""
+    def __init__(self, fields: list[str]):
+        super().__init__(
+            f"Unknown plant fields: {', '.join(fields)}."
+        )
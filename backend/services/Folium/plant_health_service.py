@@ -0,0 +1,162 @@
+"""Plant health service used by the plant health api to record and aggregate plant health samples."""
+
+from datetime import datetime
+
+from fastapi import Depends
+from sqlalchemy import select, insert, func, literal, DateTime
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...database import db_session
+from ...models.Folium.plant_health import PlantHealthSample, PlantHealthSummary
+from ...entities.Folium.plant_entity import PlantEntity
+from ...entities.Folium.plant_health_sample_entity import PlantHealthSampleEntity
+from .exceptions import PlantNotFoundException
+
+DEFAULT_SAMPLE_LIMIT = 100
+MAX_SAMPLE_LIMIT = 1000
+# Number of most recent samples the health summary is computed over.
+DEFAULT_SUMMARY_WINDOW = 7
+
+SECONDS_PER_DAY = 86400
+
+class PlantHealthService:
+    """Plant health service to perform actions on the plant_health_sample table."""
+
+    def __init__(self,
+                 session: AsyncSession = Depends(db_session)):
+        self._session = session
+
+    async def __check_plant_owner(self, plant_id: int, owner_username: str) -> None:
+        """
+        Helper method that raises an exception unless a plant exists and belongs to the caller.
+
+        Args:
+            plant_id: The id of the plant.
+            owner_username: The username of the calling user.
+
+        Raises:
+            PlantNotFoundException: If the plant is not found in the database or belongs to another user.
+        """
+
+        query = (select(PlantEntity.id)
+                 .where(PlantEntity.id == plant_id)
+                 .where(PlantEntity.owner_username == owner_username))
+        if await self._session.scalar(query) is None:
+            raise PlantNotFoundException()
+
+    async def add_sample(self, plant_id: int, sample: PlantHealthSample, owner_username: str) -> PlantHealthSample:
+        """
+        Append a health sample to a plant's history.
+
+        The sample is inserted with a single INSERT ... SELECT that only produces a row
+        when the plant belongs to the caller.
+
+        Args:
+            plant_id: The id of the plant the sample is for.
+            sample: The sample to add. When 'recorded_at' is not set, the current time is used.
+            owner_username: The username of the calling user.
+
+        Returns:
+            PlantHealthSample: The sample that was added.
+
+        Raises:
+            PlantNotFoundException: If the plant is not found in the database or belongs to another user.
+        """
+
+        recorded_at = literal(sample.recorded_at, DateTime(timezone=True)) if sample.recorded_at is not None else func.now()
+        owned_plant = (select(PlantEntity.id, literal(sample.score), recorded_at)
+                       .where(PlantEntity.id == plant_id)
+                       .where(PlantEntity.owner_username == owner_username))
+        query = (insert(PlantHealthSampleEntity)
+                 .from_select(["plant_id", "score", "recorded_at"], owned_plant)
+                 .returning(PlantHealthSampleEntity))
+        sample_entity: PlantHealthSampleEntity | None = await self._session.scalar(query)
+        if sample_entity is None:
+            raise PlantNotFoundException()
+        await self._session.commit()
+
+        return sample_entity.to_model()
+
+    async def get_samples(self,
+                          plant_id: int,
+                          owner_username: str,
+                          start: datetime | None = None,
+                          end: datetime | None = None,
+                          limit: int = DEFAULT_SAMPLE_LIMIT) -> list[PlantHealthSample]:
+        """
+        Retrieve a plant's health samples within a time range, oldest first.
+
+        When more than 'limit' samples are in the range, the earliest ones from 'start' are
+        returned if it is set, and the latest ones otherwise.
+
+        Args:
+            plant_id: The id of the plant.
+            owner_username: The username of the calling user.
+            start: Only samples recorded at or after this time are returned, if set.
+            end: Only samples recorded before this time are returned, if set.
+            limit: The maximum number of samples to return.
+
+        Returns:
+            list[PlantHealthSample]: The plant's samples in the range.
+
+        Raises:
+            PlantNotFoundException: If the plant is not found in the database or belongs to another user.
+        """
+
+        await self.__check_plant_owner(plant_id=plant_id, owner_username=owner_username)
+
+        query = select(PlantHealthSampleEntity).where(PlantHealthSampleEntity.plant_id == plant_id)
+        if start is not None:
+            query = query.where(PlantHealthSampleEntity.recorded_at >= start)
+        if end is not None:
+            query = query.where(PlantHealthSampleEntity.recorded_at < end)
+        limit = max(1, min(limit, MAX_SAMPLE_LIMIT))
+
+        if start is not None:
+            query = query.order_by(PlantHealthSampleEntity.recorded_at).limit(limit)
+            return [entity.to_model() for entity in await self._session.scalars(query)]
+        query = query.order_by(PlantHealthSampleEntity.recorded_at.desc()).limit(limit)
+        return [entity.to_model() for entity in reversed(list(await self._session.scalars(query)))]
+
+    async def get_summary(self, plant_id: int, owner_username: str, window: int = DEFAULT_SUMMARY_WINDOW) -> PlantHealthSummary:
+        """
+        Aggregate a plant's most recent health samples in the database.
+
+        Args:
+            plant_id: The id of the plant.
+            owner_username: The username of the calling user.
+            window: The number of most recent samples to aggregate.
+
+        Returns:
+            PlantHealthSummary: The latest score, the average score and the trend in points per day over the window.
+
+        Raises:
+            PlantNotFoundException: If the plant is not found in the database or belongs to another user.
+        """
+
+        await self.__check_plant_owner(plant_id=plant_id, owner_username=owner_username)
+
+        recent = (select(PlantHealthSampleEntity.score, PlantHealthSampleEntity.recorded_at)
+                  .where(PlantHealthSampleEntity.plant_id == plant_id)
+                  .order_by(PlantHealthSampleEntity.recorded_at.desc())
+                  .limit(max(1, window))
+                  .subquery())
+        days = func.extract("epoch", recent.c.recorded_at) / SECONDS_PER_DAY
+        query = select(
+            func.count(),
+            func.array_agg(aggregate_order_by(recent.c.score, recent.c.recorded_at.desc()))[1],
+            func.max(recent.c.recorded_at),
+            func.avg(recent.c.score),
+            func.regr_slope(recent.c.score, days),
+        )
+        samples, latest_score, latest_recorded_at, rolling_average, trend = (await self._session.execute(query)).one()
+
+        return PlantHealthSummary(
+            plant_id=plant_id,
+            samples=samples,
+            latest_score=latest_score,
+            latest_recorded_at=latest_recorded_at,
+            rolling_average=float(rolling_average) if rolling_average is not None else None,
+            trend=trend,
+        )
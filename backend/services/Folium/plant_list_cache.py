@@ -0,0 +1,332 @@
+"""Cache of users' serialized plant lists, with an in-process and a Redis backend.
+
+Entries hold the JSON body of a user's plant list tagged with the collection version
+it was read at. A lookup only hits when the caller's current collection version matches,
+so a list read concurrently with a write can never be served after that write commits.
+A user may have several cached variants of their list, such as projections onto a subset
+of the plant fields; invalidating a user drops every variant at once."""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+from ...env import getenv
+from ...models.health import PlantListCacheStats
+
+PLANT_CACHE_BACKEND = getenv("PLANT_CACHE_BACKEND", "memory")
+PLANT_CACHE_MAX_BYTES = int(getenv("PLANT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+PLANT_CACHE_REDIS_URL = getenv("PLANT_CACHE_REDIS_URL", "redis://localhost:6379/0")
+PLANT_CACHE_TTL_SECONDS = int(getenv("PLANT_CACHE_TTL_SECONDS", "3600"))
+
+logger = logging.getLogger(__name__)
+
+class PlantListCache(ABC):
+    """Interface of the plant list cache backends."""
+
+    name = ""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+
+    @abstractmethod
+    async def get(self, owner_username: str, version: int, variant: str = "") -> bytes | None:
+        """
+        Retrieve the cached plant list of a user.
+
+        Args:
+            owner_username: The username of the owner of the plants.
+            version: The current version of the user's plant collection.
+            variant: The variant of the list, or "" for the full list.
+
+        Returns:
+            bytes | None: The JSON body of the plant list, or None if it is not cached at this version.
+        """
+
+    @abstractmethod
+    async def put(self, owner_username: str, version: int, body: bytes, variant: str = "") -> None:
+        """
+        Cache the plant list of a user.
+
+        Args:
+            owner_username: The username of the owner of the plants.
+            version: The version of the user's plant collection the list was read at.
+            body: The JSON body of the plant list.
+            variant: The variant of the list, or "" for the full list.
+        """
+
+    @abstractmethod
+    async def invalidate(self, owner_username: str) -> None:
+        """
+        Drop every cached variant of a user's plant list. Must be called whenever one of the user's plants is written.
+
+        Args:
+            owner_username: The username of the owner of the plants.
+        """
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Drop every cached entry and reset the counters."""
+
+    def stats(self) -> PlantListCacheStats:
+        """Snapshot the hit/miss counters of the cache."""
+        lookups = self.hits + self.misses
+        return PlantListCacheStats(
+            backend=self.name,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            errors=self.errors,
+            hit_ratio=self.hits / lookups if lookups else 0.0,
+        )
+
+    def _reset_counters(self) -> None:
+        """Helper method that resets the hit/miss counters."""
+        self.hits = self.misses = self.evictions = self.errors = 0
+
+
+class MemoryPlantListCache(PlantListCache):
+    """In-process LRU cache of plant lists, bounded by the total size of the cached bodies."""
+
+    name = "memory"
+
+    def __init__(self, max_bytes: int):
+        super().__init__()
+        self._max_bytes = max_bytes
+        # Maps (username, variant) -> (version, body), ordered from least to most recently used.
+        self._entries: OrderedDict[tuple[str, str], tuple[int, bytes]] = OrderedDict()
+        # Maps username -> the variants cached for the user, so they can be invalidated together.
+        self._variants: dict[str, set[str]] = {}
+        self._size_bytes = 0
+
+    async def get(self, owner_username: str, version: int, variant: str = "") -> bytes | None:
+        key = (owner_username, variant)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != version:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    async def put(self, owner_username: str, version: int, body: bytes, variant: str = "") -> None:
+        key = (owner_username, variant)
+        self._remove(key)
+        if len(body) > self._max_bytes:
+            return
+
+        self._entries[key] = (version, body)
+        self._variants.setdefault(owner_username, set()).add(variant)
+        self._size_bytes += len(body)
+
+        while self._size_bytes > self._max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    async def invalidate(self, owner_username: str) -> None:
+        for variant in list(self._variants.get(owner_username, ())):
+            self._remove((owner_username, variant))
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._variants.clear()
+        self._size_bytes = 0
+        self._reset_counters()
+
+    def stats(self) -> PlantListCacheStats:
+        stats = super().stats()
+        stats.entries = len(self._entries)
+        stats.size_bytes = self._size_bytes
+        stats.max_bytes = self._max_bytes
+        return stats
+
+    def _remove(self, key: tuple[str, str]) -> None:
+        """Helper method that removes a single entry and releases its size."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        self._size_bytes -= len(entry[1])
+        owner_username, variant = key
+        variants = self._variants[owner_username]
+        variants.discard(variant)
+        if not variants:
+            del self._variants[owner_username]
+
+
+class RedisProtocolError(Exception):
+    """Exception to be thrown when a Redis server replies with an error or an unexpected message."""
+
+
+class RedisPlantListCache(PlantListCache):
+    """
+    Plant list cache shared by every API worker through a Redis server.
+
+    Speaks the Redis serialization protocol directly over an asyncio stream, so no client
+    library is needed. The cache is an optimization only: if the server cannot be reached,
+    lookups miss and writes are dropped instead of failing the request. Eviction is left
+    to the server's 'maxmemory' policy; entries also expire after the configured TTL.
+
+    The variants of a user's list are the fields of one hash per user, so deleting
+    the hash invalidates all of them.
+    """
+
+    name = "redis"
+    KEY_PREFIX = "folium:plant_lists:"
+
+    def __init__(self, url: str, ttl_seconds: int):
+        super().__init__()
+        parts = urlsplit(url)
+        self._host = parts.hostname or "localhost"
+        self._port = parts.port or 6379
+        self._password = parts.password
+        self._database = int(parts.path.lstrip("/") or 0)
+        self._ttl_seconds = ttl_seconds
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock: asyncio.Lock | None = None
+
+    async def get(self, owner_username: str, version: int, variant: str = "") -> bytes | None:
+        value = await self._command_or_none(b"HGET", self._key(owner_username), variant.encode())
+        if value is None:
+            self.misses += 1
+            return None
+
+        stored_version, _, body = value.partition(b"\n")
+        if stored_version != str(version).encode():
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return body
+
+    async def put(self, owner_username: str, version: int, body: bytes, variant: str = "") -> None:
+        key = self._key(owner_username)
+        value = str(version).encode() + b"\n" + body
+        if await self._command_or_none(b"HSET", key, variant.encode(), value) is not None:
+            await self._command_or_none(b"EXPIRE", key, str(self._ttl_seconds).encode())
+
+    async def invalidate(self, owner_username: str) -> None:
+        await self._command_or_none(b"DEL", self._key(owner_username))
+
+    async def clear(self) -> None:
+        cursor = b"0"
+        while True:
+            reply = await self._command_or_none(b"SCAN", cursor, b"MATCH", self.KEY_PREFIX.encode() + b"*")
+            if reply is None:
+                break
+            cursor, keys = reply
+            if keys:
+                await self._command_or_none(b"DEL", *keys)
+            if cursor == b"0":
+                break
+        self._reset_counters()
+
+    def _key(self, owner_username: str) -> bytes:
+        """Helper method that namespaces a username as a Redis key."""
+        return (self.KEY_PREFIX + owner_username).encode()
+
+    async def _command_or_none(self, *args: bytes):
+        """Helper method that runs a command, counting and logging failures instead of raising them."""
+        try:
+            return await self._command(*args)
+        except (OSError, EOFError, RedisProtocolError) as e:
+            self.errors += 1
+            logger.warning("Plant list cache command %s failed: %s", args[0].decode(), e)
+            return None
+
+    async def _command(self, *args: bytes):
+        """Helper method that sends one command and reads its reply, one command at a time."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Streams are bound to the event loop that opened them.
+            self._loop, self._lock = loop, asyncio.Lock()
+            self._reader = self._writer = None
+
+        async with self._lock:
+            try:
+                if self._writer is None or self._writer.is_closing():
+                    await self._connect()
+                self._writer.write(_encode_command(*args))
+                await self._writer.drain()
+                return await _read_reply(self._reader)
+            except BaseException:
+                # A failed or cancelled command leaves an unread reply on the stream, so start over.
+                if self._writer is not None:
+                    self._writer.close()
+                self._reader = self._writer = None
+                raise
+
+    async def _connect(self) -> None:
+        """Helper method that opens the connection and selects the configured database."""
+        self._reader, self._writer = await asyncio.open_connection(self._host, self._port)
+        if self._password:
+            await self._handshake(b"AUTH", self._password.encode())
+        if self._database:
+            await self._handshake(b"SELECT", str(self._database).encode())
+
+    async def _handshake(self, *args: bytes) -> None:
+        """Helper method that runs a connection setup command."""
+        self._writer.write(_encode_command(*args))
+        await self._writer.drain()
+        await _read_reply(self._reader)
+
+
+def _encode_command(*args: bytes) -> bytes:
+    """Helper function that encodes a command as a RESP array of bulk strings."""
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+async def _read_reply(reader: asyncio.StreamReader):
+    """Helper function that reads and decodes a single RESP reply, raising RedisProtocolError if it is malformed."""
+    try:
+        line = await reader.readuntil(b"\r\n")
+    except asyncio.LimitOverrunError as e:
+        raise RedisProtocolError("Reply line longer than the stream limit") from e
+    kind, payload = line[:1], line[1:-2]
+    if kind == b"+":
+        return payload
+    if kind == b"-":
+        raise RedisProtocolError(payload.decode(errors="replace"))
+    if kind == b":":
+        return _parse_integer(line, payload)
+    if kind == b"$":
+        length = _parse_integer(line, payload)
+        if length < 0:
+            return None
+        return (await reader.readexactly(length + 2))[:-2]
+    if kind == b"*":
+        length = _parse_integer(line, payload)
+        if length < 0:
+            return None
+        return [await _read_reply(reader) for _ in range(length)]
+    raise RedisProtocolError(f"Unexpected reply {line!r}")
+
+def _parse_integer(line: bytes, payload: bytes) -> int:
+    """Helper function that parses the integer of a reply line."""
+    try:
+        return int(payload)
+    except ValueError as e:
+        raise RedisProtocolError(f"Unexpected reply {line!r}") from e
+
+
+def _create_plant_list_cache() -> PlantListCache:
+    """Helper function that creates the backend selected by 'PLANT_CACHE_BACKEND'."""
+    if PLANT_CACHE_BACKEND == MemoryPlantListCache.name:
+        return MemoryPlantListCache(max_bytes=PLANT_CACHE_MAX_BYTES)
+    if PLANT_CACHE_BACKEND == RedisPlantListCache.name:
+        return RedisPlantListCache(url=PLANT_CACHE_REDIS_URL, ttl_seconds=PLANT_CACHE_TTL_SECONDS)
+    raise ValueError(f"Unknown PLANT_CACHE_BACKEND '{PLANT_CACHE_BACKEND}', expected 'memory' or 'redis'.")
+
+
+plant_list_cache = _create_plant_list_cache()
+"""Process-wide plant list cache shared by every PlantService instance."""
@@ -0,0 +1,206 @@
+"""In-process prefix indexes of each user's plant names, serving type-ahead suggestions without querying the plant table.
+
+Each user only gets suggestions from their own plants, as common names are free text the
+user typed. A user's index is tagged with the collection version it was built at and is
+rebuilt when the version moves on, so writes made by other processes are picked up."""
+
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from typing import Iterable
+
+from ...env import getenv
+
+AUTOCOMPLETE_DEFAULT_RESULTS = int(getenv("AUTOCOMPLETE_DEFAULT_RESULTS", "10"))
+AUTOCOMPLETE_MAX_RESULTS = int(getenv("AUTOCOMPLETE_MAX_RESULTS", "25"))
+PLANT_NAME_INDEX_CACHE_SIZE = int(getenv("PLANT_NAME_INDEX_CACHE_SIZE", "10000"))
+
+def _key(name: str) -> str:
+    """Helper function that normalizes a name or prefix for case-insensitive matching."""
+    return name.strip().casefold()
+
+class PlantNameIndex:
+    """
+    Sorted array of the distinct common and scientific names of one user's plants.
+
+    A prefix lookup is a binary search followed by a short forward scan, so it costs
+    microseconds regardless of how many names are indexed. Each name is reference counted
+    by the number of plants using it and is dropped once no plant does.
+    """
+
+    def __init__(self):
+        # Normalized names, kept sorted for binary search.
+        self._keys: list[str] = []
+        # Maps normalized name -> the name as first written.
+        self._names: dict[str, str] = {}
+        # Maps normalized name -> number of plants using it.
+        self._counts: dict[str, int] = {}
+
+    def load(self, names: Iterable[tuple[str, int]]) -> None:
+        """
+        Replace the contents of the index.
+
+        Args:
+            names: Pairs of a name and the number of plants using it.
+        """
+
+        self.clear()
+        for name, count in names:
+            key = _key(name)
+            if not key:
+                continue
+            self._names.setdefault(key, name.strip())
+            self._counts[key] = self._counts.get(key, 0) + count
+        self._keys = sorted(self._counts)
+
+    def add(self, *names: str) -> None:
+        """
+        Count one more plant using each of the given names.
+
+        Args:
+            names: The names of a plant that was written.
+        """
+
+        for name in names:
+            key = _key(name)
+            if not key:
+                continue
+            if key not in self._counts:
+                insort(self._keys, key)
+                self._names[key] = name.strip()
+                self._counts[key] = 0
+            self._counts[key] += 1
+
+    def remove(self, *names: str) -> None:
+        """
+        Count one less plant using each of the given names.
+
+        Args:
+            names: The names of a plant that was removed or renamed.
+        """
+
+        for name in names:
+            key = _key(name)
+            if key not in self._counts:
+                continue
+            self._counts[key] -= 1
+            if self._counts[key] <= 0:
+                del self._keys[bisect_left(self._keys, key)]
+                del self._names[key]
+                del self._counts[key]
+
+    def suggest(self, prefix: str, limit: int = AUTOCOMPLETE_DEFAULT_RESULTS) -> list[str]:
+        """
+        Find the names that start with a prefix, ignoring case.
+
+        Args:
+            prefix: The text typed so far.
+            limit: The maximum number of names to return, capped at 'AUTOCOMPLETE_MAX_RESULTS'.
+
+        Returns:
+            list[str]: The matching names in alphabetical order.
+        """
+
+        key = _key(prefix)
+        if not key:
+            return []
+
+        suggestions = []
+        index = bisect_left(self._keys, key)
+        limit = min(limit, AUTOCOMPLETE_MAX_RESULTS)
+        while index < len(self._keys) and len(suggestions) < limit and self._keys[index].startswith(key):
+            suggestions.append(self._names[self._keys[index]])
+            index += 1
+        return suggestions
+
+    def clear(self) -> None:
+        """Drop every indexed name."""
+        self._keys.clear()
+        self._names.clear()
+        self._counts.clear()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class PlantNameIndexCache:
+    """
+    Bounded LRU cache of the plant name index of each user, tagged with the version of the
+    user's plant collection it reflects.
+
+    A lookup only hits when the caller's current collection version matches. Writes made in
+    this process are applied to the cached index in place; a write made by another process
+    moves the version on, so the index is rebuilt on the next lookup.
+    """
+
+    def __init__(self, max_size: int):
+        self._max_size = max_size
+        # Maps username -> (version, index), ordered from least to most recently used.
+        self._entries: OrderedDict[str, tuple[int, PlantNameIndex]] = OrderedDict()
+
+    def get(self, owner_username: str, version: int) -> PlantNameIndex | None:
+        """
+        Retrieve the name index of a user.
+
+        Args:
+            owner_username: The username of the owner of the plants.
+            version: The current version of the user's plant collection.
+
+        Returns:
+            PlantNameIndex | None: The index, or None if it is not cached at this version.
+        """
+
+        entry = self._entries.get(owner_username)
+        if entry is None or entry[0] != version:
+            return None
+        self._entries.move_to_end(owner_username)
+        return entry[1]
+
+    def put(self, owner_username: str, version: int, index: PlantNameIndex) -> None:
+        """
+        Cache the name index of a user.
+
+        Args:
+            owner_username: The username of the owner of the plants.
+            version: The version of the user's plant collection the index was built at.
+            index: The index of the user's plant names.
+        """
+
+        if self._max_size <= 0:
+            return
+        self._entries[owner_username] = (version, index)
+        self._entries.move_to_end(owner_username)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def update(self, owner_username: str, version: int, removed_names: Iterable[str], added_names: Iterable[str]) -> None:
+        """
+        Apply a committed write to the cached name index of a user.
+
+        The write is applied only if the index is cached at the version just before it,
+        and the index is dropped otherwise, since it then misses some other write.
+
+        Args:
+            owner_username: The username of the owner of the plants.
+            version: The version of the user's plant collection the write committed.
+            removed_names: The names of the plants that were removed or renamed.
+            added_names: The names of the plants that were added or renamed.
+        """
+
+        entry = self._entries.get(owner_username)
+        if entry is None:
+            return
+        if entry[0] != version - 1:
+            del self._entries[owner_username]
+            return
+        index = entry[1]
+        index.remove(*removed_names)
+        index.add(*added_names)
+        self._entries[owner_username] = (version, index)
+
+    def clear(self) -> None:
+        """Drop every cached index."""
+        self._entries.clear()
+
+
+plant_name_indexes = PlantNameIndexCache(max_size=PLANT_NAME_INDEX_CACHE_SIZE)
+"""Process-wide cache of the plant name index of each user, shared by every PlantService instance."""
@@ -1,22 +1,157 @@
 """Plant service used by the plant api to perform actions on the plant table in the db."""
 
-from sqlalchemy.orm import Session
-from sqlalchemy import select
+import base64
+import binascii
+from typing import AsyncIterator, Iterable, Sequence
+
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, update, delete, any_, func, or_, and_, union_all
+from sqlalchemy.orm import aliased
+from sqlalchemy.dialects.postgresql import insert as pg_insert, TSVECTOR
 from fastapi import Depends
 from ...database import db_session
+from ...serialization import dumps
+from ...compression import compress, COMPRESSION_MIN_SIZE
 
-from ...models.Folium.plant import Plant
+from ...models.Folium.plant import Plant, PlantPatch, PlantPage, PlantBulkError, PlantBulkResult
+from ...models.Folium.species import Species, SPECIES_FIELDS
 from ...entities.Folium.plant_entity import PlantEntity
-from .exceptions import PlantBlankIdException, PlantNotFoundException, PlantOwnerUsernameInvalidException
+from ...entities.Folium.species_entity import SpeciesEntity
+from ...entities.Folium.plant_collection_version_entity import PlantCollectionVersionEntity
+from .plant_list_cache import plant_list_cache
+from .plant_name_index import PlantNameIndex, plant_name_indexes, AUTOCOMPLETE_DEFAULT_RESULTS
+from .species_service import SpeciesService
+from .exceptions import (PlantBlankIdException,
+                         PlantNotFoundException,
+                         PlantOwnerUsernameInvalidException,
+                         PlantInvalidCursorException,
+                         PlantBulkLimitExceededException,
+                         PlantInvalidFieldsException)
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+# Number of rows fetched from the server-side cursor at a time when streaming plants.
+STREAM_BATCH_SIZE = 500
+# Text search configuration used to build 'PlantEntity.search_vector'.
+SEARCH_CONFIG = "english"
+# Maximum number of plants a single bulk request may write.
+MAX_BULK_SIZE = 1000
+
+def _encode_cursor(plant_id: int) -> str:
+    """Helper function that encodes the id of the last plant on a page as an opaque cursor."""
+    return base64.urlsafe_b64encode(str(plant_id).encode()).decode()
+
+def _decode_cursor(cursor: str) -> int:
+    """Helper function that decodes a cursor produced by '_encode_cursor' back into a plant id."""
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise PlantInvalidCursorException()
+
+def _encode_search_cursor(rank: float, plant_id: int) -> str:
+    """Helper function that encodes the rank and id of the last search result on a page as an opaque cursor."""
+    return base64.urlsafe_b64encode(f"{rank!r}:{plant_id}".encode()).decode()
+
+def _decode_search_cursor(cursor: str) -> tuple[float, int]:
+    """Helper function that decodes a cursor produced by '_encode_search_cursor' back into a rank and plant id."""
+    try:
+        rank, plant_id = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        return float(rank), int(plant_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise PlantInvalidCursorException()
+
+# Plant columns selected by the read-only listing queries, in the order '_row_to_model' unpacks them.
+_PLANT_COLUMNS = tuple(PlantEntity.__table__.c[name] for name in (
+    "id", "common_name", "species_id", "watering_period", "watering_interval", "description",
+    "owner_username", "last_watering", "next_watering_due",
+))
+
+def _row_to_model(row: Sequence, species: Species) -> Plant:
+    """Helper function that maps a row of '_PLANT_COLUMNS' and its species to a plant model, without building an entity."""
+    plant_id, common_name, _, watering_period, watering_interval, description, owner_username, last_watering, next_watering_due = row
+    return Plant.model_construct(
+        id=plant_id,
+        common_name=common_name,
+        scientific_name=species.scientific_name,
+        type=species.type,
+        cycle=species.cycle,
+        watering=species.watering,
+        watering_period=watering_period,
+        watering_interval=watering_interval,
+        sunlight=species.sunlight,
+        pet_poison=species.pet_poison,
+        human_poison=species.human_poison,
+        description=description,
+        image_url=species.image_url,
+        owner_username=owner_username,
+        last_watering=last_watering,
+        next_watering_due=next_watering_due,
+    )
+
+# Plant fields stored in plant columns, by name. The other fields are read from the plant's species.
+_PLANT_FIELD_COLUMNS = {column.name: column for column in _PLANT_COLUMNS if column.name != "species_id"}
+
+def parse_fields(fields: str) -> tuple[str, ...]:
+    """
+    Parse a comma separated list of plant fields into a projection.
+
+    Args:
+        fields: The names of the fields to project the plants onto, such as "common_name,image_url".
+
+    Returns:
+        tuple[str, ...]: The field names in the order of the plant model, always including 'id'.
+
+    Raises:
+        PlantInvalidFieldsException: If a name is not a plant field.
+    """
+
+    names = {name.strip() for name in fields.split(",")} - {""}
+    unknown = names - Plant.model_fields.keys()
+    if unknown:
+        raise PlantInvalidFieldsException(fields=sorted(unknown))
+
+    names.add("id")
+    return tuple(name for name in Plant.model_fields if name in names)
+
+def _projection_columns(fields: Sequence[str]) -> list:
+    """Helper function that selects the plant columns of a projection, followed by 'species_id' if it needs the species."""
+    columns = [_PLANT_FIELD_COLUMNS[name] for name in fields if name in _PLANT_FIELD_COLUMNS]
+    if not SPECIES_FIELDS.isdisjoint(fields):
+        columns.append(PlantEntity.__table__.c.species_id)
+    return columns
+
+def _list_variant(fields: Sequence[str] | None) -> str:
+    """Helper function that names the plant list cache variant of a projection."""
+    return ",".join(fields) if fields is not None else ""
+
+def _names(plant: Plant) -> tuple[str, str]:
+    """Helper function that returns the names of a plant indexed for autocomplete."""
+    return plant.common_name, plant.scientific_name
+
+def _check_bulk_size(items: list) -> None:
+    """Helper function that rejects bulk requests larger than 'MAX_BULK_SIZE'."""
+    if len(items) > MAX_BULK_SIZE:
+        raise PlantBulkLimitExceededException(limit=MAX_BULK_SIZE)
+
+def _plant_values(plant: Plant) -> dict:
+    """Helper function that maps a plant model to the plant column values written for it, besides 'species_id'."""
+    return plant.model_dump(exclude={"id", "next_watering_due", *SPECIES_FIELDS})
+
+def _species(plant: Plant) -> Species:
+    """Helper function that extracts the care data of a plant that is stored in the species table."""
+    return Species(**plant.model_dump(include=SPECIES_FIELDS))
 
 class PlantService:
     """Plant service to perform actions on the plant table."""
 
     def __init__(self,
-                 session: Session = Depends(db_session)):
+                 session: AsyncSession = Depends(db_session)):
         self._session = session
+        self._species_service = SpeciesService(session=session)
         
-    def __find_plant_entity(self, plant_id: int, owner_username: str) -> PlantEntity:
+    async def __find_plant_entity(self, plant_id: int, owner_username: str) -> PlantEntity:
         """
         Helper method that either retrieves a plant from the database or raises an exception.
         
@@ -38,7 +173,7 @@ class PlantService:
 
         # Query the database to find the plant to be deleted.
         query = select(PlantEntity).where(PlantEntity.id == plant_id)
-        plant_entity: PlantEntity | None = self._session.scalar(query)
+        plant_entity: PlantEntity | None = await self._session.scalar(query)
 
         # If not plant found, raise error. 
         if plant_entity == None or plant_entity.owner_username != owner_username:
@@ -46,30 +181,442 @@ class PlantService:
         else:
             return plant_entity
 
-    def get_all_user_plants(self, owner_username: str) -> list[Plant]:
+    async def _bump_collection_version(self, owner_username: str) -> int:
+        """
+        Helper method that increments the version of a user's plant collection.
+
+        Must be called in the same transaction as every write to the user's plants,
+        before it is committed.
+        
+        Args:
+            owner_username: The username of the owner of the collection.
+
+        Returns:
+            int: The new version of the collection.
+        """
+
+        query = pg_insert(PlantCollectionVersionEntity).values(owner_username=owner_username, version=1)
+        query = query.on_conflict_do_update(
+            index_elements=[PlantCollectionVersionEntity.owner_username],
+            set_={"version": PlantCollectionVersionEntity.version + 1},
+        ).returning(PlantCollectionVersionEntity.version)
+        return await self._session.scalar(query)
+
+    async def _commit_collection_write(self,
+                                       owner_username: str,
+                                       removed_names: Iterable[str] = (),
+                                       added_names: Iterable[str] = (),
+                                       released_species_ids: Iterable[int] = ()) -> None:
+        """
+        Helper method that commits a write to a user's plants and updates the state derived from them.
+
+        Deletes the species rows the write left unreferenced and bumps the collection version
+        in the same transaction as the write, then, once it is committed, updates the species
+        cache, invalidates the user's cached plant list and updates the user's plant name index.
+        
+        Args:
+            owner_username: The username of the owner of the plants.
+            removed_names: The names of the plants that were removed or renamed.
+            added_names: The names of the plants that were added or renamed.
+            released_species_ids: The ids of the species that removed or updated plants no longer reference.
+        """
+
+        await self._species_service.delete_unreferenced(released_species_ids)
+        version = await self._bump_collection_version(owner_username=owner_username)
+        await self._session.commit()
+        self._species_service.cache_committed()
+        await plant_list_cache.invalidate(owner_username)
+        plant_name_indexes.update(owner_username, version, removed_names=removed_names, added_names=added_names)
+
+    async def _to_models(self, plant_entities: Iterable[PlantEntity]) -> list[Plant]:
+        """
+        Helper method that converts plant entities to models, merging in their species.
+
+        Species are read through the species cache, so only species that are not cached are read from the database.
+        
+        Args:
+            plant_entities: The plant entities to convert.
+
+        Returns:
+            list[Plant]: The model representations of the plants, in the same order.
+        """
+
+        plant_entities = list(plant_entities)
+        species = await self._species_service.get_species(entity.species_id for entity in plant_entities)
+        return [entity.to_model(species[entity.species_id]) for entity in plant_entities]
+
+    async def _rows_to_models(self, rows: Sequence[Sequence]) -> list[Plant]:
+        """
+        Helper method that maps rows of '_PLANT_COLUMNS' to plant models, merging in their species.
+
+        Used by the read-only listings, which select columns with Core instead of loading entities,
+        so no ORM object is built or registered in the session's identity map.
+        
+        Args:
+            rows: The rows to map.
+
+        Returns:
+            list[Plant]: The model representations of the plants, in the same order.
+        """
+
+        species = await self._species_service.get_species(row[2] for row in rows)
+        return [_row_to_model(row, species[row[2]]) for row in rows]
+
+    async def _rows_to_projections(self, rows: Sequence[Sequence], fields: Sequence[str]) -> list[dict]:
+        """
+        Helper method that maps rows of '_projection_columns' to dictionaries holding the projected fields.
+
+        Species are only looked up when the projection includes one of their fields.
+        
+        Args:
+            rows: The rows to map.
+            fields: The projection the rows were selected for, as returned by 'parse_fields'.
+
+        Returns:
+            list[dict]: The projected fields of each plant, in the same order.
+        """
+
+        plant_fields = [name for name in fields if name in _PLANT_FIELD_COLUMNS]
+        species_fields = [name for name in fields if name in SPECIES_FIELDS]
+        if not species_fields:
+            return [dict(zip(plant_fields, row)) for row in rows]
+
+        species = await self._species_service.get_species(row[-1] for row in rows)
+        projections = []
+        for row in rows:
+            values = dict(zip(plant_fields, row))
+            plant_species = species[row[-1]]
+            for name in species_fields:
+                values[name] = getattr(plant_species, name)
+            projections.append({name: values[name] for name in fields})
+        return projections
+
+    async def _plant_rows(self, plants: list[Plant]) -> list[dict]:
+        """
+        Helper method that maps plant models to the plant column values written for them.
+
+        The species of every plant is looked up, or inserted if it does not exist yet, to fill in 'species_id'.
+        
+        Args:
+            plants: The plants to write.
+
+        Returns:
+            list[dict]: The column values of each plant, in the same order.
+        """
+
+        species_ids = await self._species_service.get_species_ids([_species(plant) for plant in plants])
+        return [{**_plant_values(plant), "species_id": species_id} for plant, species_id in zip(plants, species_ids)]
+
+    async def __update_plant_entity(self, plant_id: int, values: dict, owner_username: str) -> Plant:
+        """
+        Helper method that writes column values to one of the caller's plants with a single UPDATE ... RETURNING.
+
+        Args:
+            plant_id: The id of the plant to update.
+            values: The plant column values to write.
+            owner_username: The username of the calling user.
+
+        Returns:
+            Plant: The model representation of the plant after the update.
+
+        Raises:
+            PlantNotFoundException: If the plant is not found in the database or belongs to another user.
+        """
+
+        # Joining the row to itself returns its names from before the update, for the name index.
+        previous = aliased(PlantEntity, name="previous")
+        query = (update(PlantEntity)
+                 .where(PlantEntity.id == plant_id)
+                 .where(PlantEntity.owner_username == owner_username)
+                 .where(previous.id == PlantEntity.id)
+                 .values(**values)
+                 .returning(PlantEntity, previous.common_name, previous.species_id))
+        row = (await self._session.execute(query)).one_or_none()
+        if row is None:
+            raise PlantNotFoundException()
+        plant_entity, previous_common_name, previous_species_id = row
+        species = await self._species_service.get_species([plant_entity.species_id, previous_species_id])
+        plant = plant_entity.to_model(species[plant_entity.species_id])
+        await self._commit_collection_write(owner_username=owner_username,
+                                            removed_names=(previous_common_name, species[previous_species_id].scientific_name),
+                                            added_names=_names(plant),
+                                            released_species_ids={previous_species_id} - {plant_entity.species_id})
+
+        return plant
+
+    async def suggest_plant_names(self, owner_username: str, prefix: str, limit: int = AUTOCOMPLETE_DEFAULT_RESULTS) -> list[str]:
+        """
+        Suggest the common and scientific names of a user's plants that start with a prefix.
+
+        Suggestions are served from the user's cached plant name index. The index is built
+        from the user's plants when it is not cached at the current collection version.
+
+        Args:
+            owner_username: The username of the owner of the plants.
+            prefix: The text typed so far. Matching ignores case.
+            limit: The maximum number of names to return.
+
+        Returns:
+            list[str]: The matching names in alphabetical order.
+        """
+
+        version = await self.get_collection_version(owner_username=owner_username)
+        index = plant_name_indexes.get(owner_username, version)
+        if index is None:
+            scientific_names = (select(SpeciesEntity.scientific_name.label("name"))
+                                .join(PlantEntity, PlantEntity.species_id == SpeciesEntity.id)
+                                .where(PlantEntity.owner_username == owner_username))
+            common_names = select(PlantEntity.common_name.label("name")).where(PlantEntity.owner_username == owner_username)
+            names = union_all(common_names, scientific_names).subquery()
+            query = select(names.c.name, func.count()).where(names.c.name != "").group_by(names.c.name)
+            index = PlantNameIndex()
+            index.load((await self._session.execute(query)).tuples())
+            # A write committed while the names were read would be counted twice once applied, so the index is only cached if there was none.
+            if await self.get_collection_version(owner_username=owner_username) == version:
+                plant_name_indexes.put(owner_username, version, index)
+
+        return index.suggest(prefix=prefix, limit=limit)
+
+    async def get_collection_version(self, owner_username: str) -> int:
+        """
+        Retrieve the version of a user's plant collection without reading the plant table.
+        
+        Args:
+            owner_username: The username of the owner of the collection.
+            
+        Returns:
+            int: The version of the collection, which changes whenever one of the user's plants is written.
+        """
+
+        query = select(PlantCollectionVersionEntity.version).where(PlantCollectionVersionEntity.owner_username == owner_username)
+        version: int | None = await self._session.scalar(query)
+        return version or 0
+
+    async def get_all_user_plants(self, owner_username: str, fields: Sequence[str] | None = None) -> list[Plant] | list[dict]:
         """
         Retrieve all plants for a given user from the database.
         
         Args:
             key: The key for the user.
+            fields: A projection returned by 'parse_fields', to only select those fields, or None for whole plants.
             
         Returns:
-            list[Plant]: The list of the users plant objects.
+            list[Plant] | list[dict]: The list of the users plant objects, or of their projected fields if 'fields' is given.
         """
 
-        # Create list of plants and query db to retrieve entities.
-        plants: list[Plant] = []
-        plant_entities = self._session.query(PlantEntity).where(PlantEntity.owner_username == owner_username)
+        if fields is not None:
+            # Only the projected columns are selected, so unused species data is never read or sent.
+            query = select(*_projection_columns(fields)).where(PlantEntity.owner_username == owner_username).order_by(PlantEntity.id)
+            return await self._rows_to_projections((await self._session.execute(query)).all(), fields)
 
-        # Loop through retrieved entities and convert to plant models.
-        for entity in plant_entities:
-            plant = entity.to_model()
-            plants.append(plant)
+        # Query db for the plant columns, then merge in their species to convert the rows to plant models.
+        query = select(*_PLANT_COLUMNS).where(PlantEntity.owner_username == owner_username).order_by(PlantEntity.id)
+        rows = (await self._session.execute(query)).all()
 
         # Return the list of plants for the user with the provided key.
-        return plants
+        return await self._rows_to_models(rows)
+
+    async def get_all_user_plants_json(self, owner_username: str, version: int, fields: Sequence[str] | None = None) -> bytes:
+        """
+        Retrieve all plants for a given user as a serialized JSON array, through the plant list cache.
+
+        Cache hits skip both the database and serialization. Entries are tagged with the
+        collection version, so a list cached before a write is never served after it.
+        Each projection is cached as its own variant of the user's list.
+        
+        Args:
+            owner_username: The username of the user to retrieve plants for.
+            version: The current version of the user's collection, as returned by 'get_collection_version'.
+            fields: A projection returned by 'parse_fields', or None for whole plants.
+            
+        Returns:
+            bytes: The JSON array of the user's plants.
+        """
+
+        variant = _list_variant(fields)
+        body = await plant_list_cache.get(owner_username, version, variant)
+        if body is None:
+            plants = await self.get_all_user_plants(owner_username=owner_username, fields=fields)
+            body = dumps(plants)
+            await plant_list_cache.put(owner_username, version, body, variant)
+
+        return body
+
+    async def get_all_user_plants_json_compressed(self,
+                                                  owner_username: str,
+                                                  version: int,
+                                                  fields: Sequence[str] | None = None,
+                                                  encoding: str | None = None) -> tuple[bytes, str | None]:
+        """
+        Retrieve all plants for a given user as a compressed JSON array, through the plant list cache.
+
+        The compressed body is cached as its own variant of the user's list, so cache hits
+        are not compressed again. Lists smaller than 'COMPRESSION_MIN_SIZE' are not compressed.
+        
+        Args:
+            owner_username: The username of the user to retrieve plants for.
+            version: The current version of the user's collection, as returned by 'get_collection_version'.
+            fields: A projection returned by 'parse_fields', or None for whole plants.
+            encoding: The content coding returned by 'negotiate_encoding', or None to not compress the list.
+            
+        Returns:
+            tuple[bytes, str | None]: The JSON array of the user's plants, and the coding it was compressed with, if any.
+        """
+
+        if encoding is None:
+            return await self.get_all_user_plants_json(owner_username=owner_username, version=version, fields=fields), None
+
+        variant = f"{_list_variant(fields)};{encoding}"
+        body = await plant_list_cache.get(owner_username, version, variant)
+        if body is not None:
+            return body, encoding
+
+        body = await self.get_all_user_plants_json(owner_username=owner_username, version=version, fields=fields)
+        if len(body) < COMPRESSION_MIN_SIZE:
+            return body, None
+
+        body = compress(body, encoding)
+        await plant_list_cache.put(owner_username, version, body, variant)
+        return body, encoding
+
+    async def get_user_plants_page(self, owner_username: str, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None) -> PlantPage:
+        """
+        Retrieve one page of a user's plants, ordered by id.
+
+        Pages are fetched with a keyset condition on (owner_username, id), so each page is
+        a bounded range scan of the plant index no matter how deep into the collection it is.
+        
+        Args:
+            owner_username: The username of the user to retrieve plants for.
+            limit: The maximum number of plants on the page.
+            cursor: The 'next_cursor' of the previous page, or None for the first page.
+            
+        Returns:
+            PlantPage: The plants on the page and the cursor for the following page.
 
-    def create_plant(self, plant: Plant, owner_username: str) -> Plant:
+        Raises:
+            PlantInvalidCursorException: If the cursor was not issued by this service.
+        """
+
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        query = select(*_PLANT_COLUMNS).where(PlantEntity.owner_username == owner_username)
+        if cursor is not None:
+            query = query.where(PlantEntity.id > _decode_cursor(cursor))
+
+        # Fetch one extra row to find out whether there is a following page.
+        query = query.order_by(PlantEntity.id).limit(limit + 1)
+        rows = (await self._session.execute(query)).all()
+
+        plants = await self._rows_to_models(rows[:limit])
+        next_cursor = _encode_cursor(plants[-1].id) if len(rows) > limit else None
+
+        return PlantPage(plants=plants, next_cursor=next_cursor)
+
+    async def get_due_plants(self, owner_username: str, due_by: datetime | None = None, limit: int = DEFAULT_PAGE_SIZE) -> list[Plant]:
+        """
+        Retrieve a user's plants that are due for watering, most overdue first.
+
+        Served by a range scan of the (owner_username, next_watering_due) index. Plants that
+        have never been watered or have no watering interval are never due.
+        
+        Args:
+            owner_username: The username of the user to retrieve plants for.
+            due_by: Plants due at or before this time are returned. Defaults to the current time.
+            limit: The maximum number of plants to return.
+            
+        Returns:
+            list[Plant]: The plants that are due for watering.
+        """
+
+        query = (select(*_PLANT_COLUMNS)
+                 .where(PlantEntity.owner_username == owner_username)
+                 .where(PlantEntity.next_watering_due <= (due_by if due_by is not None else func.now()))
+                 .order_by(PlantEntity.next_watering_due)
+                 .limit(max(1, min(limit, MAX_PAGE_SIZE))))
+        rows = (await self._session.execute(query)).all()
+
+        return await self._rows_to_models(rows)
+
+    async def search_user_plants(self, owner_username: str, query: str, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None) -> PlantPage:
+        """
+        Search a user's plants by name and description, best matches first.
+
+        A plant matches when the query matches the search vector of its common name and
+        description or the search vector of its species, so each match is served by the
+        GIN index of its table. Matches are ranked over both vectors combined, with names
+        weighted above the description. Pages are fetched with a keyset condition on
+        (rank, id), so paging stays stable and cheap however deep it goes.
+        
+        Args:
+            owner_username: The username of the user to search the plants of.
+            query: The search terms, in web search syntax ("quoted phrases", or, -excluded).
+            limit: The maximum number of plants on the page.
+            cursor: The 'next_cursor' of the previous page, or None for the first page.
+            
+        Returns:
+            PlantPage: The matching plants on the page and the cursor for the following page.
+
+        Raises:
+            PlantInvalidCursorException: If the cursor was not issued by this service.
+        """
+
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        document = PlantEntity.search_vector.op("||", return_type=TSVECTOR)(SpeciesEntity.search_vector)
+        rank = func.ts_rank_cd(document, ts_query)
+        matching_species = select(SpeciesEntity.id).where(SpeciesEntity.search_vector.bool_op("@@")(ts_query))
+
+        search = (select(*_PLANT_COLUMNS, rank)
+                  .join(SpeciesEntity, SpeciesEntity.id == PlantEntity.species_id)
+                  .where(PlantEntity.owner_username == owner_username)
+                  .where(or_(PlantEntity.search_vector.bool_op("@@")(ts_query),
+                             PlantEntity.species_id.in_(matching_species))))
+        if cursor is not None:
+            last_rank, last_id = _decode_search_cursor(cursor)
+            search = search.where(or_(rank < last_rank, and_(rank == last_rank, PlantEntity.id > last_id)))
+
+        # Fetch one extra row to find out whether there is a following page.
+        search = search.order_by(rank.desc(), PlantEntity.id).limit(limit + 1)
+        rows = (await self._session.execute(search)).all()
+
+        plants = await self._rows_to_models([row[:-1] for row in rows[:limit]])
+        next_cursor = None
+        if len(rows) > limit:
+            last_rank = rows[limit - 1][-1]
+            next_cursor = _encode_search_cursor(last_rank, plants[-1].id)
+
+        return PlantPage(plants=plants, next_cursor=next_cursor)
+
+    async def stream_user_plants(self, owner_username: str, fields: Sequence[str] | None = None) -> AsyncIterator[Plant | dict]:
+        """
+        Stream all plants for a given user from the database, ordered by id.
+
+        Rows are read through a server-side cursor in batches of 'STREAM_BATCH_SIZE',
+        so memory use stays constant no matter how many plants the user owns. The species
+        of each batch are merged in before it is yielded.
+        
+        Args:
+            owner_username: The username of the user to retrieve plants for.
+            fields: A projection returned by 'parse_fields', to only select those fields, or None for whole plants.
+            
+        Returns:
+            AsyncIterator[Plant | dict]: The user's plants, or their projected fields if 'fields' is given,
+                yielded as they are read from the database.
+        """
+
+        columns = _PLANT_COLUMNS if fields is None else _projection_columns(fields)
+        query = (select(*columns)
+                 .where(PlantEntity.owner_username == owner_username)
+                 .order_by(PlantEntity.id)
+                 .execution_options(yield_per=STREAM_BATCH_SIZE))
+        rows = await self._session.stream(query)
+
+        async for batch in rows.partitions():
+            plants = await self._rows_to_models(batch) if fields is None else await self._rows_to_projections(batch, fields)
+            for plant in plants:
+                yield plant
+
+    async def create_plant(self, plant: Plant, owner_username: str) -> Plant:
         """
         Add a new plant to the database.
         
@@ -86,45 +633,56 @@ class PlantService:
             raise PlantOwnerUsernameInvalidException()
         
         plant.id = None
-        plant_entity = PlantEntity.from_model(plant=plant)
+        species = _species(plant)
+        species_id, = await self._species_service.get_species_ids([species])
+        plant_entity = PlantEntity.from_model(plant=plant, species_id=species_id)
         self._session.add(plant_entity)
-        self._session.commit()
+        await self._commit_collection_write(owner_username=owner_username, added_names=_names(plant))
 
-        return plant_entity.to_model()
+        return plant_entity.to_model(species)
 
-    def remove_plant(self, plant: Plant, owner_username: str) -> Plant:
+    async def remove_plant(self, plant_id: int, owner_username: str) -> Plant:
         """
         Removes a plant from the database.
+
+        The plant is deleted with a single DELETE ... RETURNING that is scoped to the caller's plants.
         
         Args: 
-            plant: The plant to remove from the database.
+            plant_id: The id of the plant to remove from the database.
+            owner_username: The username of the calling user.
             
         Returns:
             Plant: The plant that was successfully removed from the database.
 
         Raises:
-            PlantNotFoundException: If the plant with the given id is not found in the database.
+            PlantNotFoundException: If the plant is not found in the database or belongs to another user.
             PlantBlankIdException: If the plants ID is blank.
-            PlantOwnerUsernameInvalidException: If the plants 'ownerusername' does not match that of the caller.
         """
-        if plant.owner_username != owner_username:
-            raise PlantOwnerUsernameInvalidException()
-        
-        # Query the database to find the plant to be deleted.
-        plant_entity = self.__find_plant_entity(plant_id=plant.id, owner_username=plant.owner_username)
-        
-        # Delete plant from database and return. 
-        self._session.delete(plant_entity)
-        self._session.commit()
+        if not plant_id:
+            raise PlantBlankIdException()
+
+        query = (delete(PlantEntity)
+                 .where(PlantEntity.id == plant_id)
+                 .where(PlantEntity.owner_username == owner_username)
+                 .returning(PlantEntity))
+        plant_entity: PlantEntity | None = await self._session.scalar(query)
+        if plant_entity is None:
+            raise PlantNotFoundException()
+        plant, = await self._to_models([plant_entity])
+        await self._commit_collection_write(owner_username=owner_username, removed_names=_names(plant),
+                                            released_species_ids=(plant_entity.species_id,))
 
-        return plant_entity.to_model()
+        return plant
 
-    def update_Plant(self, plant: Plant, owner_username: str) -> Plant:
+    async def update_Plant(self, plant: Plant, owner_username: str) -> Plant:
         """
         Updates a plant in the database.
+
+        The plant is written with a single UPDATE ... RETURNING that is scoped to the caller's plants.
         
         Args:
             plant: The updated version of the plant.
+            owner_username: The username of the calling user.
             
         Returns:
             Plant: The model representation of the plant that was updated in the database.
@@ -136,12 +694,184 @@ class PlantService:
         """
         if plant.owner_username != owner_username:
             raise PlantOwnerUsernameInvalidException()
+        if not plant.id:
+            raise PlantBlankIdException()
 
-        # Query the database to find the plant to be deleted.
-        plant_entity = self.__find_plant_entity(plant_id=plant.id, owner_username=plant.owner_username)
+        values, = await self._plant_rows([plant])
+        return await self.__update_plant_entity(plant_id=plant.id, values=values, owner_username=owner_username)
+
+    async def patch_plant(self, plant_id: int, patch: PlantPatch, owner_username: str) -> Plant:
+        """
+        Partially updates a plant in the database.
+
+        Only the fields set on the patch are written, in a single UPDATE ... RETURNING
+        that is scoped to the caller's plants. When the patch changes care data held by
+        the plant's species, the plant is first locked and pointed at the species with
+        the patched values.
         
-        # Update the plant entity and commit the changes.
-        plant_entity.update(plant=plant)
-        self._session.commit()
+        Args:
+            plant_id: The id of the plant to update.
+            patch: The properties of the plant to change.
+            owner_username: The username of the calling user.
+            
+        Returns:
+            Plant: The model representation of the plant after the update.
+
+        Raises:
+            PlantNotFoundException: If the plant is not found in the database or belongs to another user.
+            PlantBlankIdException: If the plant ID is blank.
+        """
+        if not plant_id:
+            raise PlantBlankIdException()
+
+        changes = patch.model_dump(exclude_unset=True)
+        if not changes:
+            plant_entity = await self.__find_plant_entity(plant_id=plant_id, owner_username=owner_username)
+            plant, = await self._to_models([plant_entity])
+            return plant
+
+        species_changes = {field: changes.pop(field) for field in SPECIES_FIELDS & changes.keys()}
+        if species_changes:
+            query = (select(PlantEntity.species_id)
+                     .where(PlantEntity.id == plant_id)
+                     .where(PlantEntity.owner_username == owner_username)
+                     .with_for_update())
+            species_id: int | None = await self._session.scalar(query)
+            if species_id is None:
+                raise PlantNotFoundException()
+            species = (await self._species_service.get_species([species_id]))[species_id]
+            changes["species_id"], = await self._species_service.get_species_ids([species.model_copy(update=species_changes)])
+
+        return await self.__update_plant_entity(plant_id=plant_id, values=changes, owner_username=owner_username)
+
+    async def bulk_create_plants(self, plants: list[Plant], owner_username: str) -> PlantBulkResult:
+        """
+        Add many plants to the database in a single multi-row INSERT.
+
+        Plants that do not belong to the caller are skipped and reported in the result's errors.
+        
+        Args:
+            plants: The plants to add to the database.
+            owner_username: The username of the calling user.
+            
+        Returns:
+            PlantBulkResult: The plants that were added, in request order, and the items that were skipped.
+
+        Raises:
+            PlantBulkLimitExceededException: If more than 'MAX_BULK_SIZE' plants are passed.
+        """
+        _check_bulk_size(plants)
+
+        errors: list[PlantBulkError] = []
+        accepted: list[Plant] = []
+        for index, plant in enumerate(plants):
+            if plant.owner_username != owner_username:
+                errors.append(PlantBulkError(index=index, detail=str(PlantOwnerUsernameInvalidException())))
+            else:
+                accepted.append(plant)
+
+        created: list[Plant] = []
+        if accepted:
+            query = insert(PlantEntity).returning(PlantEntity, sort_by_parameter_order=True)
+            plant_entities = await self._session.scalars(query, await self._plant_rows(accepted))
+            created = await self._to_models(plant_entities)
+            await self._commit_collection_write(owner_username=owner_username,
+                                                added_names=[name for plant in created for name in _names(plant)])
+
+        return PlantBulkResult(plants=created, errors=errors)
+
+    async def bulk_update_plants(self, plants: list[Plant], owner_username: str) -> PlantBulkResult:
+        """
+        Update many plants in the database with a single executemany UPDATE.
+
+        Ownership of every plant is checked with one query up front, which locks the rows so they
+        cannot be deleted before they are updated. Plants without an id, that do not belong to the
+        caller or that do not exist are skipped and reported in the result's errors.
+        
+        Args:
+            plants: The updated versions of the plants.
+            owner_username: The username of the calling user.
+            
+        Returns:
+            PlantBulkResult: The plants that were updated, in request order, and the items that were skipped.
+
+        Raises:
+            PlantBulkLimitExceededException: If more than 'MAX_BULK_SIZE' plants are passed.
+        """
+        _check_bulk_size(plants)
+
+        query = (select(PlantEntity.id, PlantEntity.common_name, PlantEntity.species_id)
+                 .where(PlantEntity.id == any_([plant.id for plant in plants if plant.id]))
+                 .where(PlantEntity.owner_username == owner_username)
+                 # Rows are locked in id order, so concurrent bulk updates cannot deadlock on each other.
+                 .order_by(PlantEntity.id)
+                 .with_for_update())
+        previous = {plant_id: (common_name, species_id) for plant_id, common_name, species_id in await self._session.execute(query)}
+
+        errors: list[PlantBulkError] = []
+        updated: list[Plant] = []
+        for index, plant in enumerate(plants):
+            if not plant.id:
+                errors.append(PlantBulkError(index=index, detail=str(PlantBlankIdException())))
+            elif plant.owner_username != owner_username:
+                errors.append(PlantBulkError(index=index, detail=str(PlantOwnerUsernameInvalidException())))
+            elif plant.id not in previous:
+                errors.append(PlantBulkError(index=index, detail=str(PlantNotFoundException())))
+            else:
+                updated.append(plant)
+
+        if updated:
+            # An UPDATE with a list of parameter sets is sent as a single executemany by primary key.
+            rows = [{"id": plant.id, **values} for plant, values in zip(updated, await self._plant_rows(updated))]
+            await self._session.execute(update(PlantEntity), rows)
+            # Re-read the rows so columns computed by the database are returned up to date.
+            query = (select(PlantEntity)
+                     .where(PlantEntity.id == any_([plant.id for plant in updated]))
+                     .execution_options(populate_existing=True))
+            plants_by_id = {plant.id: plant for plant in await self._to_models(await self._session.scalars(query))}
+            updated = [plants_by_id[plant.id] for plant in updated]
+            previous_species = await self._species_service.get_species(previous[plant_id][1] for plant_id in plants_by_id)
+            await self._commit_collection_write(
+                owner_username=owner_username,
+                removed_names=[name for plant_id in plants_by_id
+                               for name in (previous[plant_id][0], previous_species[previous[plant_id][1]].scientific_name)],
+                added_names=[name for plant in plants_by_id.values() for name in _names(plant)],
+                released_species_ids={previous[plant_id][1] for plant_id in plants_by_id} - {row["species_id"] for row in rows},
+            )
+
+        return PlantBulkResult(plants=updated, errors=errors)
+
+    async def bulk_remove_plants(self, plant_ids: list[int], owner_username: str) -> PlantBulkResult:
+        """
+        Remove many plants from the database with a single DELETE.
+        
+        Ids that do not match a plant owned by the caller are skipped and reported in the result's errors.
+
+        Args:
+            plant_ids: The ids of the plants to remove from the database.
+            owner_username: The username of the calling user.
+            
+        Returns:
+            PlantBulkResult: The plants that were removed, and the items that were skipped.
+
+        Raises:
+            PlantBulkLimitExceededException: If more than 'MAX_BULK_SIZE' ids are passed.
+        """
+        _check_bulk_size(plant_ids)
+
+        query = (delete(PlantEntity)
+                 .where(PlantEntity.id == any_(plant_ids))
+                 .where(PlantEntity.owner_username == owner_username)
+                 .returning(PlantEntity))
+        plant_entities = list(await self._session.scalars(query))
+        removed = await self._to_models(plant_entities)
+        if removed:
+            await self._commit_collection_write(owner_username=owner_username,
+                                                removed_names=[name for plant in removed for name in _names(plant)],
+                                                released_species_ids={entity.species_id for entity in plant_entities})
+
+        removed_ids = {plant.id for plant in removed}
+        errors = [PlantBulkError(index=index, detail=str(PlantNotFoundException()))
+                  for index, plant_id in enumerate(plant_ids) if plant_id not in removed_ids]
 
-        return plant_entity.to_model()
+        return PlantBulkResult(plants=removed, errors=errors)
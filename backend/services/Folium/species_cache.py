@@ -0,0 +1,130 @@
+"""In-process cache of species rows, keyed by id and by the digest of their values."""
+
+from collections import OrderedDict
+
+from ...env import getenv
+from ...models.Folium.species import Species
+from ...models.health import CacheStats
+
+SPECIES_CACHE_SIZE = int(getenv("SPECIES_CACHE_SIZE", "10000"))
+
+class SpeciesCache:
+    """
+    Bounded LRU cache of species rows.
+
+    Species rows are content addressed and never updated, so an entry can never hold stale
+    values. Rows are deleted once no plant references them, so an id found by digest must
+    be checked to still exist before a plant is pointed at it. Only rows that are known to
+    be committed may be cached, since a row inserted by a transaction that rolls back would not exist.
+    """
+
+    def __init__(self, max_size: int):
+        self._max_size = max_size
+        # Maps species id -> (digest, species), ordered from least to most recently used.
+        self._entries: OrderedDict[int, tuple[str, Species]] = OrderedDict()
+        # Maps digest -> species id, for the entries above.
+        self._ids_by_digest: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, species_id: int) -> Species | None:
+        """
+        Retrieve a cached species by id.
+
+        Args:
+            species_id: The id of the species row.
+
+        Returns:
+            Species | None: The species, or None if it is not cached.
+        """
+
+        entry = self._entries.get(species_id)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(species_id)
+        self.hits += 1
+        return entry[1]
+
+    def get_id(self, digest: str) -> int | None:
+        """
+        Retrieve the id of a cached species by the digest of its values.
+
+        Args:
+            digest: The digest returned by 'Species.digest'.
+
+        Returns:
+            int | None: The id of the species row, or None if it is not cached.
+        """
+
+        species_id = self._ids_by_digest.get(digest)
+        if species_id is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(species_id)
+        self.hits += 1
+        return species_id
+
+    def put(self, species_id: int, species: Species) -> None:
+        """
+        Cache a committed species row.
+
+        Args:
+            species_id: The id of the species row.
+            species: The values of the species row.
+        """
+
+        if self._max_size <= 0:
+            return
+
+        if species_id in self._entries:
+            self._remove(species_id)
+        digest = species.digest()
+        self._entries[species_id] = (digest, species)
+        self._ids_by_digest[digest] = species_id
+
+        while len(self._entries) > self._max_size:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def discard(self, species_id: int) -> None:
+        """
+        Drop a species from the cache, if it is cached.
+
+        Args:
+            species_id: The id of the species row.
+        """
+
+        if species_id in self._entries:
+            self._remove(species_id)
+
+    def clear(self) -> None:
+        """Drop every cached entry and reset the counters."""
+        self._entries.clear()
+        self._ids_by_digest.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> CacheStats:
+        """Snapshot the hit/miss counters of the cache."""
+        lookups = self.hits + self.misses
+        return CacheStats(
+            size=len(self._entries),
+            max_size=self._max_size,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            hit_ratio=self.hits / lookups if lookups else 0.0,
+        )
+
+    def _remove(self, species_id: int) -> None:
+        """Helper method that removes a single species from both indexes."""
+        digest, _ = self._entries.pop(species_id)
+        self._ids_by_digest.pop(digest, None)
+
+
+species_cache = SpeciesCache(max_size=SPECIES_CACHE_SIZE)
+"""Process-wide species cache shared by every SpeciesService instance."""
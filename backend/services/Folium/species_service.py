@@ -0,0 +1,159 @@
+"""Species service used by the plant service to find and create the species rows that plants reference."""
+
+from typing import Iterable
+
+from fastapi import Depends
+from sqlalchemy import select, delete, exists, any_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...database import db_session
+from ...models.Folium.species import Species
+from ...entities.Folium.species_entity import SpeciesEntity
+from ...entities.Folium.plant_entity import PlantEntity
+from .species_cache import species_cache
+
+class SpeciesService:
+    """Species service to perform actions on the species table, through the species cache."""
+
+    def __init__(self,
+                 session: AsyncSession = Depends(db_session)):
+        self._session = session
+        # Species rows inserted by the current transaction, which are only cached once it commits.
+        self._uncommitted: dict[int, Species] = {}
+        self._uncommitted_ids: dict[str, int] = {}
+        # Species rows deleted by the current transaction, which are only uncached once it commits.
+        self._deleted: list[int] = []
+
+    async def get_species(self, species_ids: Iterable[int]) -> dict[int, Species]:
+        """
+        Retrieve species by id, reading only the ones that are not cached from the database.
+
+        Args:
+            species_ids: The ids of the species rows.
+
+        Returns:
+            dict[int, Species]: The species, by id.
+        """
+
+        found: dict[int, Species] = {}
+        missing: list[int] = []
+        for species_id in set(species_ids):
+            species = self._uncommitted.get(species_id) or species_cache.get(species_id)
+            if species is None:
+                missing.append(species_id)
+            else:
+                found[species_id] = species
+
+        if missing:
+            query = select(SpeciesEntity).where(SpeciesEntity.id == any_(missing))
+            for entity in await self._session.scalars(query):
+                found[entity.id] = entity.to_model()
+                species_cache.put(entity.id, found[entity.id])
+
+        return found
+
+    async def get_species_ids(self, species: list[Species]) -> list[int]:
+        """
+        Find the ids of the rows holding the given species, inserting the ones that do not exist yet.
+
+        Species that are not cached are inserted with a single INSERT ... ON CONFLICT DO NOTHING,
+        and the ones that already existed are then read with a single SELECT by digest.
+        Existing rows, including cached ones, are locked against 'delete_unreferenced' until the
+        caller's transaction ends, and cached rows that were deleted in the meantime are inserted again.
+        Inserted rows are part of the caller's transaction, so 'cache_committed' must be
+        called once it commits.
+
+        Args:
+            species: The species to find.
+
+        Returns:
+            list[int]: The ids of the species rows, in the order the species were passed.
+        """
+
+        digests = [item.digest() for item in species]
+        ids: dict[str, int] = {}
+        cached: dict[int, Species] = {}
+        missing: dict[str, Species] = {}
+        for digest, item in zip(digests, species):
+            if digest in ids or digest in missing:
+                continue
+            species_id = self._uncommitted_ids.get(digest)
+            if species_id is not None:
+                ids[digest] = species_id
+                continue
+            species_id = species_cache.get_id(digest)
+            if species_id is None:
+                missing[digest] = item
+            else:
+                cached[species_id] = item
+
+        if cached:
+            query = (select(SpeciesEntity.id)
+                     .where(SpeciesEntity.id == any_(list(cached)))
+                     .with_for_update(key_share=True))
+            for species_id in await self._session.scalars(query):
+                ids[cached.pop(species_id).digest()] = species_id
+            for species_id, item in cached.items():
+                species_cache.discard(species_id)
+                missing[item.digest()] = item
+
+        # Repeated in case a row that conflicted with the insert is deleted before it is read.
+        while missing:
+            # Inserting in digest order keeps concurrent transactions from deadlocking on the unique index.
+            query = (pg_insert(SpeciesEntity)
+                     .values([{"digest": digest, **missing[digest].model_dump()} for digest in sorted(missing)])
+                     .on_conflict_do_nothing(index_elements=[SpeciesEntity.digest])
+                     .returning(SpeciesEntity.id, SpeciesEntity.digest))
+            for species_id, digest in await self._session.execute(query):
+                ids[digest] = species_id
+                self._uncommitted[species_id] = missing.pop(digest)
+                self._uncommitted_ids[digest] = species_id
+
+            if missing:
+                query = (select(SpeciesEntity.id, SpeciesEntity.digest)
+                         .where(SpeciesEntity.digest == any_(list(missing)))
+                         .with_for_update(key_share=True))
+                for species_id, digest in await self._session.execute(query):
+                    ids[digest] = species_id
+                    species_cache.put(species_id, missing.pop(digest))
+
+        return [ids[digest] for digest in digests]
+
+    async def delete_unreferenced(self, species_ids: Iterable[int]) -> None:
+        """
+        Delete the given species rows that no plant references anymore.
+
+        Must be called in the caller's transaction after it stops referencing the species,
+        and 'cache_committed' once it commits. Rows locked by a transaction that is pointing
+        a plant at them are skipped. The remaining rows are locked first, so the check for
+        references, made by a later statement, sees every plant committed before it.
+
+        Args:
+            species_ids: The ids of the species rows that the caller's plants referenced before the write.
+        """
+
+        species_ids = list(set(species_ids))
+        if not species_ids:
+            return
+
+        query = (select(SpeciesEntity.id)
+                 .where(SpeciesEntity.id == any_(species_ids))
+                 .with_for_update(skip_locked=True))
+        locked = list(await self._session.scalars(query))
+        if locked:
+            query = (delete(SpeciesEntity)
+                     .where(SpeciesEntity.id == any_(locked))
+                     .where(~exists().where(PlantEntity.species_id == SpeciesEntity.id))
+                     .returning(SpeciesEntity.id))
+            self._deleted.extend(await self._session.scalars(query))
+
+    def cache_committed(self) -> None:
+        """Update the species cache with the species rows inserted and deleted by the transaction that was just committed."""
+        for species_id, species in self._uncommitted.items():
+            species_cache.put(species_id, species)
+        for species_id in self._deleted:
+            species_cache.discard(species_id)
+        self._uncommitted.clear()
+        self._uncommitted_ids.clear()
+        self._deleted.clear()
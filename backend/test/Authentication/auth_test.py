@@ -1,10 +1,16 @@
 """Tests for the authentication module."""
 
+from datetime import timedelta
+
 import pytest
-from sqlalchemy.orm import Session
+from passlib.hash import bcrypt
+from sqlalchemy import select, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...services.Authentication.user_service import UserService
 from ...services.Authentication.authentication_service import AuthenticationService
+from ...services.Authentication.principal_cache import principal_cache
+from ...services.Authentication.password_hasher import BCRYPT_ROUNDS
 from ...services.Authentication.exceptions import (UserNotFoundException,
                                                     DisabledUserException,
                                                     InvalidCredentialsException, 
@@ -14,116 +20,206 @@ from ...services.Authentication.exceptions import (UserNotFoundException,
                                                   )
 from ...models.Authentication.user import NewUser
 from ...models.Authentication.token import Token
+from ...entities.Authentication.user_entity import UserEntity
+from ...entities.Authentication.refresh_token_entity import RefreshTokenEntity
+
+pytestmark = pytest.mark.asyncio
 
 @pytest.fixture(autouse=True)
-def user_service(session: Session):
+def user_service(session: AsyncSession):
     """This PyTest fixture is injected into each test parameter of the same name below.
-    It constructs a new, empty UserService object."""
+    It constructs a new, empty UserService object and empties the principal cache."""
+    principal_cache.clear()
     user_service: UserService = UserService(session=session)
     return user_service
 
 @pytest.fixture(autouse=True)
-def auth_service(session: Session):
+def auth_service(session: AsyncSession):
     """This PyTest fixture is injected into each test parameter of the same name below.
     It constructs a new, empty AuthenticationService object."""
     auth_service: AuthenticationService = AuthenticationService(session=session)
     return auth_service
 
-def test_create_user(auth_service: AuthenticationService, user_service: UserService):
+async def test_create_user(auth_service: AuthenticationService, user_service: UserService):
     """Tests create user basic usage."""
-    user: NewUser = auth_service.create_user(username="johndoe", password="secret", email="johndoe@gmail.com", full_name="John Doe")
+    user: NewUser = await auth_service.create_user(username="johndoe", password="secret", email="johndoe@gmail.com", full_name="John Doe")
     assert user 
-    ent = user_service._get_user(username=user.username)
+    ent = await user_service._get_user(username=user.username)
     assert ent
 
-def test_create_multiple_users(auth_service: AuthenticationService):
+async def test_create_multiple_users(auth_service: AuthenticationService):
     """Tests that multiple users can be created without throwing any exceptions."""
-    auth_service.create_user(username="johndeere", password="anothersecret", email="johndeere@gmail.com", full_name="John deere")
-    auth_service.create_user(username="johndoe", password="secret", email="johndoe@gmail.com", full_name="John Doe")
+    await auth_service.create_user(username="johndeere", password="anothersecret", email="johndeere@gmail.com", full_name="John deere")
+    await auth_service.create_user(username="johndoe", password="secret", email="johndoe@gmail.com", full_name="John Doe")
 
-def test_create_user_blank_property(auth_service: AuthenticationService):
+async def test_create_user_blank_property(auth_service: AuthenticationService):
     """Checks that an error is thrown when create user is called with blank properties."""
     try:
-        auth_service.create_user(username="", password="", email="", full_name="")
+        await auth_service.create_user(username="", password="", email="", full_name="")
         pytest.fail()
     except InvalidUserInputPropertyException:
         assert True
 
-def test_create_user_invalid_username(auth_service: AuthenticationService):
+async def test_create_user_invalid_username(auth_service: AuthenticationService):
     """Checks that an exception is raised when a user is created with an invalid email"""
     try:
-        auth_service.create_user(username="test", password="test", email="test", full_name="test")
+        await auth_service.create_user(username="test", password="test", email="test", full_name="test")
         pytest.fail()
     except InvalidUserInputPropertyException:
         assert True
 
-def test_create_user_space_in_password(auth_service: AuthenticationService):
+async def test_create_user_space_in_password(auth_service: AuthenticationService):
     """Tests that an exception is raised when a user is created with a space in their username or password."""
     try:
-        auth_service.create_user(username="John doe", password="test test", email="normal@gmail.com", full_name="test")
+        await auth_service.create_user(username="John doe", password="test test", email="normal@gmail.com", full_name="test")
         pytest.fail()
     except InvalidUserInputPropertyException:
         assert True
 
-def test_create_duplicate_user(auth_service: AuthenticationService):
+async def test_create_duplicate_user(auth_service: AuthenticationService):
     """Tests that an exception is thrown when a user is created with the same username, email, or password as another user."""
-    auth_service.create_user(username="johndoe", password="secret", email="johndoe@gmail.com", full_name="John Doe")
+    await auth_service.create_user(username="johndoe", password="secret", email="johndoe@gmail.com", full_name="John Doe")
 
     try:
-        auth_service.create_user(username="johndoe", password="secret", email="johndoe@gmail.com", full_name="John Doe")
+        await auth_service.create_user(username="johndoe", password="secret", email="johndoe@gmail.com", full_name="John Doe")
         pytest.fail()
     except DuplicateUserException:
         assert True
 
-def test_login_basic_usage(auth_service: AuthenticationService):
+async def test_create_duplicate_email(auth_service: AuthenticationService):
+    """Tests that the duplicate user exception names the email when only the email is already in use."""
+    await auth_service.create_user(username="johndoe", password="secret", email="johndoe@gmail.com", full_name="John Doe")
+
+    try:
+        await auth_service.create_user(username="janedoe", password="secret", email="johndoe@gmail.com", full_name="Jane Doe")
+        pytest.fail()
+    except DuplicateUserException as e:
+        assert "johndoe@gmail.com" in str(e)
+
+async def test_login_basic_usage(auth_service: AuthenticationService):
     """Tests basic usage for login service method."""
-    auth_service.create_user(username="johndoe", password="secret", email="johndoe@gmail.com", full_name="John Doe")
-    token = auth_service.login(username="johndoe", plain_password="secret")
+    await auth_service.create_user(username="johndoe", password="secret", email="johndoe@gmail.com", full_name="John Doe")
+    token = await auth_service.login(username="johndoe", plain_password="secret")
     assert token
     assert token.access_token
 
-def test_login_multiple_users(auth_service: AuthenticationService):
+async def test_login_multiple_users(auth_service: AuthenticationService):
     """Tests that multiple users can be logged in at once."""
-    auth_service.create_user(username="johndeere", password="anothersecret", email="johndeere@gmail.com", full_name="John deere")
-    auth_service.create_user(username="johndoe", password="secret", email="johndoe@gmail.com", full_name="John Doe")
+    await auth_service.create_user(username="johndeere", password="anothersecret", email="johndeere@gmail.com", full_name="John deere")
+    await auth_service.create_user(username="johndoe", password="secret", email="johndoe@gmail.com", full_name="John Doe")
 
-    token1 = auth_service.login(username="johndeere", plain_password="anothersecret")
-    token2 = auth_service.login(username="johndoe", plain_password="secret")
+    token1 = await auth_service.login(username="johndeere", plain_password="anothersecret")
+    token2 = await auth_service.login(username="johndoe", plain_password="secret")
 
     assert token1
     assert token2
     assert token1.access_token != token2.access_token
 
-def test_login_nonexistent_user(auth_service: AuthenticationService):
+async def test_login_nonexistent_user(auth_service: AuthenticationService):
     """Tests that an exception is raised when a user is logged in that does not exists."""
     try:
-        auth_service.login(username="none", plain_password="none")
+        await auth_service.login(username="none", plain_password="none")
         pytest.fail()
     except UserNotFoundException:
         assert True
 
-def test_invalid_credentials(auth_service: AuthenticationService):
+async def test_invalid_credentials(auth_service: AuthenticationService):
     """Tests that an exception is raised when invalid credentials are passed to log a user in."""
-    auth_service.create_user(username="johndoe", password="secret", email="johndoe@gmail.com", full_name="John Doe")
+    await auth_service.create_user(username="johndoe", password="secret", email="johndoe@gmail.com", full_name="John Doe")
 
     try:
-        auth_service.login(username="johndoe", plain_password="none")
+        await auth_service.login(username="johndoe", plain_password="none")
         pytest.fail()
     except InvalidCredentialsException:
         assert True
 
-def test_refresh_access_token(auth_service: AuthenticationService):
+async def test_login_rehashes_outdated_cost(auth_service: AuthenticationService, user_service: UserService):
+    """Tests that a password hashed with an outdated bcrypt cost is rehashed on login."""
+    await auth_service.create_user(username="johndoe", password="secret", email="johndoe@gmail.com", full_name="John Doe")
+    ent = await user_service._get_user(username="johndoe")
+    ent.hashed_password = bcrypt.using(rounds=4).hash("secret")
+
+    await auth_service.login(username="johndoe", plain_password="secret")
+
+    ent = await user_service._get_user(username="johndoe")
+    assert bcrypt.from_string(ent.hashed_password).rounds == BCRYPT_ROUNDS
+
+async def test_refresh_access_token(auth_service: AuthenticationService):
     """Test refresh access token basic usage."""
-    new_user: NewUser = auth_service.create_user(username="johndoe", password="secret", email="johndoe@gmail.com", full_name="John Doe")
+    new_user: NewUser = await auth_service.create_user(username="johndoe", password="secret", email="johndoe@gmail.com", full_name="John Doe")
     assert new_user
-    token: Token = auth_service.refresh_access_token(refresh_token=new_user.refresh_token)
+    token: Token = await auth_service.refresh_access_token(refresh_token=new_user.refresh_token)
     assert token
     assert token.access_token
 
-def test_refresh_access_token_invalid_user(auth_service: AuthenticationService):
+async def test_refresh_access_token_invalid_user(auth_service: AuthenticationService):
     """Test that an exception is raised when a token is refreshed that does not correspond to a user."""
     try:
-        auth_service.refresh_access_token(refresh_token="fake")
+        await auth_service.refresh_access_token(refresh_token="fake")
+        pytest.fail()
+    except UserNotFoundException:
+        assert True
+
+async def test_revoke_refresh_token(auth_service: AuthenticationService):
+    """Test that a revoked refresh token can no longer be used to refresh the access token."""
+    new_user: NewUser = await auth_service.create_user(username="johndoe", password="secret", email="johndoe@gmail.com", full_name="John Doe")
+    await auth_service.revoke_refresh_token(refresh_token=new_user.refresh_token)
+
+    try:
+        await auth_service.refresh_access_token(refresh_token=new_user.refresh_token)
+        pytest.fail()
+    except UserNotFoundException:
+        assert True
+
+async def test_login_rotates_device_refresh_token(auth_service: AuthenticationService):
+    """Test that logging in issues a refresh token to the device, replacing only the token previously issued to it."""
+    new_user: NewUser = await auth_service.create_user(username="johndoe", password="secret", email="johndoe@gmail.com", full_name="John Doe")
+    phone_token = (await auth_service.login(username="johndoe", plain_password="secret", device="phone")).refresh_token
+    new_token = (await auth_service.login(username="johndoe", plain_password="secret")).refresh_token
+
+    assert await auth_service.refresh_access_token(refresh_token=phone_token)
+    assert await auth_service.refresh_access_token(refresh_token=new_token)
+    try:
+        await auth_service.refresh_access_token(refresh_token=new_user.refresh_token)
         pytest.fail()
     except UserNotFoundException:
-        assert True
\ No newline at end of file
+        assert True
+
+async def test_expired_refresh_tokens_purged(session: AsyncSession, auth_service: AuthenticationService):
+    """Test that expired refresh tokens are deleted when their user logs in, and by the purge of every user."""
+    await auth_service.create_user(username="johndoe", password="secret", email="johndoe@gmail.com", full_name="John Doe", device="phone")
+    await auth_service.create_user(username="johndeere", password="secret", email="johndeere@gmail.com", full_name="John Deere")
+    await session.execute(update(RefreshTokenEntity).values(expires_at=func.now() - timedelta(days=1)))
+    await session.commit()
+
+    await auth_service.login(username="johndoe", plain_password="secret")
+    devices = await session.scalars(select(RefreshTokenEntity.device).join(UserEntity).where(UserEntity.username == "johndoe"))
+    assert list(devices) == ["default"]
+
+    assert await auth_service.purge_expired_refresh_tokens() == 1
+    assert await session.scalar(select(func.count()).select_from(RefreshTokenEntity)) == 1
+
+async def test_get_current_active_user_cached(session: AsyncSession, auth_service: AuthenticationService):
+    """Tests that the user for a token is only looked up in the database once."""
+    new_user: NewUser = await auth_service.create_user(username="johndoe", password="secret", email="johndoe@gmail.com", full_name="John Doe")
+    user_service = UserService(session=session, token=new_user.access_token)
+
+    first = await user_service.get_current_active_user()
+    second = await user_service.get_current_active_user()
+
+    assert first == second
+    assert principal_cache.misses == 1
+    assert principal_cache.hits == 1
+
+async def test_delete_current_user_invalidates_cache(session: AsyncSession, auth_service: AuthenticationService):
+    """Tests that a deleted user is no longer served from the principal cache."""
+    new_user: NewUser = await auth_service.create_user(username="johndoe", password="secret", email="johndoe@gmail.com", full_name="John Doe")
+    user_service = UserService(session=session, token=new_user.access_token)
+    await user_service.get_current_active_user()
+    await user_service.delete_current_user()
+
+    try:
+        await user_service.get_current_active_user()
+        pytest.fail()
+    except UserNotFoundException:
+        assert True
@@ -0,0 +1,60 @@
+"""Tests for the process pool password hashing backend."""
+
+import pytest
+
+from ...services.Authentication.password_hasher import PasswordHasher
+from ...services.Authentication.exceptions import HashingPoolSaturatedException
+
+pytestmark = pytest.mark.asyncio
+
+async def test_hash_and_verify():
+    """Tests that a secret hashed in the pool verifies against the same secret only."""
+    hasher = PasswordHasher(workers=1, max_pending=4)
+    try:
+        hashed = await hasher.hash("secret")
+        assert await hasher.verify("secret", hashed)
+        assert not await hasher.verify("wrong", hashed)
+        assert hasher.stats().completed == 3
+    finally:
+        hasher.shutdown()
+
+async def test_saturated_pool_rejects_jobs():
+    """Tests that jobs are rejected instead of queued once the pending limit is reached."""
+    hasher = PasswordHasher(workers=1, max_pending=0)
+    try:
+        await hasher.hash("secret")
+        pytest.fail()
+    except HashingPoolSaturatedException:
+        assert hasher.stats().rejected == 1
+
+async def test_failed_jobs_not_counted_as_completed():
+    """Tests that a job that raises is counted as failed and left out of the completed jobs and latency."""
+    hasher = PasswordHasher(workers=1, max_pending=4)
+    try:
+        with pytest.raises(ValueError):
+            await hasher.verify("secret", "not a hash")
+        stats = hasher.stats()
+        assert stats.failed == 1
+        assert stats.completed == 0
+        assert stats.max_latency_ms == 0.0
+    finally:
+        hasher.shutdown()
+
+async def test_pool_restarted_after_worker_dies():
+    """Tests that a pool whose worker was killed is replaced, so hashing keeps working."""
+    hasher = PasswordHasher(workers=1, max_pending=4)
+    try:
+        hashed = await hasher.hash("secret")
+        broken_executor = hasher._executor
+        for process in list(broken_executor._processes.values()):
+            process.kill()
+            process.join()
+
+        assert await hasher.verify("secret", hashed)
+        assert hasher._executor is not broken_executor
+        assert await hasher.verify("secret", hashed)
+        stats = hasher.stats()
+        assert stats.completed == 3
+        assert stats.failed == 0
+    finally:
+        hasher.shutdown()
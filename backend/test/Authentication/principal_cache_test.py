@@ -0,0 +1,45 @@
+"""Tests for the authenticated principal cache."""
+
+import time
+
+from ...services.Authentication.principal_cache import PrincipalCache
+from ...models.Authentication.user import User
+
+def test_principal_cache_hit_and_miss():
+    """Tests that cached users are returned and lookups are counted."""
+    cache = PrincipalCache(max_size=10, ttl_seconds=60)
+    assert cache.get("tok") is None
+    cache.put("tok", User(username="johndoe"))
+    assert cache.get("tok").username == "johndoe"
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+def test_principal_cache_bounded_size():
+    """Tests that the least recently used entry is evicted when the cache is full."""
+    cache = PrincipalCache(max_size=2, ttl_seconds=60)
+    cache.put("tok1", User(username="one"))
+    cache.put("tok2", User(username="two"))
+    cache.get("tok1")
+    cache.put("tok3", User(username="three"))
+
+    assert cache.get("tok2") is None
+    assert cache.get("tok1") is not None
+    assert cache.evictions == 1
+
+def test_principal_cache_ttl_bounded_by_token_expiry():
+    """Tests that an entry is never cached past the expiry of its token."""
+    cache = PrincipalCache(max_size=10, ttl_seconds=60)
+    cache.put("expired", User(username="johndoe"), expires_at=time.time() - 1)
+    assert cache.get("expired") is None
+
+def test_principal_cache_invalidate_user():
+    """Tests that invalidating a user drops every token cached for them."""
+    cache = PrincipalCache(max_size=10, ttl_seconds=60)
+    cache.put("tok1", User(username="johndoe"))
+    cache.put("tok2", User(username="johndoe"))
+    cache.put("tok3", User(username="johndeere"))
+    cache.invalidate_user("johndoe")
+
+    assert cache.get("tok1") is None
+    assert cache.get("tok2") is None
+    assert cache.get("tok3") is not None
@@ -0,0 +1,97 @@
+"""Unit tests for the plant health service"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
+from .plant_test_data import insert_test_data
+
+from ...services.Folium.exceptions import PlantNotFoundException
+from ...services.Folium.plant_health_service import PlantHealthService
+from ...models.Folium.plant_health import PlantHealthSample
+
+pytestmark = pytest.mark.asyncio
+
+# Plant 1 belongs to 'johndeere' in the test data.
+PLANT_ID = 1
+OWNER = "johndeere"
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+@pytest_asyncio.fixture(autouse=True, scope="function")
+async def plant_health_service(session: AsyncSession):
+    """This PyTest fixture is injected into each test parameter of the same name below.
+    It constructs a new, empty PlantHealthService object."""
+    await insert_test_data(session)
+    await session.commit()
+    plant_health_service = PlantHealthService(session=session)
+    return plant_health_service
+
+async def add_daily_samples(plant_health_service: PlantHealthService, scores: list[int]) -> None:
+    """Helper function that records one sample per day starting at 'START'."""
+    for day, score in enumerate(scores):
+        sample = PlantHealthSample(recorded_at=START + timedelta(days=day), score=score)
+        await plant_health_service.add_sample(plant_id=PLANT_ID, sample=sample, owner_username=OWNER)
+
+async def test_add_sample(plant_health_service: PlantHealthService):
+    """Test that an added sample defaults to the current time and is returned in the plant's history."""
+
+    sample = await plant_health_service.add_sample(plant_id=PLANT_ID, sample=PlantHealthSample(score=7), owner_username=OWNER)
+    assert sample.plant_id == PLANT_ID
+    assert sample.recorded_at is not None
+
+    samples = await plant_health_service.get_samples(plant_id=PLANT_ID, owner_username=OWNER)
+    assert [sample.score for sample in samples] == [7]
+
+async def test_add_sample_other_user_plant(plant_health_service: PlantHealthService):
+    """Test that a user cannot add a sample to another user's plant."""
+
+    try:
+        await plant_health_service.add_sample(plant_id=PLANT_ID, sample=PlantHealthSample(score=7), owner_username="johndoe")
+        pytest.fail()
+    except PlantNotFoundException:
+        assert True
+
+async def test_get_samples_range(plant_health_service: PlantHealthService):
+    """Test that only samples within the requested range are returned, oldest first."""
+
+    await add_daily_samples(plant_health_service, [1, 2, 3, 4, 5])
+    samples = await plant_health_service.get_samples(plant_id=PLANT_ID, owner_username=OWNER,
+                                                     start=START + timedelta(days=1), end=START + timedelta(days=4))
+    assert [sample.score for sample in samples] == [2, 3, 4]
+
+async def test_get_samples_limit(plant_health_service: PlantHealthService):
+    """Test that the latest samples are returned when there are more than the limit and no start,
+    and the earliest from the start otherwise."""
+
+    await add_daily_samples(plant_health_service, [1, 2, 3, 4, 5])
+    samples = await plant_health_service.get_samples(plant_id=PLANT_ID, owner_username=OWNER, limit=3)
+    assert [sample.score for sample in samples] == [3, 4, 5]
+
+    samples = await plant_health_service.get_samples(plant_id=PLANT_ID, owner_username=OWNER,
+                                                     end=START + timedelta(days=4), limit=3)
+    assert [sample.score for sample in samples] == [2, 3, 4]
+
+    samples = await plant_health_service.get_samples(plant_id=PLANT_ID, owner_username=OWNER,
+                                                     start=START + timedelta(days=1), limit=3)
+    assert [sample.score for sample in samples] == [2, 3, 4]
+
+async def test_get_summary(plant_health_service: PlantHealthService):
+    """Test that the summary aggregates only the most recent samples."""
+
+    await add_daily_samples(plant_health_service, [10, 1, 2, 3, 4])
+    summary = await plant_health_service.get_summary(plant_id=PLANT_ID, owner_username=OWNER, window=4)
+
+    assert summary.samples == 4
+    assert summary.latest_score == 4
+    assert summary.latest_recorded_at == START + timedelta(days=4)
+    assert summary.rolling_average == pytest.approx(2.5)
+    assert summary.trend == pytest.approx(1.0)
+
+async def test_get_summary_no_samples(plant_health_service: PlantHealthService):
+    """Test that the summary of a plant without samples is empty."""
+
+    summary = await plant_health_service.get_summary(plant_id=PLANT_ID, owner_username=OWNER)
+    assert summary.samples == 0
+    assert summary.latest_score is None
+    assert summary.trend is None
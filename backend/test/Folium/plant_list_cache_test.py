@@ -0,0 +1,184 @@
+"""Tests for the plant list cache backends."""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from ...services.Folium.plant_list_cache import PlantListCache, MemoryPlantListCache, RedisPlantListCache
+
+pytestmark = pytest.mark.asyncio
+
+class RedisStandIn:
+    """Minimal in-memory server speaking the subset of the Redis protocol used by the cache."""
+
+    def __init__(self):
+        self.data: dict[bytes, bytes] = {}
+        self.server: asyncio.Server | None = None
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                count = int((await reader.readuntil(b"\r\n"))[1:-2])
+                args = []
+                for _ in range(count):
+                    length = int((await reader.readuntil(b"\r\n"))[1:-2])
+                    args.append((await reader.readexactly(length + 2))[:-2])
+                writer.write(self._reply(args[0].upper(), args[1:]))
+                await writer.drain()
+        except asyncio.IncompleteReadError:
+            writer.close()
+
+    def _reply(self, command: bytes, args: list[bytes]) -> bytes:
+        if command == b"GET":
+            value = self.data.get(args[0])
+            return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+        if command == b"SET":
+            self.data[args[0]] = args[1]
+            return b"+OK\r\n"
+        if command == b"HGET":
+            value = self.data.get(args[0], {}).get(args[1])
+            return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+        if command == b"HSET":
+            fields = self.data.setdefault(args[0], {})
+            added = args[1] not in fields
+            fields[args[1]] = args[2]
+            return b":%d\r\n" % added
+        if command == b"EXPIRE":
+            return b":%d\r\n" % (args[0] in self.data)
+        if command == b"DEL":
+            return b":%d\r\n" % sum(self.data.pop(key, None) is not None for key in args)
+        if command == b"SCAN":
+            prefix = args[2].rstrip(b"*")
+            keys = [key for key in self.data if key.startswith(prefix)]
+            return b"*2\r\n$1\r\n0\r\n*%d\r\n" % len(keys) + b"".join(b"$%d\r\n%s\r\n" % (len(key), key) for key in keys)
+        return b"-ERR unknown command\r\n"
+
+class MalformedRedisStandIn(RedisStandIn):
+    """Redis stand-in that sends the queued malformed replies before answering commands normally."""
+
+    def __init__(self, *replies: bytes):
+        super().__init__()
+        self.replies = list(replies)
+
+    def _reply(self, command: bytes, args: list[bytes]) -> bytes:
+        if self.replies:
+            return self.replies.pop(0)
+        return super()._reply(command, args)
+
+@pytest_asyncio.fixture
+async def redis_stand_in():
+    """This PyTest fixture runs a Redis stand-in server for the duration of a test."""
+    server = RedisStandIn()
+    port = await server.start()
+    yield server, port
+    await server.stop()
+
+async def test_memory_cache_hit_requires_matching_version():
+    """Tests that a cached plant list is only served at the collection version it was cached at."""
+    cache = MemoryPlantListCache(max_bytes=1024)
+    await cache.put("johndoe", 1, b"[]")
+
+    assert await cache.get("johndoe", 1) == b"[]"
+    assert await cache.get("johndoe", 2) is None
+    assert cache.stats().hit_ratio == 0.5
+
+async def test_memory_cache_bounded_by_bytes():
+    """Tests that the least recently used lists are evicted once the byte limit is exceeded."""
+    cache = MemoryPlantListCache(max_bytes=10)
+    await cache.put("one", 1, b"12345")
+    await cache.put("two", 1, b"12345")
+    await cache.get("one", 1)
+    await cache.put("three", 1, b"12345")
+    await cache.put("huge", 1, b"12345678901")
+
+    assert await cache.get("two", 1) is None
+    assert await cache.get("one", 1) == b"12345"
+    assert await cache.get("huge", 1) is None
+    stats = cache.stats()
+    assert stats.evictions == 1
+    assert stats.size_bytes == 10
+
+async def test_backend_must_implement_interface():
+    """Tests that a backend missing one of the cache operations cannot be created."""
+    class PartialCache(PlantListCache):
+        async def get(self, owner_username, version, variant=""):
+            return None
+
+    with pytest.raises(TypeError):
+        PartialCache()
+
+async def test_memory_cache_invalidate():
+    """Tests that an invalidated plant list is no longer served."""
+    cache = MemoryPlantListCache(max_bytes=1024)
+    await cache.put("johndoe", 1, b"[]")
+    await cache.invalidate("johndoe")
+
+    assert await cache.get("johndoe", 1) is None
+    assert cache.stats().size_bytes == 0
+
+async def test_memory_cache_invalidate_drops_variants():
+    """Tests that every variant of a user's plant list is cached separately and invalidated together."""
+    cache = MemoryPlantListCache(max_bytes=1024)
+    await cache.put("johndoe", 1, b"[1]")
+    await cache.put("johndoe", 1, b"[2]", variant="id")
+    await cache.put("janedoe", 1, b"[3]", variant="id")
+
+    assert await cache.get("johndoe", 1) == b"[1]"
+    assert await cache.get("johndoe", 1, variant="id") == b"[2]"
+    await cache.invalidate("johndoe")
+    assert await cache.get("johndoe", 1) is None
+    assert await cache.get("johndoe", 1, variant="id") is None
+    assert await cache.get("janedoe", 1, variant="id") == b"[3]"
+    assert cache.stats().size_bytes == 3
+
+async def test_redis_cache_round_trip(redis_stand_in):
+    """Tests that the Redis backend stores, versions and invalidates plant lists."""
+    server, port = redis_stand_in
+    cache = RedisPlantListCache(url=f"redis://127.0.0.1:{port}/0", ttl_seconds=60)
+    await cache.put("johndoe", 3, b'[{"id":1}]')
+
+    assert await cache.get("johndoe", 3) == b'[{"id":1}]'
+    assert await cache.get("johndoe", 4) is None
+    await cache.put("johndoe", 3, b'[{"id":1,"common_name":"fern"}]', variant="common_name,id")
+    assert await cache.get("johndoe", 3, variant="common_name,id") == b'[{"id":1,"common_name":"fern"}]'
+    assert await cache.get("johndoe", 3) == b'[{"id":1}]'
+    await cache.invalidate("johndoe")
+    assert await cache.get("johndoe", 3) is None
+    assert await cache.get("johndoe", 3, variant="common_name,id") is None
+    await cache.put("johndoe", 3, b"[]")
+    await cache.clear()
+    assert server.data == {}
+
+async def test_redis_cache_unreachable_server_misses():
+    """Tests that the Redis backend degrades to cache misses when the server cannot be reached."""
+    server = RedisStandIn()
+    port = await server.start()
+    await server.stop()
+    cache = RedisPlantListCache(url=f"redis://127.0.0.1:{port}/0", ttl_seconds=60)
+
+    await cache.put("johndoe", 1, b"[]")
+    assert await cache.get("johndoe", 1) is None
+    assert cache.stats().errors == 2
+
+async def test_redis_cache_malformed_reply_misses():
+    """Tests that the Redis backend degrades to cache misses on malformed replies, and reconnects after them."""
+    server = MalformedRedisStandIn(b":twelve\r\n", b"$x\r\n", b"+" + b"x" * 100_000 + b"\r\n")
+    port = await server.start()
+    cache = RedisPlantListCache(url=f"redis://127.0.0.1:{port}/0", ttl_seconds=60)
+
+    assert await cache.get("johndoe", 1) is None
+    assert await cache.get("johndoe", 1) is None
+    assert await cache.get("johndoe", 1) is None
+    assert cache.stats().errors == 3
+    await cache.put("johndoe", 1, b"[]")
+    assert await cache.get("johndoe", 1) == b"[]"
+    await server.stop()
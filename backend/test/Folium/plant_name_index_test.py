@@ -0,0 +1,56 @@
+"""Tests for the plant name index."""
+
+from ...services.Folium.plant_name_index import PlantNameIndex, PlantNameIndexCache, AUTOCOMPLETE_MAX_RESULTS
+
+def test_suggest_prefix():
+    """Test that only names starting with the prefix are suggested, in alphabetical order."""
+    index = PlantNameIndex()
+    index.add("Snake plant", "Spider plant", "Aloe vera", "Sansevieria")
+
+    assert index.suggest("s") == ["Sansevieria", "Snake plant", "Spider plant"]
+    assert index.suggest("sp") == ["Spider plant"]
+    assert index.suggest("x") == []
+    assert index.suggest("  ") == []
+
+def test_suggest_ignores_case():
+    """Test that matching ignores case and keeps the name as it was first written."""
+    index = PlantNameIndex()
+    index.add("Monstera deliciosa", "monstera DELICIOSA")
+
+    assert index.suggest("MONSTERA") == ["Monstera deliciosa"]
+    assert len(index) == 1
+
+def test_remove_counts_references():
+    """Test that a name is only dropped once no plant uses it."""
+    index = PlantNameIndex()
+    index.load([("Fern", 2)])
+
+    index.remove("Fern")
+    assert index.suggest("fe") == ["Fern"]
+    index.remove("Fern")
+    assert index.suggest("fe") == []
+    index.remove("Fern")
+    assert len(index) == 0
+
+def test_suggest_limit():
+    """Test that the number of suggestions is bounded by the limit and by 'AUTOCOMPLETE_MAX_RESULTS'."""
+    index = PlantNameIndex()
+    index.add(*[f"Cactus {number:03}" for number in range(AUTOCOMPLETE_MAX_RESULTS + 10)])
+
+    assert index.suggest("cactus", limit=3) == ["Cactus 000", "Cactus 001", "Cactus 002"]
+    assert len(index.suggest("cactus", limit=AUTOCOMPLETE_MAX_RESULTS + 10)) == AUTOCOMPLETE_MAX_RESULTS
+
+def test_cache_applies_consecutive_writes_only():
+    """Test that a write is applied to an index cached at the previous version, and that a missed write drops the index."""
+    cache = PlantNameIndexCache(max_size=10)
+    index = PlantNameIndex()
+    index.add("Fern")
+    cache.put("johndoe", 1, index)
+
+    cache.update("johndoe", 2, removed_names=["Fern"], added_names=["Ficus"])
+    assert cache.get("johndoe", 1) is None
+    assert cache.get("johndoe", 2).suggest("f") == ["Ficus"]
+
+    cache.update("johndoe", 4, removed_names=[], added_names=["Aloe"])
+    assert cache.get("johndoe", 4) is None
+    assert cache.get("johndoe", 2) is None
@@ -2,40 +2,112 @@
 
 """Unit tests for the plant service"""
 
+import gzip
+from datetime import datetime, timedelta, timezone
+
+import brotli
 import pytest
-from sqlalchemy.orm import Session
+import pytest_asyncio
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from .plant_test_data import insert_test_data
 
-from ...services.Folium.exceptions import PlantNotFoundException, PlantBlankIdException, PlantOwnerUsernameInvalidException
+from ...services.Folium.exceptions import PlantNotFoundException, PlantBlankIdException, PlantOwnerUsernameInvalidException, PlantInvalidCursorException, PlantInvalidFieldsException
+
+from ...api.Folium.plant import _collection_etag
+from ...services.Folium.plant_service import PlantService, parse_fields
+from ...services.Folium.plant_list_cache import plant_list_cache
+from ...services.Folium.plant_name_index import plant_name_indexes
+from ...services.Folium.species_cache import species_cache
+from ...models.Folium.plant import Plant, PlantPatch
+from ...models.Folium.species import Species
+from ...entities.Folium.plant_entity import PlantEntity
+from ...entities.Folium.species_entity import SpeciesEntity
 
-from ...services.Folium.plant_service import PlantService
-from ...models.Folium.plant import Plant
+pytestmark = pytest.mark.asyncio
 
-@pytest.fixture(autouse=True, scope="function")
-def plant_service(session: Session):
+@pytest_asyncio.fixture(autouse=True, scope="function")
+async def plant_service(session: AsyncSession):
     """This PyTest fixture is injected into each test parameter of the same name below.
-    It constructs a new, empty PlantService object."""
-    insert_test_data(session)
-    session.commit()
+    It constructs a new, empty PlantService object and empties the plant list, species and plant name index caches."""
+    await plant_list_cache.clear()
+    species_cache.clear()
+    plant_name_indexes.clear()
+    await insert_test_data(session)
+    await session.commit()
     plant_service = PlantService(session=session)
     return plant_service
 
-def test_get_all_user_plants(plant_service: PlantService):
+async def test_get_all_user_plants(plant_service: PlantService):
     """Test basic usage for get all user plants service method"""
 
-    plants = plant_service.get_all_user_plants("johndoe")
+    plants = await plant_service.get_all_user_plants("johndoe")
     assert len(plants) == 1
     assert plants[0].common_name == "test1"
 
 
-def test_get_all_user_plants_correct_plants(plant_service: PlantService):
+async def test_get_all_user_plants_correct_plants(plant_service: PlantService):
     """Test that get all user plants service method returns the correct plants"""
 
-    plants = plant_service.get_all_user_plants("johndoe")
+    plants = await plant_service.get_all_user_plants("johndoe")
     assert len(plants) == 1
     assert plants[0].common_name != "test2"
 
-def test_create_plant(plant_service: PlantService):
+async def test_stream_user_plants(plant_service: PlantService):
+    """Test that streaming a user's plants yields the same plants as retrieving them all at once."""
+
+    await plant_service.create_plant(plant=Plant(common_name="a", owner_username="johndoe"), owner_username="johndoe")
+
+    streamed = [plant async for plant in plant_service.stream_user_plants("johndoe")]
+    assert [plant.common_name for plant in streamed] == ["test1", "a"]
+    assert streamed == await plant_service.get_all_user_plants("johndoe")
+
+async def test_get_all_user_plants_fields(plant_service: PlantService):
+    """Test that a projection only returns the requested fields, in model order, for listing and streaming."""
+
+    fields = parse_fields("last_watering, image_url,common_name")
+    assert fields == ("id", "common_name", "image_url", "last_watering")
+
+    plant = (await plant_service.get_all_user_plants("johndoe"))[0]
+    projected = await plant_service.get_all_user_plants("johndoe", fields=fields)
+    assert projected == [{name: getattr(plant, name) for name in fields}]
+    assert [plant async for plant in plant_service.stream_user_plants("johndoe", fields=fields)] == projected
+    assert await plant_service.get_all_user_plants("johndoe", fields=parse_fields("common_name")) == [{"id": plant.id, "common_name": "test1"}]
+
+async def test_parse_fields_unknown_field():
+    """Test that a projection naming a field plants do not have is rejected."""
+
+    with pytest.raises(PlantInvalidFieldsException):
+        parse_fields("common_name,health_history")
+
+async def test_get_user_plants_page(plant_service: PlantService):
+    """Test that paging through a user's plants returns every plant exactly once, in id order."""
+
+    for name in ["a", "b", "c", "d"]:
+        await plant_service.create_plant(plant=Plant(common_name=name, owner_username="johndoe"), owner_username="johndoe")
+
+    names = []
+    cursor = None
+    while True:
+        page = await plant_service.get_user_plants_page("johndoe", limit=2, cursor=cursor)
+        assert len(page.plants) <= 2
+        names += [plant.common_name for plant in page.plants]
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert names == ["test1", "a", "b", "c", "d"]
+
+async def test_get_user_plants_page_invalid_cursor(plant_service: PlantService):
+    """Test that an exception is raised when a cursor that was not issued by the service is passed."""
+
+    try:
+        await plant_service.get_user_plants_page("johndoe", cursor="not a cursor")
+        pytest.fail()
+    except PlantInvalidCursorException:
+        assert True
+
+async def test_create_plant(plant_service: PlantService):
     """Tests create plant service method basic usage."""
 
     plant = Plant(
@@ -45,21 +117,19 @@ def test_create_plant(plant_service: PlantService):
         cycle="fake",
         watering="fake",
         watering_period="fake",
-        watering_benchmark_unit="fake",
-        watering_benchmark_value="fake",
+        watering_interval=timedelta(days=7),
         sunlight="fake",
         pet_poison=False,
         human_poison=True,
         description="fake",
         image_url="fake",
         owner_username="johndeere",
-        last_watering="fake",
-        health_history=[],
+        last_watering=datetime(2026, 1, 1, tzinfo=timezone.utc),
     )
-    plant_service.create_plant(plant=plant, owner_username="johndeere")
-    assert len(plant_service.get_all_user_plants("johndeere")) == 2
+    await plant_service.create_plant(plant=plant, owner_username="johndeere")
+    assert len(await plant_service.get_all_user_plants("johndeere")) == 2
 
-def test_create_plant_other_user(plant_service: PlantService):
+async def test_create_plant_other_user(plant_service: PlantService):
     """Tests that a user cannot create a plant for another user."""
     plant = Plant(
         common_name="fake",
@@ -68,78 +138,376 @@ def test_create_plant_other_user(plant_service: PlantService):
         cycle="fake",
         watering="fake",
         watering_period="fake",
-        watering_benchmark_unit="fake",
-        watering_benchmark_value="fake",
+        watering_interval=timedelta(days=7),
         sunlight="fake",
         pet_poison=False,
         human_poison=True,
         description="fake",
         image_url="fake",
         owner_username="johndeere",
-        last_watering="fake",
-        health_history=[],
+        last_watering=datetime(2026, 1, 1, tzinfo=timezone.utc),
     )
     try:
-        plant_service.create_plant(plant=plant, owner_username="johndoe")
+        await plant_service.create_plant(plant=plant, owner_username="johndoe")
         pytest.fail()
     except PlantOwnerUsernameInvalidException:
         assert True
 
 
-def test_remove_plant(plant_service: PlantService):
+async def test_remove_plant(plant_service: PlantService):
     """Tests basic functionality of remove plant service method."""
 
     plant = Plant(owner_username="johndoe")
-    plant = plant_service.create_plant(plant=plant, owner_username="johndoe")
-    assert len(plant_service.get_all_user_plants("johndoe")) == 2
-    plant_service.remove_plant(plant=plant, owner_username="johndoe")
-    assert len(plant_service.get_all_user_plants("johndoe")) == 1
+    plant = await plant_service.create_plant(plant=plant, owner_username="johndoe")
+    assert len(await plant_service.get_all_user_plants("johndoe")) == 2
+    await plant_service.remove_plant(plant_id=plant.id, owner_username="johndoe")
+    assert len(await plant_service.get_all_user_plants("johndoe")) == 1
 
-def test_remove_other_user_plant(plant_service: PlantService):
+async def test_remove_other_user_plant(plant_service: PlantService):
     """Tests that a user cannot remove another users plants."""
 
-    plant = Plant(id=0, owner_username="johndoe")
     try:
-        plant_service.remove_plant(plant=plant, owner_username="johndeere")
+        await plant_service.remove_plant(plant_id=1, owner_username="johndoe")
         pytest.fail()
-    except PlantOwnerUsernameInvalidException:
+    except PlantNotFoundException:
         assert True
+    assert len(await plant_service.get_all_user_plants("johndeere")) == 1
 
-def test_remove_nonexistent_plant(plant_service: PlantService):
+async def test_remove_nonexistent_plant(plant_service: PlantService):
     """Tests that an error is thrown when remove plant is called on a plant that is not in the db."""
     
-    plant = Plant(id=3, owner_username="johndoe")
     try:
-        plant_service.remove_plant(plant=plant, owner_username="johndoe")
+        await plant_service.remove_plant(plant_id=3, owner_username="johndoe")
         pytest.fail()
     except PlantNotFoundException:
         assert True
 
-def test_remove_plant_blank_id(plant_service: PlantService):
+async def test_remove_plant_blank_id(plant_service: PlantService):
     """Tests that an exception is raised when a plant is removed with a blank id"""
-    plant = Plant(owner_username="johndoe")
     try:
-        plant_service.remove_plant(plant=plant, owner_username="johndoe")
+        await plant_service.remove_plant(plant_id=None, owner_username="johndoe")
         pytest.fail()
     except PlantBlankIdException:
         assert True
 
-def test_update_plant(plant_service: PlantService):
+async def test_update_plant(plant_service: PlantService):
     """Test basic usage of update plant service method."""
 
     plant = Plant(id=0, common_name="not fake", owner_username="johndoe")
-    plant = plant_service.create_plant(plant=plant, owner_username="johndoe")
+    plant = await plant_service.create_plant(plant=plant, owner_username="johndoe")
     plant.common_name = "super fake"
-    updated_plant = plant_service.update_Plant(plant=plant, owner_username="johndoe")
+    updated_plant = await plant_service.update_Plant(plant=plant, owner_username="johndoe")
     assert updated_plant.common_name == "super fake"
 
-def test_update_plant_nonexistent_plant(plant_service: PlantService):
+async def test_update_plant_nonexistent_plant(plant_service: PlantService):
     """Test that an exception is raised when a plant is updated that does not exist for an owner"""
 
     plant = Plant(id=0, owner_key="user2")
 
     try:
-        plant_service.update_Plant(plant=plant)
+        await plant_service.update_Plant(plant=plant)
         pytest.fail()
     except:
-        assert True
\ No newline at end of file
+        assert True
+
+
+async def test_bulk_create_plants(plant_service: PlantService):
+    """Test that bulk create adds the caller's plants in request order and reports plants owned by someone else."""
+
+    plants = [Plant(common_name="a", owner_username="johndoe"),
+              Plant(common_name="b", owner_username="johndeere"),
+              Plant(common_name="c", owner_username="johndoe")]
+    result = await plant_service.bulk_create_plants(plants=plants, owner_username="johndoe")
+
+    assert [plant.common_name for plant in result.plants] == ["a", "c"]
+    assert all(plant.id for plant in result.plants)
+    assert [error.index for error in result.errors] == [1]
+    assert len(await plant_service.get_all_user_plants("johndoe")) == 3
+
+async def test_bulk_update_plants(plant_service: PlantService):
+    """Test that bulk update writes the caller's plants and reports blank, foreign and missing plants."""
+
+    created = await plant_service.bulk_create_plants(plants=[Plant(common_name="a", owner_username="johndoe"),
+                                                             Plant(common_name="b", owner_username="johndoe")],
+                                                     owner_username="johndoe")
+    for plant in created.plants:
+        plant.common_name += " updated"
+        plant.last_watering = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        plant.watering_interval = timedelta(days=3)
+    plants = created.plants + [Plant(owner_username="johndoe"),
+                               Plant(id=1, owner_username="johndeere"),
+                               Plant(id=99, owner_username="johndoe")]
+    result = await plant_service.bulk_update_plants(plants=plants, owner_username="johndoe")
+
+    assert [error.index for error in result.errors] == [2, 3, 4]
+    assert [plant.common_name for plant in result.plants] == ["a updated", "b updated"]
+    names = [plant.common_name for plant in await plant_service.get_all_user_plants("johndoe")]
+    assert names == ["test1", "a updated", "b updated"]
+    assert result.plants[0].next_watering_due == datetime(2026, 1, 4, tzinfo=timezone.utc)
+
+async def test_bulk_remove_plants(plant_service: PlantService):
+    """Test that bulk remove deletes only the caller's plants and reports every other id."""
+
+    created = await plant_service.bulk_create_plants(plants=[Plant(common_name="a", owner_username="johndoe")], owner_username="johndoe")
+    result = await plant_service.bulk_remove_plants(plant_ids=[created.plants[0].id, 1, 99], owner_username="johndoe")
+
+    assert [plant.common_name for plant in result.plants] == ["a"]
+    assert [error.index for error in result.errors] == [1, 2]
+    assert len(await plant_service.get_all_user_plants("johndoe")) == 1
+    assert len(await plant_service.get_all_user_plants("johndeere")) == 1
+
+async def test_update_other_user_plant(plant_service: PlantService):
+    """Test that a user cannot update another user's plant by claiming its id."""
+
+    try:
+        await plant_service.update_Plant(plant=Plant(id=1, common_name="stolen", owner_username="johndoe"), owner_username="johndoe")
+        pytest.fail()
+    except PlantNotFoundException:
+        assert True
+    assert (await plant_service.get_all_user_plants("johndeere"))[0].common_name == "test2"
+
+async def test_patch_plant(plant_service: PlantService):
+    """Test that patching a plant changes only the properties that were set."""
+
+    plant = await plant_service.create_plant(plant=Plant(common_name="a", description="long", owner_username="johndoe"), owner_username="johndoe")
+    plant = await plant_service.patch_plant(plant_id=plant.id, patch=PlantPatch(common_name="patched"), owner_username="johndoe")
+
+    assert plant.common_name == "patched"
+    assert plant.description == "long"
+
+async def test_plants_share_species(session: AsyncSession, plant_service: PlantService):
+    """Test that plants with the same care data reference a single species row, whatever their own descriptions."""
+
+    species_count = await session.scalar(select(func.count()).select_from(SpeciesEntity))
+    plants = [Plant(common_name=name, scientific_name="Ficus lyrata", watering_period=period, description=name, owner_username="johndoe")
+              for name, period in [("a", "morning"), ("b", "evening")]]
+    await plant_service.bulk_create_plants(plants=plants, owner_username="johndoe")
+    await plant_service.create_plant(plant=plants[0].model_copy(), owner_username="johndoe")
+
+    assert await session.scalar(select(func.count()).select_from(SpeciesEntity)) == species_count + 1
+    assert [plant.watering_period for plant in await plant_service.get_all_user_plants("johndoe")][1:] == ["morning", "evening", "morning"]
+
+async def test_patch_plant_species(plant_service: PlantService):
+    """Test that patching the care data of one plant leaves other plants of its species unchanged."""
+
+    first = await plant_service.create_plant(plant=Plant(common_name="a", scientific_name="Ficus", watering="weekly", owner_username="johndoe"), owner_username="johndoe")
+    second = await plant_service.create_plant(plant=Plant(common_name="b", scientific_name="Ficus", watering="weekly", owner_username="johndoe"), owner_username="johndoe")
+
+    first = await plant_service.patch_plant(plant_id=first.id, patch=PlantPatch(watering="daily"), owner_username="johndoe")
+    plants = {plant.id: plant for plant in await plant_service.get_all_user_plants("johndoe")}
+
+    assert first.watering == "daily"
+    assert first.scientific_name == "Ficus"
+    assert plants[first.id] == first
+    assert plants[second.id].watering == "weekly"
+
+async def test_unreferenced_species_deleted(session: AsyncSession, plant_service: PlantService):
+    """Test that species rows are deleted once updates and removals leave no plant referencing them."""
+
+    species_count = await session.scalar(select(func.count()).select_from(SpeciesEntity))
+    first = await plant_service.create_plant(plant=Plant(common_name="a", scientific_name="Ficus", owner_username="johndoe"), owner_username="johndoe")
+    second = await plant_service.create_plant(plant=Plant(common_name="b", scientific_name="Ficus", owner_username="johndoe"), owner_username="johndoe")
+    third = await plant_service.create_plant(plant=Plant(common_name="c", scientific_name="Monstera", owner_username="johndoe"), owner_username="johndoe")
+
+    await plant_service.patch_plant(plant_id=third.id, patch=PlantPatch(scientific_name="Pilea"), owner_username="johndoe")
+    await plant_service.remove_plant(plant_id=first.id, owner_username="johndoe")
+    assert await session.scalar(select(func.count()).select_from(SpeciesEntity)) == species_count + 2
+
+    await plant_service.bulk_remove_plants(plant_ids=[second.id, third.id], owner_username="johndoe")
+    assert await session.scalar(select(func.count()).select_from(SpeciesEntity)) == species_count
+
+async def test_deleted_species_not_reused_from_cache(session: AsyncSession, plant_service: PlantService):
+    """Test that a species id cached by another process after its row was deleted is not referenced by a new plant."""
+
+    plant = Plant(common_name="a", scientific_name="Ficus", owner_username="johndoe")
+    created = await plant_service.create_plant(plant=plant.model_copy(), owner_username="johndoe")
+    species_id = await session.scalar(select(PlantEntity.species_id).where(PlantEntity.id == created.id))
+    await plant_service.remove_plant(plant_id=created.id, owner_username="johndoe")
+    species_cache.put(species_id, Species(scientific_name="Ficus"))
+
+    created = await plant_service.create_plant(plant=plant.model_copy(), owner_username="johndoe")
+
+    assert await session.scalar(select(PlantEntity.species_id).where(PlantEntity.id == created.id)) != species_id
+    assert species_cache.get_id(Species(scientific_name="Ficus").digest()) != species_id
+
+async def test_patch_other_user_plant(plant_service: PlantService):
+    """Test that a user cannot patch another user's plant."""
+
+    try:
+        await plant_service.patch_plant(plant_id=1, patch=PlantPatch(common_name="patched"), owner_username="johndoe")
+        pytest.fail()
+    except PlantNotFoundException:
+        assert True
+
+async def test_collection_version_bumped_by_writes(plant_service: PlantService):
+    """Test that every write to a user's plants changes the collection version, and only that user's."""
+
+    versions = [await plant_service.get_collection_version("johndoe")]
+    plant = await plant_service.create_plant(plant=Plant(common_name="a", owner_username="johndoe"), owner_username="johndoe")
+    versions.append(await plant_service.get_collection_version("johndoe"))
+    plant.common_name = "b"
+    await plant_service.update_Plant(plant=plant, owner_username="johndoe")
+    versions.append(await plant_service.get_collection_version("johndoe"))
+    await plant_service.remove_plant(plant_id=plant.id, owner_username="johndoe")
+    versions.append(await plant_service.get_collection_version("johndoe"))
+
+    assert len(set(versions)) == 4
+    assert await plant_service.get_collection_version("johndeere") == 0
+
+async def test_collection_etag_differs_between_users():
+    """Test that two users' collections at the same version get different ETags."""
+
+    assert _collection_etag("johndoe", 3) == _collection_etag("johndoe", 3)
+    assert _collection_etag("johndoe", 3) != _collection_etag("johndeere", 3)
+    assert _collection_etag("johndoe", 3) != _collection_etag("johndoe", 4)
+
+async def test_get_all_user_plants_json_cached(plant_service: PlantService):
+    """Test that the serialized plant list is cached until the collection changes."""
+
+    version = await plant_service.get_collection_version("johndoe")
+    body = await plant_service.get_all_user_plants_json("johndoe", version=version)
+    assert await plant_service.get_all_user_plants_json("johndoe", version=version) == body
+    assert plant_list_cache.hits == 1
+
+    await plant_service.create_plant(plant=Plant(common_name="a", owner_username="johndoe"), owner_username="johndoe")
+    version = await plant_service.get_collection_version("johndoe")
+    assert b'"a"' in await plant_service.get_all_user_plants_json("johndoe", version=version)
+    assert plant_list_cache.hits == 1
+
+async def test_get_all_user_plants_json_fields_cached(plant_service: PlantService):
+    """Test that a projected plant list is cached apart from the full list."""
+
+    version = await plant_service.get_collection_version("johndoe")
+    fields = parse_fields("common_name")
+    body = await plant_service.get_all_user_plants_json("johndoe", version=version, fields=fields)
+    assert body == b'[{"id":0,"common_name":"test1"}]'
+    assert await plant_service.get_all_user_plants_json("johndoe", version=version, fields=fields) == body
+    assert await plant_service.get_all_user_plants_json("johndoe", version=version) != body
+    assert plant_list_cache.hits == 1
+
+async def test_get_all_user_plants_json_compressed(plant_service: PlantService):
+    """Test that a compressed plant list is cached, so hits are not compressed again, and that small lists are not compressed."""
+
+    version = await plant_service.get_collection_version("johndoe")
+    body, encoding = await plant_service.get_all_user_plants_json_compressed("johndoe", version=version, encoding="gzip")
+    assert encoding is None
+    assert body == await plant_service.get_all_user_plants_json("johndoe", version=version)
+
+    await plant_service.bulk_create_plants(plants=[Plant(common_name=f"plant {index}", description="Likes humid rooms. " * 20, owner_username="johndoe")
+                                                   for index in range(10)], owner_username="johndoe")
+    version = await plant_service.get_collection_version("johndoe")
+    body, encoding = await plant_service.get_all_user_plants_json_compressed("johndoe", version=version, encoding="gzip")
+    assert encoding == "gzip"
+    assert gzip.decompress(body) == await plant_service.get_all_user_plants_json("johndoe", version=version)
+    hits = plant_list_cache.hits
+    assert await plant_service.get_all_user_plants_json_compressed("johndoe", version=version, encoding="gzip") == (body, "gzip")
+    assert plant_list_cache.hits == hits + 1
+
+    # Each coding is cached as its own variant of the list.
+    body, encoding = await plant_service.get_all_user_plants_json_compressed("johndoe", version=version, encoding="br")
+    assert encoding == "br"
+    assert brotli.decompress(body) == await plant_service.get_all_user_plants_json("johndoe", version=version)
+    hits = plant_list_cache.hits
+    assert await plant_service.get_all_user_plants_json_compressed("johndoe", version=version, encoding="br") == (body, "br")
+    assert plant_list_cache.hits == hits + 1
+
+async def test_get_due_plants(plant_service: PlantService):
+    """Test that only plants whose next watering is due are returned, most overdue first."""
+
+    now = datetime.now(timezone.utc)
+    for name, last_watering in [("overdue", now - timedelta(days=10)), ("due", now - timedelta(days=8)), ("fine", now)]:
+        await plant_service.create_plant(plant=Plant(common_name=name, owner_username="johndoe", last_watering=last_watering,
+                                                     watering_interval=timedelta(days=7)), owner_username="johndoe")
+    await plant_service.create_plant(plant=Plant(common_name="never", owner_username="johndoe"), owner_username="johndoe")
+
+    due = await plant_service.get_due_plants("johndoe", due_by=now)
+    assert [plant.common_name for plant in due] == ["test1", "overdue", "due"]
+    assert due[1].next_watering_due == due[1].last_watering + timedelta(days=7)
+
+async def test_search_user_plants(plant_service: PlantService):
+    """Test that search only returns the caller's matching plants, with name matches ranked first."""
+
+    await plant_service.bulk_create_plants(plants=[
+        Plant(common_name="Fiddle leaf fig", scientific_name="Ficus lyrata", owner_username="johndoe"),
+        Plant(common_name="Snake plant", description="Hardy, forgives a missed watering. Not a fig.", owner_username="johndoe"),
+        Plant(common_name="Pothos", owner_username="johndoe"),
+    ], owner_username="johndoe")
+    await plant_service.create_plant(plant=Plant(common_name="Weeping fig", owner_username="johndeere"), owner_username="johndeere")
+
+    page = await plant_service.search_user_plants("johndoe", query="figs")
+    assert [plant.common_name for plant in page.plants] == ["Fiddle leaf fig", "Snake plant"]
+    assert page.next_cursor is None
+
+async def test_search_user_plants_pages(plant_service: PlantService):
+    """Test that paging through search results returns every match exactly once, in rank order."""
+
+    await plant_service.bulk_create_plants(plants=[
+        Plant(common_name=f"Fern {index}", description="fern " * index, owner_username="johndoe") for index in range(5)
+    ], owner_username="johndoe")
+
+    names = []
+    cursor = None
+    while True:
+        page = await plant_service.search_user_plants("johndoe", query="fern", limit=2, cursor=cursor)
+        names += [plant.common_name for plant in page.plants]
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert names == ["Fern 4", "Fern 3", "Fern 2", "Fern 1", "Fern 0"]
+
+async def test_suggest_plant_names(plant_service: PlantService):
+    """Test that a user is only suggested the names of their own plants."""
+
+    assert await plant_service.suggest_plant_names("johndoe", "test") == ["test1"]
+    assert await plant_service.suggest_plant_names("johndeere", "test") == ["test2"]
+    assert await plant_service.suggest_plant_names("johndoe", "FA") == ["fake"]
+    assert await plant_service.suggest_plant_names("nobody", "test") == []
+
+async def test_suggest_plant_names_after_write_elsewhere(session: AsyncSession, plant_service: PlantService):
+    """Test that a write committed by another process is picked up, as it moves the collection version on."""
+
+    assert await plant_service.suggest_plant_names("johndoe", "mon") == []
+    species_id = await session.scalar(select(PlantEntity.species_id).where(PlantEntity.owner_username == "johndoe"))
+    session.add(PlantEntity(common_name="Monstera", description="", species_id=species_id, watering_period="", owner_username="johndoe"))
+    await PlantService(session=session)._bump_collection_version("johndoe")
+    await session.commit()
+
+    assert await plant_service.suggest_plant_names("johndoe", "mon") == ["Monstera"]
+
+async def test_name_index_follows_writes(plant_service: PlantService):
+    """Test that creating, renaming and removing plants keeps the plant name index current."""
+
+    assert await plant_service.suggest_plant_names("johndoe", "mon") == []
+
+    plant = await plant_service.create_plant(plant=Plant(common_name="Monstera", scientific_name="Monstera deliciosa", owner_username="johndoe"), owner_username="johndoe")
+    assert await plant_service.suggest_plant_names("johndoe", "mon") == ["Monstera", "Monstera deliciosa"]
+
+    await plant_service.patch_plant(plant_id=plant.id, patch=PlantPatch(common_name="Swiss cheese plant"), owner_username="johndoe")
+    assert await plant_service.suggest_plant_names("johndoe", "mon") == ["Monstera deliciosa"]
+    assert await plant_service.suggest_plant_names("johndoe", "swiss") == ["Swiss cheese plant"]
+
+    plant.common_name = "Split-leaf philodendron"
+    await plant_service.update_Plant(plant=plant, owner_username="johndoe")
+    assert await plant_service.suggest_plant_names("johndoe", "swiss") == []
+    assert await plant_service.suggest_plant_names("johndoe", "split") == ["Split-leaf philodendron"]
+
+    await plant_service.remove_plant(plant_id=plant.id, owner_username="johndoe")
+    assert await plant_service.suggest_plant_names("johndoe", "split") == []
+    assert await plant_service.suggest_plant_names("johndoe", "mon") == []
+
+async def test_name_index_follows_bulk_writes(plant_service: PlantService):
+    """Test that bulk writes keep the plant name index current and shared names counted."""
+
+    assert await plant_service.suggest_plant_names("johndoe", "a") == []
+
+    result = await plant_service.bulk_create_plants(plants=[Plant(common_name="Aloe", owner_username="johndoe"),
+                                                            Plant(common_name="Aloe", owner_username="johndoe")], owner_username="johndoe")
+    assert await plant_service.suggest_plant_names("johndoe", "al") == ["Aloe"]
+
+    renamed = result.plants[0].model_copy(update={"common_name": "Agave"})
+    await plant_service.bulk_update_plants(plants=[renamed], owner_username="johndoe")
+    assert await plant_service.suggest_plant_names("johndoe", "a") == ["Agave", "Aloe"]
+
+    await plant_service.bulk_remove_plants(plant_ids=[plant.id for plant in result.plants], owner_username="johndoe")
+    assert await plant_service.suggest_plant_names("johndoe", "a") == []
@@ -1,12 +1,16 @@
 """Test data for the 'plant_test' tests for the plant service."""
 
-from sqlalchemy.orm import Session
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..reset_table_id_seq import reset_table_id_seq
 
 from ...models.Authentication.user import User
 from ...entities.Authentication.user_entity import UserEntity
 from ...models.Folium.plant import Plant
 from ...entities.Folium.plant_entity import PlantEntity
+from ...models.Folium.species import Species, SPECIES_FIELDS
+from ...entities.Folium.species_entity import SpeciesEntity
 
 user1 = User(
     id=0,
@@ -14,7 +18,6 @@ user1 = User(
     username="johndoe",
     hashed_password="secret",
     full_name="john doe",
-    refresh_token="tok",
     disabled=False
 )
 
@@ -24,7 +27,6 @@ user2 = User(
     username="johndeere",
     hashed_password="secret2",
     full_name="john deere",
-    refresh_token="tok2",
     disabled=False
 )
 
@@ -36,16 +38,14 @@ plant1 = Plant(
     cycle="fake",
     watering="fake",
     watering_period="fake",
-    watering_benchmark_unit="fake",
-    watering_benchmark_value="fake",
+    watering_interval=timedelta(days=7),
     sunlight="fake",
     pet_poison=False,
     human_poison=True,
     description="fake",
     image_url="fake",
     owner_username="johndoe",
-    last_watering="fake",
-    health_history=list(),
+    last_watering=datetime(2026, 1, 1, tzinfo=timezone.utc),
 )
 
 plant2 = Plant(
@@ -56,23 +56,21 @@ plant2 = Plant(
     cycle="fake",
     watering="fake",
     watering_period="fake",
-    watering_benchmark_unit="fake",
-    watering_benchmark_value="fake",
+    watering_interval=timedelta(days=7),
     sunlight="fake",
     pet_poison=False,
     human_poison=True,
     description="fake",
     image_url="fake",
     owner_username="johndeere",
-    last_watering="fake",
-    health_history=list(),
+    last_watering=datetime(2026, 1, 1, tzinfo=timezone.utc),
 )
 
 users = [user1, user2]
 
 plants = [plant1, plant2]
 
-def insert_test_data(session: Session):
+async def insert_test_data(session: AsyncSession):
     """Insert fake data for testing."""
     
     # Add users to db.
@@ -80,13 +78,22 @@ def insert_test_data(session: Session):
         new_user = UserEntity.from_model(user=user)
         session.add(new_user)
 
+    # Add the species of the plants to db, one row per distinct species.
+    species_entities: dict[str, SpeciesEntity] = {}
+    for plant in plants:
+        species = Species(**plant.model_dump(include=SPECIES_FIELDS))
+        species_entities.setdefault(species.digest(), SpeciesEntity.from_model(species=species))
+    session.add_all(species_entities.values())
+    await session.flush()
+
     # Add plants to db.
     for plant in plants:
-        new_plant = PlantEntity.from_model(plant=plant)
+        species = Species(**plant.model_dump(include=SPECIES_FIELDS))
+        new_plant = PlantEntity.from_model(plant=plant, species_id=species_entities[species.digest()].id)
         session.add(new_plant)
 
-    ent = session.query(UserEntity).all()
+    await session.flush()
 
-    reset_table_id_seq(session=session, entity=UserEntity, entity_id_column=UserEntity.id, next_id=len(users) + 1)
-    reset_table_id_seq(session=session, entity=PlantEntity, entity_id_column=PlantEntity.id, next_id=len(plants) + 1)
+    await reset_table_id_seq(session=session, entity=UserEntity, entity_id_column=UserEntity.id, next_id=len(users) + 1)
+    await reset_table_id_seq(session=session, entity=PlantEntity, entity_id_column=PlantEntity.id, next_id=len(plants) + 1)
 
@@ -0,0 +1,143 @@
+"""Tests for the response compression middleware and helpers."""
+
+import gzip
+import zlib
+
+import brotli
+import pytest
+
+from ..compression import CompressionMiddleware, compress, negotiate_encoding, SUPPORTED_ENCODINGS
+
+pytestmark = pytest.mark.asyncio
+
+def app_sending(*bodies: bytes, content_type: bytes = b"application/json", extra_headers: list | None = None):
+    """Helper function that builds an ASGI app sending the given body chunks as one response."""
+    async def app(scope, receive, send):
+        headers = [(b"content-type", content_type), *(extra_headers or [])]
+        if len(bodies) == 1:
+            headers.append((b"content-length", str(len(bodies[0])).encode()))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        for index, body in enumerate(bodies):
+            await send({"type": "http.response.body", "body": body, "more_body": index < len(bodies) - 1})
+    return app
+
+async def call(app, accept_encoding: str | None) -> tuple[dict, bytes]:
+    """Helper function that sends a request through the compression middleware, returning the response headers and body."""
+    headers = [(b"accept-encoding", accept_encoding.encode())] if accept_encoding is not None else []
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    await CompressionMiddleware(app, minimum_size=100)({"type": "http", "headers": headers}, None, send)
+    start, *bodies = messages
+    return ({key.decode(): value.decode() for key, value in start["headers"]},
+            b"".join(message["body"] for message in bodies))
+
+async def test_negotiate_encoding():
+    """Tests that the supported coding with the highest quality is chosen, and that refused codings are never chosen."""
+    assert negotiate_encoding(None) is None
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip;q=0") is None
+    assert negotiate_encoding("*") == SUPPORTED_ENCODINGS[0]
+    assert negotiate_encoding("*, gzip;q=0") == "br"
+
+async def test_negotiate_encoding_prefers_brotli():
+    """Tests that brotli is chosen over gzip when both are accepted equally, but not over a higher quality gzip."""
+    assert SUPPORTED_ENCODINGS == ("br", "gzip")
+    assert negotiate_encoding("gzip, deflate, br") == "br"
+    assert negotiate_encoding("br;q=0.8, gzip;q=0.8") == "br"
+    assert negotiate_encoding("br;q=0.5, gzip") == "gzip"
+
+async def test_compress_gzip_round_trip():
+    """Tests that a body compressed with gzip decompresses back to itself."""
+    body = b'{"description":"Likes humid rooms."}' * 100
+    compressed = compress(body, "gzip")
+
+    assert len(compressed) < len(body)
+    assert gzip.decompress(compressed) == body
+
+async def test_compress_brotli_round_trip():
+    """Tests that a body compressed with brotli decompresses back to itself."""
+    body = b'{"description":"Likes humid rooms."}' * 100
+    compressed = compress(body, "br")
+
+    assert len(compressed) < len(body)
+    assert brotli.decompress(compressed) == body
+
+async def test_middleware_compresses_large_body():
+    """Tests that a whole body above the minimum size is compressed, with matching headers."""
+    body = b"[" + b'{"id":1},' * 50 + b"]"
+    headers, sent = await call(app_sending(body), "gzip")
+
+    assert headers["content-encoding"] == "gzip"
+    assert headers["vary"] == "Accept-Encoding"
+    assert int(headers["content-length"]) == len(sent)
+    assert gzip.decompress(sent) == body
+
+async def test_middleware_compresses_with_brotli():
+    """Tests that whole and streamed bodies are compressed with brotli when the client prefers it."""
+    body = b"[" + b'{"id":1},' * 50 + b"]"
+    headers, sent = await call(app_sending(body), "gzip, deflate, br")
+
+    assert headers["content-encoding"] == "br"
+    assert int(headers["content-length"]) == len(sent)
+    assert brotli.decompress(sent) == body
+
+    chunks = [b'{"id":%d}\n' % index for index in range(100)]
+    headers, sent = await call(app_sending(*chunks, content_type=b"application/x-ndjson"), "br")
+    assert headers["content-encoding"] == "br"
+    assert "content-length" not in headers
+    assert brotli.decompress(sent) == b"".join(chunks)
+
+async def test_middleware_flushes_each_streamed_chunk():
+    """Tests that each streamed chunk is flushed, so the client can decode it without waiting for the end of the body."""
+    chunks = [b'{"id":%d}\n' % index for index in range(3)]
+    for encoding, decompressor in [("gzip", zlib.decompressobj(16 + zlib.MAX_WBITS)), ("br", brotli.Decompressor())]:
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        app = app_sending(*chunks, content_type=b"application/x-ndjson")
+        await CompressionMiddleware(app, minimum_size=100)({"type": "http", "headers": [(b"accept-encoding", encoding.encode())]}, None, send)
+
+        decode = decompressor.decompress if encoding == "gzip" else decompressor.process
+        assert [decode(message["body"]) for message in messages[1:]] == chunks
+
+async def test_middleware_skips_small_and_unaccepted_bodies():
+    """Tests that small bodies, and bodies for clients that do not accept compression, are sent as they are."""
+    body = b"[" + b'{"id":1},' * 50 + b"]"
+
+    headers, sent = await call(app_sending(b"[]"), "gzip")
+    assert "content-encoding" not in headers and sent == b"[]"
+    headers, sent = await call(app_sending(body), None)
+    assert "content-encoding" not in headers and sent == body
+    headers, sent = await call(app_sending(body, content_type=b"image/png"), "gzip")
+    assert "content-encoding" not in headers and sent == body
+
+async def test_middleware_passes_precompressed_body_through():
+    """Tests that a body that is already compressed is not compressed again."""
+    body = compress(b"[" + b'{"id":1},' * 50 + b"]", "gzip")
+    headers, sent = await call(app_sending(body, extra_headers=[(b"content-encoding", b"gzip")]), "gzip")
+
+    assert sent == body
+
+async def test_middleware_keeps_single_vary_entry():
+    """Tests that a response already varying on 'Accept-Encoding' does not get it listed twice."""
+    chunks = [b'{"id":%d}\n' % index for index in range(100)]
+    app = app_sending(*chunks, content_type=b"application/x-ndjson", extra_headers=[(b"vary", b"Accept-Encoding")])
+    headers, _ = await call(app, "gzip")
+
+    assert headers["content-encoding"] == "gzip"
+    assert headers["vary"] == "Accept-Encoding"
+
+async def test_middleware_compresses_stream():
+    """Tests that a streamed body is compressed as one stream, without a content length."""
+    chunks = [b'{"id":%d}\n' % index for index in range(100)]
+    headers, sent = await call(app_sending(*chunks, content_type=b"application/x-ndjson"), "gzip")
+
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+    assert gzip.decompress(sent) == b"".join(chunks)
@@ -1,12 +1,14 @@
 """Shared pytest fixtures for database dependent tests."""
 
 import pytest
+import pytest_asyncio
 
 from sqlalchemy import create_engine, text, Engine
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncEngine, create_async_engine
 from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.pool import NullPool
 
-from ..database import _engine_str
+from ..database import _engine_str, ASYNC_DIALECT
 from ..env import getenv
 from ..entities.entity_base import EntityBase
 
@@ -42,12 +44,18 @@ def test_engine() -> Engine:
     return create_engine(_engine_str(POSTGRES_DATABASE))
 
 
-@pytest.fixture(scope="function")
-def session(test_engine: Engine):
+@pytest.fixture(scope="session")
+def async_test_engine(test_engine: Engine) -> AsyncEngine:
+    # Each test runs in its own event loop, so connections must not be pooled across tests.
+    return create_async_engine(_engine_str(POSTGRES_DATABASE, dialect=ASYNC_DIALECT), poolclass=NullPool)
+
+
+@pytest_asyncio.fixture(scope="function")
+async def session(test_engine: Engine, async_test_engine: AsyncEngine):
     EntityBase.metadata.drop_all(test_engine)
     EntityBase.metadata.create_all(test_engine)
-    session = Session(test_engine)
+    session = AsyncSession(async_test_engine, expire_on_commit=False)
     try:
         yield session
     finally:
-        session.close()
+        await session.close()
@@ -0,0 +1,35 @@
+"""Tests for the instrumented database connection pool."""
+
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from ..database import InstrumentedAsyncQueuePool, _engine_str, ASYNC_DIALECT
+from .conftest import POSTGRES_DATABASE
+
+pytestmark = pytest.mark.asyncio
+
+async def test_pool_only_times_waits_for_exhausted_pool(async_test_engine: AsyncEngine):
+    """Tests that opening connections is not counted as waiting, and that waiting on an exhausted pool is.
+    Only the checkouts made once the pool can open no more connections record a wait."""
+    engine = create_async_engine(_engine_str(POSTGRES_DATABASE, dialect=ASYNC_DIALECT),
+                                 poolclass=InstrumentedAsyncQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.2)
+    pool: InstrumentedAsyncQueuePool = engine.pool
+    try:
+        async with engine.connect():
+            # Opening the first connection took a round trip to the server, but no waiting.
+            assert pool.checkouts == 1
+            assert len(pool.recent_waits) == 0
+
+            with pytest.raises(PoolTimeoutError):
+                async with engine.connect():
+                    pass
+            assert pool.checkout_timeouts == 1
+            assert pool.max_wait_seconds >= 0.2
+
+        async with engine.connect():
+            pass
+        assert pool.checkouts == 2
+        assert len(pool.recent_waits) == 2
+    finally:
+        await engine.dispose()
@@ -0,0 +1,26 @@
+"""Tests for the access control of the monitoring routes."""
+
+import pytest
+from fastapi import HTTPException
+
+from ..api import health
+
+pytestmark = pytest.mark.asyncio
+
+async def test_monitoring_routes_disabled_without_ops_token(monkeypatch: pytest.MonkeyPatch):
+    """Tests that the monitoring routes are not found when no ops token is configured."""
+    monkeypatch.setattr(health, "OPS_TOKEN", "")
+
+    with pytest.raises(HTTPException) as error:
+        health.require_ops_token(authorization="Bearer ")
+    assert error.value.status_code == 404
+
+async def test_monitoring_routes_require_ops_token(monkeypatch: pytest.MonkeyPatch):
+    """Tests that the monitoring routes only accept the configured ops token as a bearer token."""
+    monkeypatch.setattr(health, "OPS_TOKEN", "s3cret")
+
+    health.require_ops_token(authorization="Bearer s3cret")
+    for authorization in [None, "Bearer wrong", "s3cret", "Basic s3cret"]:
+        with pytest.raises(HTTPException) as error:
+            health.require_ops_token(authorization=authorization)
+        assert error.value.status_code == 401
@@ -0,0 +1,90 @@
+"""Tests for the per-request timings and the request histograms."""
+
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from ..metrics import Histogram, MetricsMiddleware, instrument_engine, request_metrics, request_timings, timed
+from ..serialization import dumps
+
+pytestmark = pytest.mark.asyncio
+
+async def test_histogram_render():
+    """Tests that histograms are rendered with cumulative buckets, a sum and a count per series."""
+    histogram = Histogram("latency_seconds", "Latency.", ("route",), (0.1, 1.0))
+    histogram.observe(("/a",), 0.1)
+    histogram.observe(("/a",), 0.5)
+    histogram.observe(("/a",), 2.0)
+
+    assert histogram.render() == [
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/a",le="0.1"} 1',
+        'latency_seconds_bucket{route="/a",le="1.0"} 2',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 3',
+        'latency_seconds_sum{route="/a"} 2.6',
+        'latency_seconds_count{route="/a"} 3',
+    ]
+
+async def test_timings_only_recorded_within_request():
+    """Tests that phases are added to the timings of the current request, and ignored outside of one."""
+    with timed("auth"):
+        pass
+    with request_timings() as timings:
+        with timed("auth"):
+            pass
+        dumps({"id": 1})
+
+    assert timings.auth > 0
+    assert timings.serialize > 0
+    assert timings.db == 0 and timings.queries == 0
+
+async def test_instrument_engine_counts_queries(async_test_engine: AsyncEngine):
+    """Tests that the queries run through an instrumented engine are timed and counted."""
+    # A dedicated engine keeps the listeners off the engine shared with the other tests.
+    engine = create_async_engine(async_test_engine.url, poolclass=NullPool)
+    try:
+        instrument_engine(engine)
+        with request_timings() as timings:
+            async with engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+                await connection.execute(text("SELECT 2"))
+    finally:
+        await engine.dispose()
+
+    assert timings.queries == 2
+    assert timings.db > 0
+
+async def test_middleware_server_timing_and_histograms():
+    """Tests that the middleware sends a Server-Timing header and records the request under its route."""
+    async def endpoint():
+        ...
+
+    class App:
+        routes = [SimpleNamespace(endpoint=endpoint, path="/folium/plant/{plant_id}")]
+
+        async def __call__(self, scope, receive, send):
+            scope["endpoint"] = endpoint
+            with timed("auth"):
+                body = dumps([{"id": 1}])
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": body})
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    request_metrics.clear()
+    app = App()
+    await MetricsMiddleware(app)({"type": "http", "method": "GET", "app": app}, None, send)
+
+    headers = dict(messages[0]["headers"])
+    server_timing = headers[b"server-timing"].decode()
+    assert server_timing.startswith("auth;dur=")
+    assert 'db;dur=0.000;desc="0 queries"' in server_timing
+    assert "total;dur=" in server_timing
+    assert 'http_request_duration_seconds_count{method="GET",route="/folium/plant/{plant_id}"} 1' in request_metrics.render()
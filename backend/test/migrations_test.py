@@ -0,0 +1,45 @@
+"""Tests that the Alembic migrations stay in sync with the entity metadata."""
+
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import Engine, text
+
+from ..entities.entity_base import EntityBase
+# Entities must be imported so that their tables are registered on the metadata.
+from ..entities.Authentication.user_entity import UserEntity
+from ..entities.Authentication.refresh_token_entity import RefreshTokenEntity
+from ..entities.Folium.species_entity import SpeciesEntity
+from ..entities.Folium.plant_entity import PlantEntity
+from ..entities.Folium.plant_collection_version_entity import PlantCollectionVersionEntity
+from ..entities.Folium.plant_health_sample_entity import PlantHealthSampleEntity
+
+ALEMBIC_CONFIG = Path(__file__).parents[2] / "alembic.ini"
+
+@pytest.fixture(scope="function")
+def alembic_config(test_engine: Engine):
+    """This PyTest fixture empties the test database and yields an Alembic config bound to it."""
+    EntityBase.metadata.drop_all(test_engine)
+    with test_engine.begin() as connection:
+        connection.execute(text("DROP TABLE IF EXISTS alembic_version"))
+
+    with test_engine.connect() as connection:
+        config = Config(ALEMBIC_CONFIG)
+        config.attributes["connection"] = connection
+        yield config
+
+def test_migrations_match_entities(alembic_config: Config):
+    """Tests that upgrading an empty database to head produces exactly the schema the entities declare."""
+    command.upgrade(alembic_config, "head")
+
+    diff = compare_metadata(MigrationContext.configure(alembic_config.attributes["connection"]), EntityBase.metadata)
+    assert diff == []
+
+def test_migrations_downgrade_to_base(alembic_config: Config):
+    """Tests that every migration can be reverted."""
+    command.upgrade(alembic_config, "head")
+    command.downgrade(alembic_config, "base")
@@ -4,11 +4,12 @@
    is inserted into the table."""
 
 from sqlalchemy import text
-from sqlalchemy.orm import Session, DeclarativeBase, InstrumentedAttribute
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import DeclarativeBase, InstrumentedAttribute
 
 
-def reset_table_id_seq(
-    session: Session,
+async def reset_table_id_seq(
+    session: AsyncSession,
     entity: type[DeclarativeBase],
     entity_id_column: InstrumentedAttribute[int],
     next_id: int,
@@ -16,7 +17,7 @@ def reset_table_id_seq(
     """Reset the ID sequence of an entity table.
 
     Args:
-        session (Session) - A SQLAlchemy Session
+        session (AsyncSession) - A SQLAlchemy AsyncSession
         entity (DeclarativeBase) - The SQLAlchemy Entity table to target
         entity_id_column (MappedColumn) - The ID column (should be an int column)
         next_id (int) - Where the next inserted, autogenerated ID should begin
@@ -26,4 +27,4 @@ def reset_table_id_seq(
     table = entity.__table__
     id_column_name = entity_id_column.name
     sql = text(f"ALTER SEQUENCe {table}_{id_column_name}_seq RESTART WITH {next_id}")
-    session.execute(sql)
\ No newline at end of file
+    await session.execute(sql)
\ No newline at end of file
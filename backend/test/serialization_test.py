@@ -0,0 +1,33 @@
+"""Tests for the fast serialization helpers."""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+from ..serialization import dumps
+from ..models.Folium.plant import Plant, PlantPage
+
+plant_values = dict(
+    id=1,
+    common_name="Boston fern",
+    scientific_name="Nephrolepis exaltata",
+    watering_period="morning",
+    watering_interval=timedelta(days=7, hours=12),
+    pet_poison=False,
+    human_poison=True,
+    description="Likes \"humid\" rooms. Ünïcode is fine.",
+    owner_username="johndoe",
+    last_watering=datetime(2026, 1, 1, 8, 30, tzinfo=timezone.utc),
+    next_watering_due=datetime(2026, 1, 8, 20, 30, tzinfo=timezone.utc),
+)
+
+def test_dumps_unvalidated_model():
+    """Tests that a model built by 'model_construct', as read paths build them, is encoded as the validated model."""
+    values = Plant(**plant_values).model_dump()
+
+    assert json.loads(dumps(Plant.model_construct(**values))) == json.loads(Plant(**values).model_dump_json())
+
+def test_dumps_matches_pydantic():
+    """Tests that nested models, durations and timestamps are encoded as pydantic encodes them."""
+    page = PlantPage(plants=[Plant(**plant_values), Plant()], next_cursor="abc")
+
+    assert json.loads(dumps(page)) == json.loads(page.model_dump_json())